@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     # Notion integration
     NOTION_TOKEN: str = Field(..., env="NOTION_TOKEN")
     NOTION_DATABASE_ID: str = Field(..., env="NOTION_DATABASE_ID")
+    NOTION_CACHE_TTL_SECONDS: float = Field(300.0, description="Reuso (s) do snapshot de indicadores do Notion entre coletores")
+    NOTION_FULL_REFRESH_SECONDS: float = Field(3600.0, description="Intervalo (s) entre leituras completas; no meio, só páginas editadas")
 
     # PostgreSQL connection
     DB_HOST: str = Field(..., env="DB_HOST")
@@ -30,6 +32,15 @@ class Settings(BaseSettings):
     
     DATABASE_URL: Optional[str] = Field(None, env="DATABASE_URL")
 
+    # Pool de conexões PostgreSQL
+    DB_POOL_MIN: int = Field(1, description="Conexões abertas antecipadamente no pool")
+    DB_POOL_MAX: int = Field(10, description="Máximo de conexões simultâneas no pool")
+    DB_POOL_TIMEOUT: float = Field(10.0, description="Espera máxima (s) por conexão livre no pool")
+    DB_POOL_IDLE_CHECK_SECONDS: float = Field(30.0, description="Ociosidade (s) a partir da qual o checkout testa a conexão")
+    LATEST_CACHE_ENABLED: bool = Field(True, description="Cache em processo das consultas de último registro")
+    LATEST_CACHE_TTL_SECONDS: float = Field(300.0, description="Validade máxima (s) de um último registro memorizado")
+    LATEST_CACHE_NOTIFY: bool = Field(False, description="Propaga invalidações entre workers via LISTEN/NOTIFY")
+
     # Google Cloud BigQuery
     GOOGLE_APPLICATION_CREDENTIALS_JSON: str = Field(..., env="GOOGLE_APPLICATION_CREDENTIALS_JSON")
     GOOGLE_CLOUD_PROJECT: str = Field(..., env="GOOGLE_CLOUD_PROJECT")
@@ -47,12 +58,60 @@ class Settings(BaseSettings):
     WEIGHT_MACRO_M2: float = Field(0.60, description="Peso para Macro M2 global")
     WEIGHT_MACRO_US10Y: float = Field(0.40, description="Peso para Macro US10Y yield")
 
+    # Executores para código bloqueante chamado pelos routers async
+    EXECUTOR_LEITURA_WORKERS: int = Field(8, description="Threads para GETs (leituras PostgreSQL)")
+    EXECUTOR_PROCESSAMENTO_WORKERS: int = Field(4, description="Threads para POSTs/coletas (TradingView, web3, Notion)")
+    PIPELINE_WORKERS: int = Field(4, description="Etapas simultâneas no pipeline /pipeline/run")
+
+    # Matriz estratégica v2 em memória
+    MATRIZ_MEMORIA_ENABLED: bool = Field(True, description="Consulta a matriz estratégica pela grade 101x101 em memória")
+    MATRIZ_RECHECK_SECONDS: float = Field(60.0, description="Intervalo (s) para conferir se a tabela da matriz mudou")
+
+    # Store analítico colunar (Parquet/Arrow) do histórico
+    ANALYTICS_STORE_ENABLED: bool = Field(False, description="Exporta o histórico incremental ao fim do pipeline")
+    ANALYTICS_STORE_DIR: str = Field("data/analytics", description="Diretório raiz do store colunar")
+    ANALYTICS_STORE_FORMAT: str = Field("parquet", description="Formato dos arquivos novos: parquet ou arrow (IPC, mmap sem cópia)")
+    ANALYTICS_EXPORT_BATCH: int = Field(50000, description="Linhas por consulta na exportação incremental")
+
+    # Respostas JSON pré-renderizadas (GET dash-main / dash-mercado)
+    RENDER_CACHE_MAX_ENTRIES: int = Field(32, description="Corpos JSON renderizados mantidos por (tabela, id)")
+
+    # Respostas condicionais (ETag / If-None-Match) nos GETs de leitura
+    HTTP_CACHE_ENABLED: bool = Field(True, description="ETag + 304 nos GETs de dashboards e decisão estratégica")
+    HTTP_CACHE_MAX_AGE_SECONDS: int = Field(60, description="max-age do Cache-Control (depois o cliente revalida com If-None-Match)")
+
     # Cache settings
     CACHE_EXPIRATION_SECONDS: int = Field(300, description="Tempo de expiração do cache em segundos")
 
     # TradingView default symbol
     TV_SYMBOL: str = Field("BTCUSDT", description="Símbolo usado nas chamadas ao TradingView")
     TV_EXCHANGE: str = Field("BINANCE", description="Exchange para consulta de dados")
+    TV_TIMEFRAME_TIMEOUT_SECONDS: float = Field(60.0, description="Timeout (s) por timeframe na análise EMA paralela")
+    BTC_PRICE_CACHE_TTL_SECONDS: float = Field(0.5, description="Cache (s) do preço spot BTC compartilhado entre chamadas")
+    BTC_PRICE_HEDGE_MS: float = Field(300.0, description="Espera (ms) pela fonte mais rápida antes de consultar as demais")
+    BTC_PRICE_QUORUM: int = Field(1, description="Cotações válidas exigidas (2 = mediana das duas mais rápidas)")
+    BTC_PRICE_TIMEOUT_SECONDS: float = Field(5.0, description="Tempo máximo (s) da busca de preço entre todas as fontes")
+    PRICE_STREAM_ENABLED: bool = Field(False, description="Ingestão contínua de negócios BTC em background (preço em memória + candles 1m)")
+    PRICE_STREAM_SOURCE: str = Field("binance", description="Fonte do stream: binance ou replay:<arquivo>")
+    PRICE_STREAM_SYMBOL: str = Field("BTCUSDT", description="Símbolo ingerido pelo stream de preço")
+    PRICE_STREAM_MAX_AGE_SECONDS: float = Field(10.0, description="Idade máxima (s) do preço do stream antes de voltar à busca remota")
+    PRICE_STREAM_PUBLISH_MS: float = Field(250.0, description="Intervalo mínimo (ms) entre eventos de preço enviados aos clientes")
+    PRICE_STREAM_REPLAY_SPEED: float = Field(1.0, description="Velocidade do replay (2 = dobro; 0 = sem espera entre negócios)")
+    TV_POOL_SIZE: int = Field(3, description="Sessões TradingView simultâneas (downloads em paralelo)")
+    TV_POOL_TIMEOUT_SECONDS: float = Field(60.0, description="Espera máxima (s) por uma sessão livre do pool")
+    TV_TOKEN_MAX_AGE_HOURS: float = Field(12.0, description="Validade do auth token TradingView persistido antes de novo login")
+    DASH_MERCADO_BLOCO_TIMEOUT_SECONDS: float = Field(30.0, description="Timeout (s) por bloco (ciclo/momentum/tecnico) no dash-mercado paralelo")
+
+    # Bar store OHLC (cache local das barras do TradingView)
+    OHLC_CACHE_ENABLED: bool = Field(True, description="Usa bar store em vez de baixar o histórico completo")
+    OHLC_CACHE_REFRESH_SECONDS: int = Field(60, description="Janela (s) em que a série em memória é servida sem consultar o TradingView")
+    OHLC_CACHE_MAX_BARS: int = Field(5000, description="Máximo de barras mantidas em memória por série")
+    RESAMPLE_ENABLED: bool = Field(True, description="1W/1M derivados por reamostragem da série diária (um download para todos)")
+    RESAMPLE_MAX_BASE_BARS: int = Field(5000, description="Limite de barras base por download (teto do TradingView)")
+    CANDLE_CACHE_ENABLED: bool = Field(True, description="EMAs 1W de barras fechadas memorizadas até o próximo fechamento semanal")
+    CANDLE_CACHE_MAX_ENTRIES: int = Field(64, description="Resultados mantidos no cache por candle")
+    INDICATOR_STATE_ENABLED: bool = Field(True, description="EMA/RSI atuais via estado incremental (O(1) por barra fechada)")
+    INDICATOR_STATE_PERSIST: bool = Field(True, description="Persiste o estado incremental dos indicadores no Postgres")
 
     WALLET_ADDRESS: str = Field(..., env="WALLET_ADDRESS")
     AAVE_RPC_URL: str = Field(..., env="AAVE_RPC_URL")
@@ -7,6 +7,11 @@ from app.routers import dashboards
 from app.routers import tendencia
 from app.routers import decisao_estrategica
 from app.routers import financeiro
+from app.routers import pipeline
+from app.routers import preco
+from app.services.utils.helpers.executor_helper import encerrar_executores
+from app.services.utils.helpers.postgres.latest_cache import iniciar_listener, parar_listener
+from app.services.utils.helpers.tradingview.price_stream import iniciar_stream, parar_stream
 
 app = FastAPI(
     title="BTC Turbo API",
@@ -21,6 +26,17 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+@app.on_event("startup")
+def startup_cache_listener():
+    iniciar_listener()
+    iniciar_stream()
+
+@app.on_event("shutdown")
+def shutdown_executores():
+    parar_listener()
+    parar_stream()
+    encerrar_executores()
+
 # ==========================================
 # APIs QUE ESTÃO SENDO USADOS
 # ==========================================
@@ -30,4 +46,6 @@ app.include_router(score.router, prefix="/api/v1", tags=["🎯 Scores"])
 app.include_router(dashboards.router, prefix="/api/v1", tags=["📊 dashboards"]) 
 app.include_router(tendencia.router, prefix="/api/v1", tags=["📊 tendencia"]) 
 app.include_router(decisao_estrategica.router, prefix="/api/v1", tags=["🎯 Decisão Estratégica"])  # ← NOVO
-app.include_router(financeiro.router, prefix="/api/v1/financeiro", tags=["📊 financeiro"]) 
\ No newline at end of file
+app.include_router(financeiro.router, prefix="/api/v1/financeiro", tags=["📊 financeiro"])
+app.include_router(pipeline.router, prefix="/api/v1", tags=["🔁 Pipeline"])
+app.include_router(preco.router, prefix="/api/v1", tags=["💹 Preço"])
\ No newline at end of file
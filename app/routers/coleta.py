@@ -3,6 +3,7 @@
 from fastapi import APIRouter
 from app.services.coleta import ciclos, riscos, momentum
 from app.services.coleta.tecnico_v3.tecnico import coletar as coletar_tecnico_v3
+from app.services.utils.helpers.executor_helper import executar_processamento
 
 from fastapi import APIRouter
 from app.services.coleta import ciclos, riscos, momentum
@@ -14,10 +15,10 @@ async def coletar_indicadores(bloco: str, forcar_coleta: bool = False):
     if bloco == "ciclos":
        return {"status": "erro", "detalhes": "Está sendo importado no N8N"}
     elif bloco == "riscos":
-        return riscos.coletar(forcar_coleta)
+        return await executar_processamento(riscos.coletar, forcar_coleta)
     elif bloco == "momentum":
         return {"status": "erro", "detalhes": "Está sendo importado no N8N"}
     elif bloco == "tecnico":
-        return coletar_tecnico_v3(forcar_coleta)
+        return await executar_processamento(coletar_tecnico_v3, forcar_coleta)
     else:
         return {"status": "erro", "detalhes": "Bloco inválido"}
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/routers/dashboards.py - ADICIONAR ESTES ENDPOINTS
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from app.services.dashboards.dash_main_service import processar_dash_main, obter_dash_main
 from app.services.dashboards.dash_mercado_service import processar_dash_mercado, obter_dash_mercado
 from app.services.dashboards.dash_finance_service import (
@@ -11,54 +11,62 @@ from app.services.dashboards.dash_finance_service import (
 )
 from app.services.utils.helpers.postgres.mercado.database_helper import get_ciclo_mercado
 from app.services.dashboards.dash_main.analise_alavancagem import executar_analise_alavancagem
+from app.services.utils.helpers.executor_helper import executar_leitura, executar_processamento
+from app.services.utils.helpers.http_cache_helper import responder_condicional, dia_utc
 
 router = APIRouter()
 
 # === ENDPOINTS EXISTENTES ===
 @router.post("/dash-main")
 async def post_dash_main():
-    return processar_dash_main()
+    return await executar_processamento(processar_dash_main)
 
 @router.get("/dash-main")
-async def get_dash_main():
-    return obter_dash_main()
+async def get_dash_main(request: Request):
+    return await responder_condicional(request, ["dash_main"], obter_dash_main)
 
 @router.get("/dash-mercado")
-async def post_dash_mercado():
-    return obter_dash_mercado()
+async def post_dash_mercado(request: Request):
+    return await responder_condicional(request, ["dash_mercado"], obter_dash_mercado)
 
 @router.post("/dash-mercado")
 async def post_dash_mercado():
-    return processar_dash_mercado()
+    return await executar_processamento(processar_dash_mercado)
 
 @router.get("/dash-mercado/debug")
 async def get_dash_mercado_debug():
-    return get_ciclo_mercado()
+    return await executar_leitura(get_ciclo_mercado)
 
 @router.get("/dash-main/alavancagem")
 async def get_dash_main_alavancagem():
-    dados_mercado = get_ciclo_mercado()
+    dados_mercado = await executar_leitura(get_ciclo_mercado)
     alavancagem_permitida = dados_mercado["ciclo_detalhes"]["alavancagem"]
-    return executar_analise_alavancagem(alavancagem_permitida)
+    return await executar_processamento(executar_analise_alavancagem, alavancagem_permitida)
 
 # === NOVOS ENDPOINTS DASH-FINANCE ===
 
 @router.get("/dash-finance/health-factor")
-async def get_health_factor(periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
+async def get_health_factor(request: Request, periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
     """Histórico Health Factor (REAL)"""
-    return obter_health_factor(periodo)
+    return await responder_condicional(
+        request, ["indicadores_risco", "dash_main"], obter_health_factor, periodo, extras=(periodo, dia_utc())
+    )
 
 @router.get("/dash-finance/alavancagem")
-async def get_alavancagem(periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
-    """Histórico Alavancagem Atual vs Permitida (MOCK)"""
-    return obter_alavancagem(periodo)
+async def get_alavancagem(request: Request, periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
+    """Histórico Alavancagem Atual vs Permitida (REAL)"""
+    return await responder_condicional(
+        request, ["indicadores_risco", "decisao_estrategica"], obter_alavancagem, periodo, extras=(periodo, dia_utc())
+    )
 
 @router.get("/dash-finance/patrimonio")
 async def get_patrimonio(periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
-    """Histórico Crescimento Patrimônio Líquido (REAL)"""
-    return obter_patrimonio(periodo)
+    """Histórico Crescimento Patrimônio Líquido (REAL) - sem ETag: inclui btc_price ao vivo"""
+    return await executar_leitura(obter_patrimonio, periodo)
 
 @router.get("/dash-finance/capital-investido")
-async def get_capital_investido(periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
-    """Histórico Capital Investido - Posição Total (MOCK)"""
-    return obter_capital_investido(periodo)
\ No newline at end of file
+async def get_capital_investido(request: Request, periodo: str = Query(default="30d", description="Período: 30d, 3m, 6m, 1y, all")):
+    """Histórico Capital Investido - Posição Total (REAL)"""
+    return await responder_condicional(
+        request, ["indicadores_risco"], obter_capital_investido, periodo, extras=(periodo, dia_utc())
+    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/routers/decisao_estrategica.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from app.services.decisao_estrategica.estrategia_service import (
     processar_decisao_estrategica, 
     debug_matriz_estrategica,
@@ -8,6 +8,8 @@ from app.services.decisao_estrategica.estrategia_service import (
     obter_detalhe_estrategia
 )
 from app.services.decisao_estrategica.utils.data_helper import get_historico_decisoes
+from app.services.utils.helpers.executor_helper import executar_leitura, executar_processamento
+from app.services.utils.helpers.http_cache_helper import responder_condicional
 
 router = APIRouter()
 
@@ -23,10 +25,10 @@ async def post_decisao_estrategica():
     Returns:
         Decisão estratégica aplicada
     """
-    return processar_decisao_estrategica()
+    return await executar_processamento(processar_decisao_estrategica)
 
 @router.get("/decisao-estrategica")
-async def get_decisao_estrategica():
+async def get_decisao_estrategica(request: Request):
     """
     Obtém última decisão estratégica do histórico
     (sem dados detalhados dos indicadores)
@@ -34,10 +36,10 @@ async def get_decisao_estrategica():
     Returns:
         Última decisão aplicada + JSONs auditoria
     """
-    return obter_decisao_estrategica()
+    return await responder_condicional(request, ["decisao_estrategica"], obter_decisao_estrategica)
 
 @router.get("/decisao-estrategica-detalhe")
-async def get_decisao_estrategica_detalhe():
+async def get_decisao_estrategica_detalhe(request: Request):
     """
     Obtém última decisão estratégica do histórico
     (sem dados detalhados dos indicadores)
@@ -45,10 +47,10 @@ async def get_decisao_estrategica_detalhe():
     Returns:
         Última decisão aplicada + JSONs auditoria
     """
-    return obter_detalhe_estrategia()
+    return await responder_condicional(request, ["decisao_estrategica"], obter_detalhe_estrategia)
 
 @router.get("/decisao-estrategica/historico")
-async def get_historico_decisoes_endpoint(limit: int = Query(default=10, description="Número de registros")):
+async def get_historico_decisoes_endpoint(request: Request, limit: int = Query(default=10, description="Número de registros")):
     """
     Busca histórico de decisões estratégicas
     (inclui dados completos de auditoria)
@@ -56,6 +58,9 @@ async def get_historico_decisoes_endpoint(limit: int = Query(default=10, descrip
     Returns:
         Histórico completo com JSONs de auditoria
     """
+    return await responder_condicional(request, ["decisao_estrategica"], _montar_historico, limit, extras=(limit,))
+
+def _montar_historico(limit: int) -> dict:
     try:
         historico = get_historico_decisoes(limit)
         
@@ -78,9 +83,10 @@ async def get_debug_matriz():
     Debug da matriz estratégica:
     - Valida completude (15 cenários)
     - Mostra distribuição por tendência
+    - Lacunas/sobreposições da grade 101x101 em memória
     - Status geral da matriz
     
     Returns:
         Status e validação da matriz
     """
-    return debug_matriz_estrategica()
\ No newline at end of file
+    return await executar_leitura(debug_matriz_estrategica)
\ No newline at end of file
@@ -1,14 +1,15 @@
 from fastapi import APIRouter
 from app.services.scores import riscos
 from app.services.alavancagem import alavancagem_service
+from app.services.utils.helpers.executor_helper import executar_processamento
 
 router = APIRouter()
 
 @router.get("/score-risco")
 async def calcular_score():
-   return riscos.calcular_score_compacto()
+   return await executar_processamento(riscos.calcular_score_compacto)
 
 
 @router.get("/alavancagem")
 async def get_alavancagem():
-    return alavancagem_service.calcular_alavancagem()
\ No newline at end of file
+    return await executar_processamento(alavancagem_service.calcular_alavancagem)
\ No newline at end of file
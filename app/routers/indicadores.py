@@ -3,19 +3,20 @@
 from fastapi import APIRouter
 from datetime import datetime
 from app.services.indicadores import ciclos, riscos, momentum, tecnico_v3
+from app.services.utils.helpers.executor_helper import executar_leitura
 
 router = APIRouter()
 
 @router.get("/obter-indicadores/{bloco}")
 async def obter_indicadores(bloco: str):
     if bloco == "ciclos":
-        return ciclos.obter_indicadores()
+        return await executar_leitura(ciclos.obter_indicadores)
     elif bloco == "riscos":
-        return riscos.obter_indicadores()
+        return await executar_leitura(riscos.obter_indicadores)
     elif bloco == "momentum":
-        return momentum.obter_indicadores()
+        return await executar_leitura(momentum.obter_indicadores)
     elif bloco == "tecnico":
-        return tecnico_v3.obter_indicadores()
+        return await executar_leitura(tecnico_v3.obter_indicadores)
     else:
         return {"status": "erro", "detalhes": "Bloco inválido"}
 
@@ -0,0 +1,24 @@
+# app/routers/pipeline.py
+
+from fastapi import APIRouter
+from app.services.pipeline.pipeline_service import executar_pipeline, obter_grafo
+from app.services.utils.helpers.executor_helper import executar_leitura, executar_processamento
+
+router = APIRouter()
+
+@router.post("/pipeline/run")
+async def post_pipeline_run(forcar: bool = False, forcar_coleta: bool = False):
+    """
+    Atualização completa em processo (coletas → scores → decisão → dash-main):
+    - Etapas independentes em paralelo
+    - Pula etapas cujas entradas não mudaram (forcar=true executa todas)
+    
+    Returns:
+        Status e tempos por etapa
+    """
+    return await executar_processamento(executar_pipeline, forcar, forcar_coleta)
+
+@router.get("/pipeline")
+async def get_pipeline():
+    """Grafo de etapas e últimas entradas processadas"""
+    return await executar_leitura(obter_grafo)
@@ -0,0 +1,76 @@
+# app/routers/preco.py
+
+import asyncio
+import json
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.services.utils.helpers.tradingview.price_helper import get_btc_price, get_price_stats
+from app.services.utils.helpers.tradingview.price_stream import get_stream
+from app.services.utils.helpers.executor_helper import executar_leitura
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+
+@router.get("/preco-btc")
+async def get_preco_btc(candles: int = 0):
+    """
+    Preço atual do BTC (memória do stream quando ativo; senão busca hedged)
+
+    Args:
+        candles: últimos N candles 1m montados pelo stream (inclui o em formação)
+    """
+    stream = get_stream()
+    resposta = {
+        "status": "success",
+        "preco": await executar_leitura(get_btc_price),
+        "stream": stream.status() if stream else {"ativo": False},
+        "fontes": get_price_stats()
+    }
+    if candles and stream:
+        resposta["candles"] = stream.ultimos_candles(candles, incluir_formacao=True)
+    return resposta
+
+@router.get("/preco-btc/stream")
+async def get_preco_btc_stream(request: Request):
+    """Server-Sent Events: preço (throttled) e candles 1m fechados"""
+    stream = get_stream()
+    if stream is None:
+        return {"status": "error", "erro": "Stream de preço desligado (PRICE_STREAM_ENABLED)"}
+
+    async def eventos():
+        fila = stream.assinar()
+        try:
+            while not await request.is_disconnected():
+                try:
+                    evento = await asyncio.wait_for(fila.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {evento['tipo']}\ndata: {json.dumps(evento)}\n\n"
+        finally:
+            stream.cancelar(fila)
+
+    return StreamingResponse(eventos(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/preco-btc/ws")
+async def ws_preco_btc(websocket: WebSocket):
+    """WebSocket com os mesmos eventos do SSE"""
+    await websocket.accept()
+    stream = get_stream()
+    if stream is None:
+        await websocket.close(code=1013, reason="Stream de preço desligado")
+        return
+
+    fila = stream.assinar()
+    try:
+        while True:
+            try:
+                evento = await asyncio.wait_for(fila.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                evento = {"tipo": "heartbeat"}  # envio falha em conexão morta e encerra o handler
+            await websocket.send_json(evento)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stream.cancelar(fila)
@@ -2,19 +2,20 @@
 
 from fastapi import APIRouter
 from app.services.scores import ciclos, momentum, riscos, tecnico
+from app.services.utils.helpers.executor_helper import executar_processamento
 
 router = APIRouter()
 
 @router.get("/calcular-score/{bloco}")
 async def calcular_score(bloco: str):
     if bloco == "ciclos":
-        return ciclos.calcular_score()
+        return await executar_processamento(ciclos.calcular_score)
     elif bloco == "momentum":
-        return momentum.calcular_score()
+        return await executar_processamento(momentum.calcular_score)
     elif bloco == "riscos":
-        return riscos.calcular_score()
+        return await executar_processamento(riscos.calcular_score)
     elif bloco == "tecnico":
-        return tecnico.calcular_score()
+        return await executar_processamento(tecnico.calcular_score)
     else:
         return {
             "status": "erro", 
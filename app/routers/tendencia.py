@@ -1,10 +1,11 @@
 
 from fastapi import APIRouter
 from app.services.tendencia import tendecia_service
+from app.services.utils.helpers.executor_helper import executar_processamento
 
 router = APIRouter()
 
 @router.get("/calcular-score-tendecia")
-async def calcular_score():
-        return  tendecia_service.calcular_score()
+async def calcular_score(incluir_formacao: bool = False):
+        return await executar_processamento(tendecia_service.calcular_score, incluir_formacao)
   
\ No newline at end of file
@@ -3,9 +3,11 @@
 import logging
 from typing import Optional, Dict
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro
 
 logger = logging.getLogger(__name__)
 
+@cache_ultimo_registro("decisao_estrategica")
 def get_alavancagem_permitida() -> Optional[float]:
     """
     Busca nível de alavancagem da última decisão estratégica
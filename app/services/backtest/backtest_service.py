@@ -0,0 +1,85 @@
+# app/services/backtest/backtest_service.py
+
+"""
+Backtest da matriz estratégica sobre fixture local (sem rede)
+
+    python -m app.services.backtest.backtest_service --dados fixture.csv --matriz matriz.csv
+    python -m app.services.backtest.backtest_service --dados fixture.parquet --escalas 0.5 1 1.5 --saida resultados/
+    python -m app.services.backtest.backtest_service --exportar fixture.csv   # gera fixture do PostgreSQL
+
+Sem --matriz, usa a matriz_estrategica_v2 do banco.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Sequence
+from .dados_helper import carregar_fixture, carregar_matriz_csv, carregar_matriz_banco, exportar_fixture_banco
+from .engine import executar_backtest, grade_alavancagem, variantes_escala
+
+logger = logging.getLogger(__name__)
+
+def executar(caminho_dados: str, caminho_matriz: Optional[str] = None, escalas: Sequence[float] = (1.0,),
+             custo_bps: float = 0.0, exposicao_minima: float = 1.0, saida: Optional[str] = None) -> Dict:
+    """
+    Executa o backtest para cada escala de alavancagem da matriz
+
+    Args:
+        saida: diretório para metricas.csv e curvas_<variante>.csv (opcional)
+
+    Returns:
+        dict com período, métricas por variante e buy & hold
+    """
+    inicio = time.monotonic()
+    dados = carregar_fixture(caminho_dados)
+    linhas = carregar_matriz_csv(caminho_matriz) if caminho_matriz else carregar_matriz_banco()
+
+    grades = variantes_escala(grade_alavancagem(linhas), escalas)
+    nomes = [f"escala_{fator:g}" for fator in escalas]
+    resultado = executar_backtest(dados, grades, custo_bps=custo_bps, exposicao_minima=exposicao_minima, nomes=nomes)
+
+    if saida:
+        os.makedirs(saida, exist_ok=True)
+        resultado.tabela_metricas().to_csv(os.path.join(saida, "metricas.csv"), index=False)
+        for i, nome in enumerate(nomes):
+            resultado.curvas(i).to_csv(os.path.join(saida, f"curvas_{nome}.csv"), index=False)
+        logger.info(f"💾 Resultados backtest em {saida}")
+
+    tempo_ms = round((time.monotonic() - inicio) * 1000, 1)
+    logger.info(f"✅ Backtest: {len(dados['close'])} dias x {len(nomes)} variantes em {tempo_ms}ms")
+
+    return {
+        "status": "success",
+        "periodo": {
+            "inicio": str(dados["data"][0]),
+            "fim": str(dados["data"][-1]),
+            "dias": int(len(dados["close"]))
+        },
+        "metricas": resultado.metricas,
+        "buy_and_hold": resultado.buy_and_hold,
+        "tempo_ms": tempo_ms
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest da matriz estratégica")
+    parser.add_argument("--dados", help="Fixture diária (CSV ou Parquet)")
+    parser.add_argument("--matriz", default=None, help="Matriz em CSV (padrão: matriz_estrategica_v2 do banco)")
+    parser.add_argument("--escalas", type=float, nargs="+", default=[1.0], help="Fatores aplicados à alavancagem da matriz")
+    parser.add_argument("--custo-bps", type=float, default=0.0, help="Custo por unidade de exposição trocada")
+    parser.add_argument("--exposicao-minima", type=float, default=1.0, help="Piso da exposição (1.0 = mantém spot)")
+    parser.add_argument("--saida", default=None, help="Diretório para métricas e curvas")
+    parser.add_argument("--exportar", default=None, help="Gera a fixture a partir do PostgreSQL neste caminho")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.exportar:
+        exportar_fixture_banco(args.exportar)
+    elif args.dados:
+        print(json.dumps(
+            executar(args.dados, args.matriz, args.escalas, args.custo_bps, args.exposicao_minima, args.saida),
+            indent=2, ensure_ascii=False
+        ))
+    else:
+        parser.error("informe --dados ou --exportar")
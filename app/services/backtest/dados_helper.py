@@ -0,0 +1,135 @@
+# app/services/backtest/dados_helper.py
+
+"""
+Dados do backtest: fixture local (CSV/Parquet) ou exportação do PostgreSQL
+
+Formato da fixture (uma linha por dia):
+    data, close, mvrv_z_score, nupl, reserve_risk, puell_multiple[, score_tendencia]
+score_tendencia é opcional: presente, o histórico gravado é usado;
+ausente, o score é recalculado das EMAs semanais dos fechamentos.
+
+Matriz (CSV): score_tendencia_min, score_tendencia_max, score_onchain_min,
+score_onchain_max, alavancagem[, id] - mesmas colunas de matriz_estrategica_v2.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUNAS_CICLO = ["mvrv_z_score", "nupl", "reserve_risk", "puell_multiple"]
+
+def _ler_tabela(caminho: str) -> pd.DataFrame:
+    if caminho.endswith(".parquet"):
+        try:
+            return pd.read_parquet(caminho)
+        except ImportError as e:
+            raise ImportError(f"Leitura Parquet requer pyarrow: {str(e)}")
+    return pd.read_csv(caminho)
+
+def carregar_fixture(caminho: str) -> Dict[str, np.ndarray]:
+    """
+    Lê a fixture diária e devolve arrays alinhados por data
+
+    Indicadores de ciclo ausentes em um dia repetem o último valor conhecido;
+    dias anteriores ao primeiro registro completo são descartados.
+    """
+    df = _ler_tabela(caminho)
+
+    faltantes = {"data", "close", *COLUNAS_CICLO} - set(df.columns)
+    if faltantes:
+        raise ValueError(f"Fixture sem colunas obrigatórias: {sorted(faltantes)}")
+
+    df["data"] = pd.to_datetime(df["data"]).dt.normalize()
+    df = df.sort_values("data").drop_duplicates("data", keep="last")
+    df[COLUNAS_CICLO] = df[COLUNAS_CICLO].ffill()
+    if "score_tendencia" in df.columns:
+        df["score_tendencia"] = df["score_tendencia"].ffill()
+    df = df.dropna(subset=["close", *COLUNAS_CICLO]).reset_index(drop=True)
+
+    if df.empty:
+        raise ValueError("Fixture sem dias completos (close + indicadores de ciclo)")
+
+    dados = {
+        "data": df["data"].values.astype("datetime64[D]"),
+        "close": df["close"].to_numpy(dtype=np.float64),
+        **{coluna: df[coluna].to_numpy(dtype=np.float64) for coluna in COLUNAS_CICLO}
+    }
+    if "score_tendencia" in df.columns and df["score_tendencia"].notna().all():
+        dados["score_tendencia"] = df["score_tendencia"].to_numpy(dtype=np.float64)
+
+    logger.info(f"📂 Fixture backtest: {len(df)} dias ({df['data'].iloc[0].date()} → {df['data'].iloc[-1].date()})")
+    return dados
+
+def carregar_matriz_csv(caminho: str) -> List[Dict]:
+    """Linhas da matriz a partir de CSV (colunas de matriz_estrategica_v2)"""
+    df = _ler_tabela(caminho)
+    if "id" not in df.columns:
+        df["id"] = np.arange(1, len(df) + 1)
+    return df.to_dict("records")
+
+def carregar_matriz_banco() -> List[Dict]:
+    """Linhas da matriz em uso (grade em memória da decisão estratégica)"""
+    from app.services.decisao_estrategica.utils.matriz_memoria import obter_matriz
+    return [dict(linha) for linha in obter_matriz().linhas]
+
+def exportar_fixture_banco(caminho: str, symbol: str = "BTCUSDT", exchange: str = "BINANCE") -> int:
+    """
+    Gera a fixture a partir do PostgreSQL: último registro diário de
+    indicadores_ciclo e score_tendencia + fechamentos 1D de ohlc_bars
+    """
+    from app.services.utils.helpers.postgres.base import execute_query
+
+    closes = execute_query("""
+        SELECT DATE(datetime) AS data, close
+        FROM ohlc_bars
+        WHERE symbol = %s AND exchange = %s AND intervalo = '1D'
+        ORDER BY datetime
+    """, (symbol, exchange), fetch_all=True)
+
+    ciclo = execute_query(f"""
+        SELECT DISTINCT ON (DATE(timestamp)) DATE(timestamp) AS data, {", ".join(COLUNAS_CICLO)}
+        FROM indicadores_ciclo
+        ORDER BY DATE(timestamp), timestamp DESC
+    """, fetch_all=True)
+
+    tendencia = execute_query("""
+        SELECT DISTINCT ON (DATE(timestamp)) DATE(timestamp) AS data, score_emas AS score_tendencia
+        FROM score_tendencia
+        ORDER BY DATE(timestamp), timestamp DESC
+    """, fetch_all=True)
+
+    df = pd.DataFrame(closes or [], columns=["data", "close"])
+    for tabela in (ciclo, tendencia):
+        if tabela:
+            df = df.merge(pd.DataFrame(tabela), on="data", how="left")
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    if caminho.endswith(".parquet"):
+        df.to_parquet(caminho, index=False)
+    else:
+        df.to_csv(caminho, index=False)
+
+    logger.info(f"💾 Fixture backtest exportada: {len(df)} dias -> {caminho}")
+    return len(df)
+
+def gerar_fixture_sintetica(dias: int, seed: int = 42, inicio: str = "2015-01-01") -> Dict[str, np.ndarray]:
+    """Série sintética (passeio log-normal + indicadores de ciclo correlacionados) para benchmarks"""
+    rng = np.random.default_rng(seed)
+    retornos = rng.normal(0.0008, 0.035, dias)
+    close = 300 * np.exp(np.cumsum(retornos))
+
+    # Indicadores "caros" quando o preço está acima da média longa
+    media = pd.Series(close).rolling(365, min_periods=1).mean().to_numpy()
+    desvio = np.log(close / media)
+    return {
+        "data": np.arange(np.datetime64(inicio, "D"), np.datetime64(inicio, "D") + dias),
+        "close": close,
+        "mvrv_z_score": 1.5 + 2.5 * desvio + rng.normal(0, 0.1, dias),
+        "nupl": 0.35 + 0.6 * desvio + rng.normal(0, 0.03, dias),
+        "reserve_risk": 1.0 + 1.2 * desvio + rng.normal(0, 0.05, dias),
+        "puell_multiple": 1.3 + 2.0 * desvio + rng.normal(0, 0.1, dias)
+    }
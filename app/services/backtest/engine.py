@@ -0,0 +1,188 @@
+# app/services/backtest/engine.py
+
+"""
+Motor de backtest vetorizado da matriz estratégica
+
+Fluxo por dia: scores (tendência, ciclo) -> célula da grade 101x101 ->
+alavancagem da matriz -> exposição aplicada ao retorno do dia seguinte
+(decisão no fechamento, sem olhar o futuro).
+
+Variantes da matriz são grades (V, 101, 101); todas são simuladas de uma vez
+com arrays (V, n) - sem loop Python por dia ou por variante.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from app.services.decisao_estrategica.utils.matriz_memoria import MatrizMemoria
+from .scores_vetorizados import (
+    ParametrosScore, emas_semanais_diarias, score_tendencia_vetorizado,
+    score_ciclo_vetorizado, indices_matriz
+)
+
+DIAS_ANO = 365
+
+@dataclass
+class ResultadoBacktest:
+    datas: np.ndarray
+    close: np.ndarray
+    score_tendencia: np.ndarray
+    score_ciclo: np.ndarray
+    alavancagem: np.ndarray   # (V, n) exposição aplicada
+    equity: np.ndarray        # (V, n)
+    drawdown: np.ndarray      # (V, n)
+    metricas: List[Dict]
+    buy_and_hold: Dict
+
+    def curvas(self, variante: int = 0) -> pd.DataFrame:
+        """Curvas diárias de uma variante (equity, alavancagem, drawdown)"""
+        return pd.DataFrame({
+            "data": self.datas,
+            "close": self.close,
+            "score_tendencia": self.score_tendencia,
+            "score_ciclo": self.score_ciclo,
+            "alavancagem": self.alavancagem[variante],
+            "equity": self.equity[variante],
+            "drawdown": self.drawdown[variante]
+        })
+
+    def tabela_metricas(self) -> pd.DataFrame:
+        return pd.DataFrame(self.metricas)
+
+def grade_alavancagem(linhas: List[Dict]) -> np.ndarray:
+    """
+    Grade (101, 101) de alavancagem a partir das linhas da matriz
+    Mesma regra de desempate da decisão (menor id); células sem cenário = NaN
+    """
+    matriz = MatrizMemoria(linhas, impressao="backtest")
+    valores = np.array([float(linha["alavancagem"]) for linha in matriz.linhas] + [np.nan])
+    return valores[matriz.grade]
+
+def variantes_escala(grade: np.ndarray, fatores: Sequence[float]) -> np.ndarray:
+    """Variantes da matriz com a alavancagem multiplicada por cada fator -> (V, 101, 101)"""
+    return np.asarray(fatores, dtype=np.float64).reshape(-1, 1, 1) * grade[None, :, :]
+
+def calcular_scores(dados: Dict[str, np.ndarray], params: ParametrosScore = ParametrosScore(),
+                    usar_gravado: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Scores diários de tendência e ciclo
+
+    usar_gravado: score_tendencia gravado na fixture tem prioridade (backtest
+    único com os pesos padrão). A varredura passa False: todas as
+    configurações, inclusive a de produção, recalculam a tendência pelas EMAs
+    e ficam comparáveis entre si.
+    """
+    if usar_gravado and "score_tendencia" in dados and params.pesos_tendencia == ParametrosScore().pesos_tendencia:
+        score_tendencia = dados["score_tendencia"]
+    else:
+        emas = dados.get("emas_semanais")
+        if emas is None:
+            emas = emas_semanais_diarias(dados["data"], dados["close"])
+        score_tendencia = score_tendencia_vetorizado(dados["close"], emas, params.pesos_tendencia)
+
+    score_ciclo = score_ciclo_vetorizado(
+        dados["mvrv_z_score"], dados["nupl"], dados["reserve_risk"], dados["puell_multiple"], params
+    )
+    return {"score_tendencia": score_tendencia, "score_ciclo": score_ciclo}
+
+def simular(close: np.ndarray, exposicao: np.ndarray, custo_bps: float = 0.0, capital_inicial: float = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Equity e drawdown para exposições (V, n) sobre os fechamentos (n,)
+
+    equity[t] = equity[t-1] * (1 + exposicao[t-1] * retorno[t] - custo da troca em t-1)
+    Perda maior que o capital zera a equity (liquidação).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    exposicao = np.atleast_2d(np.asarray(exposicao, dtype=np.float64))
+    retornos = close[1:] / close[:-1] - 1.0
+
+    fator = 1.0 + exposicao[:, :-1] * retornos
+    if custo_bps:
+        trocas = np.abs(np.diff(exposicao, axis=1, prepend=exposicao[:, :1]))[:, :-1]
+        fator -= trocas * (custo_bps / 1e4)
+    np.maximum(fator, 0.0, out=fator)
+
+    equity = np.empty(exposicao.shape)
+    equity[:, 0] = capital_inicial
+    np.cumprod(fator, axis=1, out=equity[:, 1:])
+    equity[:, 1:] *= capital_inicial
+
+    pico = np.maximum.accumulate(equity, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = np.where(pico > 0, equity / pico - 1.0, -1.0)
+
+    return {"equity": equity, "drawdown": drawdown}
+
+def calcular_metricas(equity: np.ndarray, drawdown: np.ndarray, exposicao: np.ndarray) -> Dict[str, np.ndarray]:
+    """Métricas por variante (arrays (V,)): retorno, CAGR, max drawdown, volatilidade, Sharpe, Calmar"""
+    n = equity.shape[1]
+    anos = max(n - 1, 1) / DIAS_ANO
+    final = equity[:, -1] / equity[:, 0]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        retornos = equity[:, 1:] / equity[:, :-1] - 1.0
+        retornos = np.nan_to_num(retornos, nan=0.0, posinf=0.0, neginf=0.0)
+        media, desvio = retornos.mean(axis=1), retornos.std(axis=1)
+        cagr = np.where(final > 0, final ** (1.0 / anos) - 1.0, -1.0)
+        max_drawdown = drawdown.min(axis=1)
+        sharpe = np.where(desvio > 0, media / desvio * np.sqrt(DIAS_ANO), 0.0)
+        calmar = np.where(max_drawdown < 0, cagr / -max_drawdown, 0.0)
+
+    return {
+        "retorno_total": final - 1.0,
+        "cagr": cagr,
+        "max_drawdown": max_drawdown,
+        "volatilidade_anual": desvio * np.sqrt(DIAS_ANO),
+        "sharpe": sharpe,
+        "calmar": calmar,
+        "alavancagem_media": exposicao.mean(axis=1),
+        "trocas": (np.diff(exposicao, axis=1) != 0).sum(axis=1),
+        "liquidado": (equity[:, -1] <= 0)
+    }
+
+def executar_backtest(dados: Dict[str, np.ndarray], grades: np.ndarray,
+                      params: ParametrosScore = ParametrosScore(),
+                      custo_bps: float = 0.0, exposicao_minima: float = 1.0,
+                      nomes: Optional[Sequence[str]] = None) -> ResultadoBacktest:
+    """
+    Backtest de uma ou mais variantes da matriz
+
+    Args:
+        dados: arrays da fixture (dados_helper.carregar_fixture)
+        grades: (101, 101) ou (V, 101, 101) de alavancagem
+        custo_bps: custo por unidade de exposição trocada (pontos-base)
+        exposicao_minima: piso da exposição - alavancagem 0 na matriz
+            significa sem empréstimo, mantendo a posição spot (1.0)
+        nomes: rótulos das variantes nas métricas
+    """
+    grades = grades[None, :, :] if grades.ndim == 2 else grades
+    scores = calcular_scores(dados, params)
+    t, c = indices_matriz(scores["score_tendencia"], scores["score_ciclo"])
+
+    alavancagem = grades[:, t, c]
+    exposicao = np.maximum(np.nan_to_num(alavancagem, nan=exposicao_minima), exposicao_minima)
+
+    curvas = simular(dados["close"], exposicao, custo_bps)
+    metricas = calcular_metricas(curvas["equity"], curvas["drawdown"], exposicao)
+
+    spot = simular(dados["close"], np.ones((1, exposicao.shape[1])))
+    buy_and_hold = {k: v[0].item() for k, v in calcular_metricas(spot["equity"], spot["drawdown"], np.ones((1, exposicao.shape[1]))).items()}
+
+    nomes = list(nomes) if nomes is not None else [f"variante_{i}" for i in range(grades.shape[0])]
+    tabela = [
+        {"variante": nomes[i], **{k: v[i].item() for k, v in metricas.items()}}
+        for i in range(grades.shape[0])
+    ]
+
+    return ResultadoBacktest(
+        datas=dados["data"],
+        close=dados["close"],
+        score_tendencia=scores["score_tendencia"],
+        score_ciclo=scores["score_ciclo"],
+        alavancagem=exposicao,
+        equity=curvas["equity"],
+        drawdown=curvas["drawdown"],
+        metricas=tabela,
+        buy_and_hold=buy_and_hold
+    )
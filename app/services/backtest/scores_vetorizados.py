@@ -0,0 +1,161 @@
+# app/services/backtest/scores_vetorizados.py
+
+"""
+Versões vetorizadas (NumPy) dos scores usados na decisão estratégica
+
+Mesmas regras das funções escalares, aplicadas a séries inteiras:
+- score_tendencia_vetorizado  -> tendencia/utils/ema_score_calculator.calculate_ema_score
+- score_ciclo_vetorizado      -> scores/ciclos.calcular_score (mvrv, nupl, reserve risk, puell)
+Os limites e pesos vêm de ParametrosScore; os padrões reproduzem os valores
+em produção (paridade conferida em benchmarks/backtest_benchmark.py).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import numpy as np
+from app.services.utils.helpers.tradingview import indicator_engine
+
+EMAS_TENDENCIA = (10, 20, 50, 100, 200)
+
+@dataclass(frozen=True)
+class ParametrosScore:
+    # Tendência: pesos de preço>EMA10, EMA10>20, 20>50, 50>100, 100>200
+    pesos_tendencia: Tuple[float, ...] = (10, 15, 20, 25, 30)
+
+    # Ciclo: (barato, caro) das escalas lineares
+    mvrv_limites: Tuple[float, float] = (0.8, 2.75)
+    reserve_risk_limites: Tuple[float, float] = (0.5, 2.0)
+
+    # Ciclo: faixas decrescentes -> pontos 1..10 (acima do 1º = 1, abaixo do último = 10)
+    nupl_limites: Tuple[float, ...] = (0.7, 0.65, 0.6, 0.5, 0.35, 0.2, 0.05, -0.05, -0.15)
+    puell_limites: Tuple[float, ...] = (3.5, 3.0, 2.5, 2.0, 1.3, 0.9, 0.6, 0.45, 0.35)
+
+    # Ciclo: pesos do score consolidado (v1.9: só MVRV)
+    pesos_ciclo: Dict[str, float] = field(default_factory=lambda: {
+        "mvrv": 1.0, "nupl": 0.0, "reserve_risk": 0.0, "puell": 0.0
+    })
+
+# ==========================================
+# TENDÊNCIA (EMAs semanais)
+# ==========================================
+
+def emas_semanais_diarias(datas: np.ndarray, close: np.ndarray, periodos=EMAS_TENDENCIA,
+                          incluir_formacao: bool = False) -> np.ndarray:
+    """
+    EMAs semanais vistas a cada dia, como no TradingView às 00:00 do dia seguinte
+
+    Padrão (produção com CANDLE_CACHE_ENABLED): EMAs só das semanas fechadas
+    (segunda a domingo) até o dia - no domingo a própria semana já fechou; o
+    score compara o close do dia com elas.
+    incluir_formacao=True (visão intrabar / CANDLE_CACHE_ENABLED=false): a
+    barra em formação tem close = close do dia, então
+    EMA_dia = a * close_dia + (1 - a) * EMA da semana anterior fechada.
+
+    Args:
+        datas: datetime64[D] crescentes
+        close: fechamentos diários
+
+    Returns:
+        np.ndarray (len(periodos), n)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    dias = np.asarray(datas, dtype="datetime64[D]").astype(np.int64)
+    semana = (dias + 3) // 7  # 1970-01-01 foi quinta-feira -> semanas iniciando na segunda
+
+    fim_semana = np.append(semana[1:] != semana[:-1], True)
+    fechamentos_semanais = close[fim_semana]
+    emas_fechadas = indicator_engine.ema_multi(fechamentos_semanais, periodos)
+
+    # Índice da semana de cada dia
+    indice_semana = np.cumsum(np.append(True, semana[1:] != semana[:-1])) - 1
+
+    if not incluir_formacao:
+        domingo = (dias + 3) % 7 == 6
+        ultima_fechada = indice_semana - np.where(domingo, 0, 1)
+        emas = emas_fechadas[:, np.maximum(ultima_fechada, 0)]
+
+        # Primeira semana fechada: ewm(adjust=False) começa no próprio close (exato,
+        # sem o arredondamento do motor); antes dela, sem EMA, o close do dia
+        emas[:, ultima_fechada == 0] = fechamentos_semanais[0]
+        emas[:, ultima_fechada < 0] = close[ultima_fechada < 0]
+        return emas
+
+    alphas = np.array([2.0 / (p + 1.0) for p in periodos]).reshape(-1, 1)
+
+    primeira = indice_semana == 0
+    anteriores = emas_fechadas[:, np.maximum(indice_semana - 1, 0)]
+    emas = alphas * close + (1.0 - alphas) * anteriores
+
+    # Primeira semana: ewm(adjust=False) começa no próprio close
+    emas[:, primeira] = close[primeira]
+    return emas
+
+def score_tendencia_vetorizado(close: np.ndarray, emas: np.ndarray, pesos=(10, 15, 20, 25, 30)) -> np.ndarray:
+    """
+    Bull Score das EMAs (calculate_ema_score) para cada dia
+
+    Args:
+        close: preço (n,)
+        emas: (5, n) na ordem EMA10, 20, 50, 100, 200
+        pesos: pontos de cada comparação (±peso)
+
+    Returns:
+        np.ndarray int (n,) em 0-100
+    """
+    close = np.asarray(close, dtype=np.float64)
+    pesos = np.asarray(pesos, dtype=np.float64).reshape(-1, 1)
+    rapidas = np.vstack((close, emas[:-1]))
+    bull = (pesos * np.sign(rapidas - emas)).sum(axis=0)
+    return np.clip(np.trunc((bull + 100) / 2), 0, 100).astype(np.int64)
+
+# ==========================================
+# CICLO (on-chain)
+# ==========================================
+
+def escala_linear(valores: np.ndarray, barato: float, caro: float, arredondar: bool = True) -> np.ndarray:
+    """
+    Escala inversa 10 (barato) -> 1 (caro), como calcular_mvrv_score / calcular_reserve_risk
+    Acima de `caro` = 1; até `barato` (inclusive) = 10
+    """
+    v = np.asarray(valores, dtype=np.float64)
+    linear = 10 - (v - barato) / (caro - barato) * 9
+    if arredondar:
+        linear = np.round(linear, 1)
+    return np.where(v > caro, 1.0, np.where(v <= barato, 10.0, linear))
+
+def pontuar_faixas(valores: np.ndarray, limites: Tuple[float, ...]) -> np.ndarray:
+    """
+    Pontos 1..len(limites)+1 por faixas decrescentes (calcular_nupl_score / calcular_puell_score)
+
+    v > limites[0] -> 1; limites[0] >= v >= limites[1] -> 2; ...; v < limites[-1] -> último
+    """
+    v = np.asarray(valores, dtype=np.float64)
+    limites = np.asarray(limites, dtype=np.float64)
+    abaixo = (v[:, None] < limites[1:][None, :]).sum(axis=1)
+    return np.where(v > limites[0], 1.0, 2.0 + abaixo)
+
+def score_ciclo_vetorizado(mvrv: np.ndarray, nupl: np.ndarray, reserve_risk: np.ndarray, puell: np.ndarray,
+                           params: ParametrosScore = ParametrosScore()) -> np.ndarray:
+    """
+    Score consolidado do ciclo (0-100, 1 casa decimal) como scores/ciclos.calcular_score
+    """
+    pesos = params.pesos_ciclo
+    componentes = {
+        "mvrv": lambda: escala_linear(mvrv, *params.mvrv_limites),
+        "nupl": lambda: pontuar_faixas(nupl, params.nupl_limites),
+        "reserve_risk": lambda: escala_linear(reserve_risk, *params.reserve_risk_limites),
+        "puell": lambda: pontuar_faixas(puell, params.puell_limites)
+    }
+
+    consolidado = np.zeros(np.asarray(mvrv).shape[0])
+    for nome, peso in pesos.items():
+        if peso:
+            consolidado += peso * componentes[nome]()
+
+    return np.round(consolidado * 10, 1)
+
+def indices_matriz(score_tendencia: np.ndarray, score_ciclo: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores -> índices inteiros 0..100 da grade (int() como em _buscar_scores_completos)"""
+    t = np.clip(np.trunc(np.asarray(score_tendencia, dtype=np.float64)), 0, 100).astype(np.intp)
+    c = np.clip(np.trunc(np.asarray(score_ciclo, dtype=np.float64)), 0, 100).astype(np.intp)
+    return t, c
@@ -0,0 +1,275 @@
+# app/services/backtest/sweep.py
+
+"""
+Varredura de limites/pesos dos scores (tendência e ciclo) com pool de processos
+
+Os arrays de entrada (fechamentos, indicadores de ciclo, EMAs semanais
+pré-calculadas e a grade de alavancagem) ficam em shared memory: cada
+worker anexa os blocos uma vez e recebe só os parâmetros das configurações.
+
+    python -m app.services.backtest.sweep --dados fixture.csv --matriz matriz.csv --saida sweep/
+    python -m app.services.backtest.sweep --sintetico 10 --matriz matriz.csv --workers 8 --metrica sharpe
+    python -m app.services.backtest.sweep --dados fixture.csv --espaco espaco.json --amostras 5000
+
+Espaço (JSON): campo de ParametrosScore -> lista de valores, mais os atalhos
+nupl_deslocamento (soma aos limites do NUPL) e puell_escala (multiplica os do Puell).
+calculate_bbw_score não participa: o BBW não entra na decisão da matriz.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .dados_helper import carregar_fixture, carregar_matriz_csv, carregar_matriz_banco, gerar_fixture_sintetica
+from .engine import calcular_metricas, calcular_scores, grade_alavancagem, simular
+from .scores_vetorizados import ParametrosScore, emas_semanais_diarias, indices_matriz
+
+logger = logging.getLogger(__name__)
+
+PADRAO = ParametrosScore()
+
+ESPACO_PADRAO = {
+    "pesos_tendencia": [
+        (10, 15, 20, 25, 30), (20, 20, 20, 20, 20), (30, 25, 20, 15, 10),
+        (5, 10, 20, 30, 35), (10, 10, 20, 30, 30), (0, 15, 20, 30, 35)
+    ],
+    "mvrv_limites": [(barato, caro) for barato in (0.6, 0.8, 1.0) for caro in (2.25, 2.75, 3.25, 3.75)],
+    "nupl_deslocamento": [-0.1, -0.05, 0.0, 0.05, 0.1],
+    "puell_escala": [0.8, 0.9, 1.0, 1.1, 1.2],
+    "pesos_ciclo": [
+        {"mvrv": 1.0},
+        {"mvrv": 0.5, "nupl": 0.5},
+        {"mvrv": 0.4, "nupl": 0.3, "puell": 0.3},
+        {"mvrv": 0.25, "nupl": 0.25, "reserve_risk": 0.25, "puell": 0.25}
+    ]
+}
+
+# Atalho -> (campo do ParametrosScore, conversão do valor)
+_ATALHOS = {
+    "nupl_deslocamento": ("nupl_limites", lambda d: tuple(round(v + d, 6) for v in PADRAO.nupl_limites)),
+    "puell_escala": ("puell_limites", lambda f: tuple(round(v * f, 6) for v in PADRAO.puell_limites)),
+}
+# Campo -> peso do ciclo que o torna relevante
+_RELEVANCIA = {"nupl_limites": "nupl", "puell_limites": "puell", "reserve_risk_limites": "reserve_risk", "mvrv_limites": "mvrv"}
+
+# ==========================================
+# CONFIGURAÇÕES
+# ==========================================
+
+def gerar_configuracoes(espaco: Dict[str, list], amostras: Optional[int] = None, seed: int = 42) -> List[ParametrosScore]:
+    """
+    Produto cartesiano do espaço (ou amostra aleatória dele)
+
+    Limites de um componente com peso zero não mudam o resultado: essas
+    combinações são reduzidas ao valor padrão para não repetir backtests.
+    """
+    chaves = list(espaco)
+    vistos, configuracoes = set(), []
+
+    for valores in itertools.product(*(espaco[chave] for chave in chaves)):
+        campos = {}
+        for chave, valor in zip(chaves, valores):
+            if chave in _ATALHOS:
+                campo, converter = _ATALHOS[chave]
+                campos[campo] = converter(valor)
+            elif chave == "pesos_ciclo":
+                campos[chave] = {nome: float(valor.get(nome, 0.0)) for nome in PADRAO.pesos_ciclo}
+            else:
+                campos[chave] = tuple(valor)
+
+        pesos_ciclo = campos.get("pesos_ciclo", PADRAO.pesos_ciclo)
+        for campo, componente in _RELEVANCIA.items():
+            if campo in campos and not pesos_ciclo.get(componente):
+                campos[campo] = getattr(PADRAO, campo)
+
+        params = replace(PADRAO, **campos)
+        chave_unica = _chave(params)
+        if chave_unica not in vistos:
+            vistos.add(chave_unica)
+            configuracoes.append(params)
+
+    if amostras and amostras < len(configuracoes):
+        configuracoes = random.Random(seed).sample(configuracoes, amostras)
+    return configuracoes
+
+def _chave(params: ParametrosScore) -> tuple:
+    return tuple((k, tuple(sorted(v.items())) if isinstance(v, dict) else v) for k, v in asdict(params).items())
+
+def carregar_espaco(caminho: str) -> Dict[str, list]:
+    with open(caminho) as arquivo:
+        return json.load(arquivo)
+
+# ==========================================
+# SHARED MEMORY
+# ==========================================
+
+def _publicar(arrays: Dict[str, np.ndarray]) -> Tuple[List[shared_memory.SharedMemory], Dict[str, tuple]]:
+    """Copia os arrays para blocos de shared memory -> (blocos, descritores para os workers)"""
+    blocos, descritores = [], {}
+    for nome, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)[...] = array
+        blocos.append(bloco)
+        descritores[nome] = (bloco.name, array.shape, array.dtype.str)
+    return blocos, descritores
+
+# Estado do worker (preenchido pelo initializer)
+_worker_blocos: List[shared_memory.SharedMemory] = []
+_worker_dados: Dict[str, np.ndarray] = {}
+
+def _anexar(descritores: Dict[str, tuple]):
+    """
+    Initializer do worker: anexa os blocos e monta views NumPy (sem cópia)
+    Os workers compartilham o resource tracker do processo principal, que
+    remove os blocos (unlink) ao final da varredura.
+    """
+    for nome, (nome_bloco, forma, dtype) in descritores.items():
+        bloco = shared_memory.SharedMemory(name=nome_bloco)
+        _worker_blocos.append(bloco)
+        _worker_dados[nome] = np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloco.buf)
+
+def _avaliar_lote(lote: List[ParametrosScore], custo_bps: float, exposicao_minima: float) -> List[Dict]:
+    return avaliar(_worker_dados, lote, custo_bps, exposicao_minima)
+
+def avaliar(dados: Dict[str, np.ndarray], lote: List[ParametrosScore], custo_bps: float = 0.0,
+            exposicao_minima: float = 1.0) -> List[Dict]:
+    """Backtest de cada configuração sobre a mesma grade; métricas por configuração"""
+    grade = dados["grade"]
+    resultados = []
+    for params in lote:
+        scores = calcular_scores(dados, params, usar_gravado=False)
+        t, c = indices_matriz(scores["score_tendencia"], scores["score_ciclo"])
+        alavancagem = grade[t, c][None, :]
+        exposicao = np.maximum(np.nan_to_num(alavancagem, nan=exposicao_minima), exposicao_minima)
+
+        curvas = simular(dados["close"], exposicao, custo_bps)
+        metricas = calcular_metricas(curvas["equity"], curvas["drawdown"], exposicao)
+        resultados.append({
+            **_descrever(params),
+            **{k: v[0].item() for k, v in metricas.items()}
+        })
+    return resultados
+
+def _descrever(params: ParametrosScore) -> Dict:
+    """Parâmetros em colunas planas para o relatório"""
+    descricao = {}
+    for campo, valor in asdict(params).items():
+        if isinstance(valor, dict):
+            for nome, peso in valor.items():
+                descricao[f"peso_{nome}"] = peso
+        else:
+            descricao[campo] = "/".join(f"{v:g}" for v in valor)
+    return descricao
+
+# ==========================================
+# EXECUÇÃO
+# ==========================================
+
+def executar_sweep(dados: Dict[str, np.ndarray], grade: np.ndarray, configuracoes: List[ParametrosScore],
+                   workers: Optional[int] = None, metrica: str = "calmar",
+                   custo_bps: float = 0.0, exposicao_minima: float = 1.0) -> pd.DataFrame:
+    """
+    Avalia as configurações em paralelo e ordena pela métrica (desc)
+
+    Returns:
+        DataFrame com parâmetros, métricas, ranking e marcação da configuração de produção
+    """
+    workers = workers or os.cpu_count() or 1
+    inicio = time.monotonic()
+
+    arrays = {
+        "data": dados["data"],
+        "close": dados["close"],
+        "mvrv_z_score": dados["mvrv_z_score"],
+        "nupl": dados["nupl"],
+        "reserve_risk": dados["reserve_risk"],
+        "puell_multiple": dados["puell_multiple"],
+        # EMAs não dependem dos parâmetros: calculadas uma vez
+        "emas_semanais": emas_semanais_diarias(dados["data"], dados["close"]),
+        "grade": grade
+    }
+
+    tamanho_lote = max(1, min(64, len(configuracoes) // (workers * 8) or 1))
+    lotes = [configuracoes[i:i + tamanho_lote] for i in range(0, len(configuracoes), tamanho_lote)]
+    logger.info(f"🔁 Sweep: {len(configuracoes)} configurações, {workers} workers, lotes de {tamanho_lote}")
+
+    resultados: List[Dict] = []
+    if workers == 1:
+        for lote in lotes:
+            resultados.extend(avaliar(arrays, lote, custo_bps, exposicao_minima))
+    else:
+        blocos, descritores = _publicar(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_anexar, initargs=(descritores,)) as executor:
+                futures = [executor.submit(_avaliar_lote, lote, custo_bps, exposicao_minima) for lote in lotes]
+                for future in futures:
+                    resultados.extend(future.result())
+        finally:
+            for bloco in blocos:
+                bloco.close()
+                bloco.unlink()
+
+    tabela = pd.DataFrame(resultados)
+    producao = _descrever(PADRAO)
+    tabela["producao"] = np.logical_and.reduce([tabela[k] == v for k, v in producao.items()])
+    tabela = tabela.sort_values(metrica, ascending=False, kind="stable").reset_index(drop=True)
+    tabela.insert(0, "rank", np.arange(1, len(tabela) + 1))
+
+    tempo = time.monotonic() - inicio
+    logger.info(f"✅ Sweep: {len(tabela)} configurações em {tempo:.1f}s ({len(tabela) / max(tempo, 1e-9):.0f}/s)")
+    return tabela
+
+def relatorio(tabela: pd.DataFrame, metrica: str, top: int = 10) -> Dict:
+    """Resumo: melhores configurações e posição da configuração de produção"""
+    colunas = [c for c in tabela.columns if c != "producao"]
+    producao = tabela[tabela["producao"]]
+    return {
+        "status": "success",
+        "configuracoes": int(len(tabela)),
+        "metrica": metrica,
+        "melhores": tabela.head(top)[colunas].to_dict("records"),
+        "producao": producao[colunas].iloc[0].to_dict() if not producao.empty else None
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros dos scores com backtest")
+    fonte = parser.add_mutually_exclusive_group(required=True)
+    fonte.add_argument("--dados", help="Fixture diária (CSV ou Parquet)")
+    fonte.add_argument("--sintetico", type=int, help="Série sintética de N anos (benchmark)")
+    parser.add_argument("--matriz", default=None, help="Matriz em CSV (padrão: matriz_estrategica_v2 do banco)")
+    parser.add_argument("--espaco", default=None, help="Espaço de parâmetros em JSON (padrão: ESPACO_PADRAO)")
+    parser.add_argument("--amostras", type=int, default=None, help="Amostra aleatória do espaço")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--metrica", default="calmar", choices=["calmar", "sharpe", "cagr", "retorno_total", "max_drawdown"])
+    parser.add_argument("--custo-bps", type=float, default=0.0)
+    parser.add_argument("--exposicao-minima", type=float, default=1.0)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--saida", default=None, help="Diretório para sweep.csv e relatorio.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    dados = carregar_fixture(args.dados) if args.dados else gerar_fixture_sintetica(args.sintetico * 365)
+    linhas = carregar_matriz_csv(args.matriz) if args.matriz else carregar_matriz_banco()
+    configuracoes = gerar_configuracoes(carregar_espaco(args.espaco) if args.espaco else ESPACO_PADRAO, args.amostras)
+
+    tabela = executar_sweep(dados, grade_alavancagem(linhas), configuracoes, args.workers,
+                            args.metrica, args.custo_bps, args.exposicao_minima)
+    resumo = relatorio(tabela, args.metrica, args.top)
+
+    if args.saida:
+        os.makedirs(args.saida, exist_ok=True)
+        tabela.to_csv(os.path.join(args.saida, "sweep.csv"), index=False)
+        with open(os.path.join(args.saida, "relatorio.json"), "w") as arquivo:
+            json.dump(resumo, arquivo, indent=2, ensure_ascii=False, default=str)
+
+    print(json.dumps(resumo, indent=2, ensure_ascii=False, default=str))
@@ -13,7 +13,7 @@ def coletar(forcar_coleta: bool):
         logger.info("🔄 Iniciando coleta bloco MOMENTUM...")
         
         # 1. Buscar dados do Notion
-        dados_notion = get_momentum_data_from_notion()
+        dados_notion = get_momentum_data_from_notion(forcar_coleta)
         if not dados_notion:
             raise Exception("Nenhum dado retornado do Notion Database")
         
@@ -1,33 +1,85 @@
 # app/services/dashboards/dash_finance/alavancagem_query.py
 
 import logging
-from datetime import datetime, timedelta
+from app.services.utils.helpers.postgres.base import execute_query_colunas
+from .historico_diario_helper import buscar_historico_diario, serie, timestamps_iso, total_linhas
 
 logger = logging.getLogger(__name__)
 
+# Alavancagem atual: último registro de cada dia (rollup indicadores_risco_diario,
+# timestamp da própria amostra via alavancagem_ultimo_id)
+# Alavancagem permitida: última decisão estratégica até aquele registro
+ALAVANCAGEM_DIARIO_QUERY = """
+    SELECT
+        r.data,
+        a.timestamp,
+        r.alavancagem_ultimo as atual,
+        d.alavancagem as permitida
+    FROM indicadores_risco_diario r
+    JOIN indicadores_risco a ON a.id = r.alavancagem_ultimo_id
+    LEFT JOIN LATERAL (
+        SELECT alavancagem
+        FROM decisao_estrategica
+        WHERE timestamp <= a.timestamp
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) d ON TRUE
+    WHERE a.timestamp >= %s
+      AND r.alavancagem_ultimo IS NOT NULL
+    ORDER BY r.data DESC
+"""
+
+# Mesma consulta sobre as amostras brutas (fallback do rollup diário)
+ALAVANCAGEM_QUERY = """
+    SELECT
+        r.data,
+        r.timestamp,
+        r.alavancagem as atual,
+        d.alavancagem as permitida
+    FROM (
+        SELECT DISTINCT ON (DATE(timestamp))
+            DATE(timestamp) as data,
+            timestamp,
+            alavancagem
+        FROM indicadores_risco
+        WHERE timestamp >= %s
+          AND alavancagem IS NOT NULL
+        ORDER BY DATE(timestamp) DESC, timestamp DESC, id DESC
+    ) r
+    LEFT JOIN LATERAL (
+        SELECT alavancagem
+        FROM decisao_estrategica
+        WHERE timestamp <= r.timestamp
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) d ON TRUE
+    ORDER BY r.timestamp DESC
+"""
+
 def get_alavancagem_data(data_inicio) -> list:
     """
-    Mock Alavancagem Atual vs Permitida
-    TODO: Implementar query real após migração dash_main
+    Alavancagem Atual vs Permitida - último registro de cada dia
     """
     try:
-        # Calcular dias desde data_inicio
-        dias_diff = (datetime.utcnow() - data_inicio).days
-        total_dias = min(dias_diff, 365)  # Máximo 1 ano
-        
-        dados = []
-        
-        for i in range(total_dias):
-            data = datetime.utcnow() - timedelta(days=i)
-            dados.append({
-                "timestamp": data.isoformat(),
-                "atual": round(1.2 + (i * 0.02), 2),
-                "permitida": 2.5 if i < 15 else 2.0
-            })
+        colunas = buscar_historico_diario(
+            data_inicio, ["alavancagem"], ALAVANCAGEM_QUERY,
+            buscar_rollup=lambda inicio: execute_query_colunas(ALAVANCAGEM_DIARIO_QUERY, params=(inicio,))
+        )
         
-        logger.info(f"🔧 Alavancagem mock: {len(dados)} registros gerados")
-        return dados
+        if total_linhas(colunas):
+            permitidas = [float(v) if v is not None else None for v in colunas["permitida"]]
+            dados = [
+                {"timestamp": timestamp, "atual": atual, "permitida": permitida}
+                for timestamp, atual, permitida in zip(
+                    timestamps_iso(colunas["timestamp"]), serie(colunas["atual"], 2), permitidas
+                )
+            ]
+            logger.info(f"✅ Alavancagem: {len(dados)} registros obtidos")
+            return dados
+        else:
+            logger.warning("⚠️ Nenhum registro Alavancagem encontrado")
+            return []
         
     except Exception as e:
-        logger.error(f"❌ Erro mock Alavancagem: {str(e)}")
-        return []
\ No newline at end of file
+        logger.error(f"❌ Erro query Alavancagem: {str(e)}")
+        return []
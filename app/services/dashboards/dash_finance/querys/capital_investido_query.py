@@ -1,37 +1,41 @@
 # app/services/dashboards/dash_finance/capital_investido_query.py
 
 import logging
-from datetime import datetime, timedelta
+from .historico_diario_helper import buscar_historico_diario, serie, timestamps_iso, total_linhas
 
 logger = logging.getLogger(__name__)
 
+# Capital investido (posição total = supplied_asset_value): último registro de cada dia
+# nas amostras brutas (fallback do rollup diário)
+CAPITAL_INVESTIDO_QUERY = """
+    SELECT DISTINCT ON (DATE(timestamp))
+        DATE(timestamp) as data,
+        timestamp,
+        supplied_asset_value
+    FROM indicadores_risco
+    WHERE timestamp >= %s
+      AND supplied_asset_value IS NOT NULL
+    ORDER BY DATE(timestamp) DESC, timestamp DESC, id DESC
+"""
+
 def get_capital_investido_data(data_inicio) -> list:
     """
-    Mock Capital Investido (Posição Total)
-    TODO: Implementar query real supplied_asset_value após validação
+    Capital Investido (Posição Total) - último registro de cada dia
     """
     try:
-        # Calcular dias desde data_inicio
-        dias_diff = (datetime.utcnow() - data_inicio).days
-        total_dias = min(dias_diff, 365)  # Máximo 1 ano
-        
-        dados = []
-        valor_inicial = 95000.0
-        
-        for i in range(total_dias):
-            data = datetime.utcnow() - timedelta(days=i)
-            # Simulação posição total com alavancagem
-            variacao = (total_dias - i) * 200 + (i % 7) * 800
-            valor = valor_inicial + variacao
-            
-            dados.append({
-                "timestamp": data.isoformat(),
-                "valor": round(valor, 2)
-            })
+        colunas = buscar_historico_diario(data_inicio, ["supplied_asset_value"], CAPITAL_INVESTIDO_QUERY)
         
-        logger.info(f"🔧 Capital Investido mock: {len(dados)} registros gerados")
-        return dados
+        if total_linhas(colunas):
+            dados = [
+                {"timestamp": timestamp, "valor": valor}
+                for timestamp, valor in zip(timestamps_iso(colunas["timestamp"]), serie(colunas["supplied_asset_value"], 2))
+            ]
+            logger.info(f"✅ Capital Investido: {len(dados)} registros obtidos")
+            return dados
+        else:
+            logger.warning("⚠️ Nenhum registro Capital Investido encontrado")
+            return []
         
     except Exception as e:
-        logger.error(f"❌ Erro mock Capital Investido: {str(e)}")
-        return []
\ No newline at end of file
+        logger.error(f"❌ Erro query Capital Investido: {str(e)}")
+        return []
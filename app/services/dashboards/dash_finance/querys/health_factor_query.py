@@ -1,41 +1,33 @@
 # app/services/dashboards/dash_finance/health_factor_query.py
 
 import logging
-from app.services.utils.helpers.postgres.base import execute_query
+from .historico_diario_helper import buscar_historico_diario, serie, timestamps_iso, total_linhas
 
 logger = logging.getLogger(__name__)
 
+# Último registro de cada dia nas amostras brutas (fallback do rollup diário)
+HEALTH_FACTOR_QUERY = """
+    SELECT DISTINCT ON (DATE(timestamp))
+        DATE(timestamp) as data,
+        timestamp,
+        health_factor
+    FROM indicadores_risco
+    WHERE timestamp >= %s
+      AND health_factor IS NOT NULL
+    ORDER BY DATE(timestamp) DESC, timestamp DESC, id DESC
+"""
+
 def get_health_factor_data(data_inicio) -> list:
     """
     Query Health Factor - último registro de cada dia
     """
     try:
-        query = """
-            SELECT 
-                DATE(timestamp) as data,
-                timestamp,
-                health_factor as valor
-            FROM indicadores_risco r1
-            WHERE timestamp >= %s
-              AND health_factor IS NOT NULL
-              AND timestamp = (
-                SELECT MAX(timestamp) 
-                FROM indicadores_risco r2 
-                WHERE DATE(r1.timestamp) = DATE(r2.timestamp)
-                  AND health_factor IS NOT NULL
-              )
-            ORDER BY timestamp DESC;
-        """
-        
-        resultados = execute_query(query, params=(data_inicio,), fetch_all=True)
+        colunas = buscar_historico_diario(data_inicio, ["health_factor"], HEALTH_FACTOR_QUERY)
         
-        if resultados:
+        if total_linhas(colunas):
             dados = [
-                {
-                    "timestamp": row["timestamp"].isoformat(),
-                    "valor": float(row["valor"]) if row["valor"] else 0.0
-                }
-                for row in resultados
+                {"timestamp": timestamp, "valor": valor}
+                for timestamp, valor in zip(timestamps_iso(colunas["timestamp"]), serie(colunas["health_factor"]))
             ]
             logger.info(f"✅ Health Factor: {len(dados)} registros obtidos")
             return dados
@@ -45,4 +37,4 @@ def get_health_factor_data(data_inicio) -> list:
             
     except Exception as e:
         logger.error(f"❌ Erro query Health Factor: {str(e)}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,52 @@
+# app/services/dashboards/dash_finance/querys/historico_diario_helper.py
+
+import logging
+from typing import Callable, Dict, List, Sequence
+from app.services.utils.helpers.postgres.base import execute_query_colunas
+from app.services.utils.helpers.postgres.indicadores.risco_diario_helper import get_historico_diario
+from .indices_helper import garantir_indices
+
+logger = logging.getLogger(__name__)
+
+def buscar_historico_diario(data_inicio, metricas: List[str], query_bruta: str,
+                            buscar_rollup: Callable = None) -> Dict[str, Sequence]:
+    """
+    Último registro de cada dia: rollup indicadores_risco_diario (O(dias))
+
+    Sem buscar_rollup, a primeira métrica é a âncora: timestamp da sua
+    própria última amostra do dia, como no DISTINCT ON bruto. Rollup vazio
+    ou indisponível cai para a consulta DISTINCT ON sobre as amostras
+    brutas, com os mesmos nomes de colunas (rollup incompleto: backfill
+    explícito, ver risco_diario_helper).
+
+    Returns:
+        Colunas {nome: valores} (execute_query_colunas); buscar_rollup
+        também deve retornar nesse formato
+    """
+    try:
+        if buscar_rollup is not None:
+            colunas = buscar_rollup(data_inicio)
+        else:
+            colunas = get_historico_diario(data_inicio, metricas, ancora=metricas[0], colunar=True)
+        if total_linhas(colunas):
+            return colunas
+        logger.info("ℹ️ Rollup risco diário vazio - consultando amostras brutas")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Rollup risco diário indisponível, consultando amostras brutas: {str(e)}")
+
+    garantir_indices()
+    return execute_query_colunas(query_bruta, params=(data_inicio,))
+
+def total_linhas(colunas: Dict[str, Sequence]) -> int:
+    """Número de linhas de um resultado colunar"""
+    return len(next(iter(colunas.values()), ())) if colunas else 0
+
+def serie(valores: Sequence, casas: int = None) -> List[float]:
+    """Coluna numérica -> floats (nulo/zero = 0.0), opcionalmente arredondados"""
+    if casas is None:
+        return [float(v) if v else 0.0 for v in valores]
+    return [round(float(v), casas) if v else 0.0 for v in valores]
+
+def timestamps_iso(valores: Sequence) -> List[str]:
+    return [t.isoformat() for t in valores]
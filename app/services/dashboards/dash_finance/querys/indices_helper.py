@@ -0,0 +1,40 @@
+# app/services/dashboards/dash_finance/querys/indices_helper.py
+
+import logging
+from app.services.utils.helpers.postgres.base import execute_query
+
+logger = logging.getLogger(__name__)
+
+_indices_verificados = False
+
+# Um registro por dia: DISTINCT ON (DATE(timestamp)) percorre o índice na ordem do ORDER BY
+INDICES_DASH_FINANCE = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_indicadores_risco_dia
+    ON indicadores_risco ((DATE(timestamp)) DESC, timestamp DESC, id DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_indicadores_risco_timestamp
+    ON indicadores_risco (timestamp DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_decisao_estrategica_timestamp
+    ON decisao_estrategica (timestamp DESC)
+    """
+]
+
+def garantir_indices():
+    """Cria índices das consultas diárias do dash-finance se não existirem (uma vez por processo)"""
+    global _indices_verificados
+    if _indices_verificados:
+        return
+
+    try:
+        for query in INDICES_DASH_FINANCE:
+            execute_query(query)
+        _indices_verificados = True
+        logger.info("✅ Índices dash-finance verificados")
+
+    except Exception as e:
+        # Consultas continuam corretas sem os índices, apenas mais lentas
+        logger.warning(f"⚠️ Índices dash-finance não verificados: {str(e)}")
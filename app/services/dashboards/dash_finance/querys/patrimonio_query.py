@@ -1,46 +1,50 @@
 # app/services/dashboards/dash_finance/patrimonio_query.py
 
 import logging
-from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.indicadores.risco_diario_helper import get_historico_diario
+from .historico_diario_helper import buscar_historico_diario, serie, timestamps_iso, total_linhas
 
 logger = logging.getLogger(__name__)
 
+METRICAS_PATRIMONIO = ["net_asset_value", "btc_price", "saldo_btc_core"]
+
+# Último registro de cada dia nas amostras brutas (fallback do rollup diário);
+# filtro id > 16 aplicado depois da escolha do dia
+PATRIMONIO_QUERY = """
+    SELECT data, timestamp, net_asset_value, btc_price, saldo_btc_core
+    FROM (
+        SELECT DISTINCT ON (DATE(timestamp))
+            DATE(timestamp) as data,
+            id,
+            timestamp,
+            net_asset_value,
+            btc_price,
+            saldo_btc_core
+        FROM indicadores_risco
+        WHERE timestamp >= %s
+          AND net_asset_value IS NOT NULL
+        ORDER BY DATE(timestamp) DESC, timestamp DESC, id DESC
+    ) ultimos_do_dia
+    WHERE id > 16
+    ORDER BY timestamp DESC
+"""
+
 def get_patrimonio_data(data_inicio) -> list:
     """
     Query Patrimônio Líquido + BTC Price - último registro de cada dia
     """
     try:
-        query = """
-            SELECT 
-                DATE(timestamp) as data,
-                timestamp,
-                net_asset_value as valor,
-                btc_price,
-                saldo_btc_core
-            FROM indicadores_risco r1
-            WHERE timestamp >= %s
-              AND net_asset_value IS NOT NULL
-              AND id > 16
-              AND timestamp = (
-                SELECT MAX(timestamp) 
-                FROM indicadores_risco r2 
-                WHERE DATE(r1.timestamp) = DATE(r2.timestamp)
-                  AND net_asset_value IS NOT NULL
-              )
-            ORDER BY timestamp DESC;
-        """
+        colunas = buscar_historico_diario(
+            data_inicio, METRICAS_PATRIMONIO, PATRIMONIO_QUERY, buscar_rollup=_buscar_rollup
+        )
         
-        resultados = execute_query(query, params=(data_inicio,), fetch_all=True)
-        
-        if resultados:
+        if total_linhas(colunas):
             dados = [
-                {
-                    "timestamp": row["timestamp"].isoformat(),
-                    "valor": float(row["valor"]) if row["valor"] else 0.0,
-                    "btc_price": float(row["btc_price"]) if row["btc_price"] else 0.0,
-                    "saldo_btc_core": float(row["saldo_btc_core"]) if row["saldo_btc_core"] else 0.0
-                }
-                for row in resultados
+                {"timestamp": timestamp, "valor": valor, "btc_price": btc_price, "saldo_btc_core": saldo}
+                for timestamp, valor, btc_price, saldo in zip(
+                    timestamps_iso(colunas["timestamp"]), serie(colunas["net_asset_value"]),
+                    serie(colunas["btc_price"]), serie(colunas["saldo_btc_core"])
+                )
             ]
             logger.info(f"✅ Patrimônio: {len(dados)} registros obtidos")
             return dados
@@ -50,4 +54,10 @@ def get_patrimonio_data(data_inicio) -> list:
             
     except Exception as e:
         logger.error(f"❌ Erro query Patrimônio: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+def _buscar_rollup(data_inicio) -> dict:
+    """Rollup diário: colunas da última amostra do dia com net_asset_value, mesmo corte id > 16"""
+    colunas = get_historico_diario(data_inicio, METRICAS_PATRIMONIO, ancora="net_asset_value", colunar=True)
+    manter = [i for i, ultimo_id in enumerate(colunas["ultimo_id"]) if (ultimo_id or 0) > 16]
+    return {nome: [valores[i] for i in manter] for nome, valores in colunas.items()}
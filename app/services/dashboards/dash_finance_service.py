@@ -50,16 +50,16 @@ def obter_health_factor(periodo: str = "30d") -> dict:
         }
 
 def obter_alavancagem(periodo: str = "30d") -> dict:
-    """Retorna histórico alavancagens (MOCK)"""
+    """Retorna histórico alavancagens (REAL)"""
     try:
-        logger.info(f"🔍 Consultando Alavancagem - período: {periodo} [MOCK]")
+        logger.info(f"🔍 Consultando Alavancagem - período: {periodo}")
         
         if not _validar_periodo(periodo):
             periodo = "30d"
         
         dados = get_alavancagem_history(periodo)
         
-        logger.info(f"✅ Alavancagem: {len(dados)} registros mockados")
+        logger.info(f"✅ Alavancagem: {len(dados)} registros encontrados")
         
         return {
             "status": "success",
@@ -67,7 +67,7 @@ def obter_alavancagem(periodo: str = "30d") -> dict:
             "periodo": periodo,
             "dados": dados,
             "total_registros": len(dados),
-            "mock": True,
+            "mock": False,
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -117,16 +117,16 @@ def obter_patrimonio(periodo: str = "30d") -> dict:
         }
 
 def obter_capital_investido(periodo: str = "30d") -> dict:
-    """Retorna evolução capital investido (MOCK)"""
+    """Retorna evolução capital investido (REAL)"""
     try:
-        logger.info(f"🔍 Consultando Capital Investido - período: {periodo} [MOCK]")
+        logger.info(f"🔍 Consultando Capital Investido - período: {periodo}")
         
         if not _validar_periodo(periodo):
             periodo = "30d"
         
         dados = get_capital_history(periodo)
         
-        logger.info(f"✅ Capital Investido: {len(dados)} registros mockados")
+        logger.info(f"✅ Capital Investido: {len(dados)} registros encontrados")
         
         return {
             "status": "success",
@@ -134,7 +134,7 @@ def obter_capital_investido(periodo: str = "30d") -> dict:
             "periodo": periodo,
             "dados": dados, 
             "total_registros": len(dados),
-            "mock": True,
+            "mock": False,
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -7,7 +7,7 @@ from .setup_detector_utils import identificar_setup
 
 logger = logging.getLogger(__name__)
 
-def executar_analise(dados_mercado: Dict, dados_risco: Dict, dados_alavancagem: Dict) -> Dict[str, Any]:
+def executar_analise(dados_mercado: Dict, dados_risco: Dict, dados_alavancagem: Dict, snapshot=None) -> Dict[str, Any]:
     """
     CAMADA 4: Execução Tática - Controlador principal
     
@@ -20,6 +20,7 @@ def executar_analise(dados_mercado: Dict, dados_risco: Dict, dados_alavancagem:
         dados_mercado: Dados da análise de mercado
         dados_risco: Dados da análise de risco  
         dados_alavancagem: Dados da análise de alavancagem
+        snapshot: MarketSnapshot da requisição (uma busca por timeframe)
     
     Returns:
         Dict com dados técnicos e estratégia
@@ -39,7 +40,7 @@ def executar_analise(dados_mercado: Dict, dados_risco: Dict, dados_alavancagem:
         
         # 3. IDENTIFICAR SETUP
         logger.info("🔍 Identificando setup...")
-        setup_result = identificar_setup()
+        setup_result = identificar_setup(snapshot)
         
         # 4. PROCESSAR RESULTADO
         if setup_result.get('encontrado', False):
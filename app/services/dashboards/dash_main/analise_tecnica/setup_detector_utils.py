@@ -11,10 +11,13 @@ from .setups_compra.cruzamento_medias import detectar_cruzamento_medias
 
 logger = logging.getLogger(__name__)
 
-def identificar_setup() -> Dict[str, Any]:
+def identificar_setup(snapshot=None) -> Dict[str, Any]:
     """
     Orquestrador de setups - busca dados técnicos e testa por prioridade
     
+    Args:
+        snapshot: MarketSnapshot compartilhado da requisição (opcional)
+    
     Returns:
         Dict com setup identificado ou NENHUM
     """
@@ -22,7 +25,7 @@ def identificar_setup() -> Dict[str, Any]:
         logger.info("🔍 Iniciando identificação de setups...")
         
         # 1. BUSCAR DADOS TÉCNICOS CONSOLIDADOS
-        dados_tecnicos = get_todos_dados_tecnicos()
+        dados_tecnicos = get_todos_dados_tecnicos(snapshot)
         logger.info("📊 Dados técnicos obtidos com sucesso")
         
         # 2. MATRIZ DE SETUPS POR PRIORIDADE
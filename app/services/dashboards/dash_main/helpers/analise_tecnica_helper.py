@@ -6,33 +6,44 @@ from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
-def get_todos_dados_tecnicos() -> Dict[str, Any]:
+N_BARS_4H = 2000            # RSI14 e EMA144
+N_BARS_EMAS_CURTAS = 1000   # EMA17/EMA34
+
+def get_todos_dados_tecnicos(snapshot=None) -> Dict[str, Any]:
     """
     Busca TODOS dados técnicos necessários para setups
     
+    Args:
+        snapshot: MarketSnapshot da requisição (criado se ausente)
+    
     Returns:
         Dict com todos dados técnicos consolidados
     """
     try:
         logger.info("📊 Coletando dados técnicos consolidados...")
         
-        # IMPLEMENTANDO: RSI 4H real via TradingView
-        rsi_4h = _buscar_rsi_4h()
+        if snapshot is None:
+            from app.services.utils.helpers.tradingview.market_snapshot import MarketSnapshot
+            snapshot = MarketSnapshot()
+        
+        # RSI 4H real via TradingView (mesma série 4H para todos indicadores)
+        rsi_4h = _buscar_rsi_4h(snapshot)
         logger.info(f"📊 RSI 4H real: {rsi_4h}")
         
-        # IMPLEMENTANDO: EMAs para cruzamento real via TradingView  
-        emas_data = _buscar_emas_17_34_4h()
+        # EMAs para cruzamento real via TradingView  
+        emas_data = _buscar_emas_4h(snapshot)
+        distancias = _calcular_distancias(emas_data['preco_atual'], emas_data['ema_17_atual'], emas_data['ema_144_atual'])
         
         dados_consolidados = {
             "rsi_4h": rsi_4h,
             "precos": {
-                "atual": emas_data.get('preco_atual', 103500.0),
-                "ema_17": emas_data.get('ema_17_atual', 103200.0),
-                "ema_144": 103000.0  # TODO: buscar real
+                "atual": emas_data['preco_atual'],
+                "ema_17": emas_data['ema_17_atual'],
+                "ema_144": round(emas_data['ema_144_atual'], 2)
             },
             "distancias": {
-                "ema_144_distance": 0.48,  # TODO: calcular real
-                "ema_17_distance": 0.29    # TODO: calcular real
+                "ema_144_distance": round(distancias['ema_144_distance'], 2),
+                "ema_17_distance": round(distancias['ema_17_distance'], 2)
             },
             "emas_cruzamento": {
                 "ema_17_atual": emas_data.get('ema_17_atual'),
@@ -41,10 +52,10 @@ def get_todos_dados_tecnicos() -> Dict[str, Any]:
                 "ema_34_anterior": emas_data.get('ema_34_anterior')
             },
             "timestamp": datetime.utcnow().isoformat(),
-            "source": "tradingview_rsi4h_emas_real"
+            "source": "tradingview_snapshot_4h"
         }
         
-        logger.info(f"📊 RSI 4H: {rsi_4h}, Status: Real TradingView")
+        logger.info(f"📊 RSI 4H: {rsi_4h}, Status: Real TradingView ({snapshot.fetches} fetch)")
         
         return dados_consolidados
         
@@ -52,18 +63,12 @@ def get_todos_dados_tecnicos() -> Dict[str, Any]:
         logger.error(f"❌ Erro obter dados técnicos: {str(e)}")
         raise Exception(f"Falha buscar dados técnicos: {str(e)}")
 
-def _buscar_rsi_4h() -> float:
-    """Busca RSI 4H via TradingView"""
+def _buscar_rsi_4h(snapshot) -> float:
+    """RSI 4H a partir do snapshot (2000 barras, como get_rsi_current)"""
     try:
-        from app.services.utils.helpers.tradingview.tradingview_helper import get_rsi_current
         from tvDatafeed import Interval
         
-        rsi = get_rsi_current(
-            symbol="BTCUSDT",
-            exchange="BINANCE", 
-            timeframe=Interval.in_4_hour,
-            period=14
-        )
+        rsi = snapshot.rsi_atual(Interval.in_4_hour, period=14, n_bars=N_BARS_4H)
         
         if not (0 <= rsi <= 100):
             raise ValueError(f"RSI 4H inválido: {rsi}")
@@ -74,35 +79,27 @@ def _buscar_rsi_4h() -> float:
         logger.error(f"❌ Erro RSI 4H: {str(e)}")
         raise Exception(f"RSI 4H indisponível: {str(e)}")
 
-def _buscar_emas_17_34_4h() -> Dict[str, float]:
-    """Busca EMAs 17 e 34 timeframe 4H via TradingView"""
+def _buscar_emas_4h(snapshot) -> Dict[str, float]:
+    """EMAs 17, 34 e 144 timeframe 4H a partir do snapshot"""
     try:
-        from app.services.utils.helpers.tradingview.tradingview_helper import fetch_ohlc_data, calculate_ema
         from tvDatafeed import Interval
         
-        # Buscar dados 4H com barras suficientes para EMA34
-        df = fetch_ohlc_data(
-            symbol="BTCUSDT",
-            exchange="BINANCE", 
-            interval=Interval.in_4_hour,
-            n_bars=1000  # Suficiente para EMA34 + buffer
-        )
-        
-        # Calcular EMAs
-        ema_17 = calculate_ema(df['close'], period=17)
-        ema_34 = calculate_ema(df['close'], period=34)
+        # EMA17/34 na janela de 1000 barras, EMA144 na de 2000 (mesma série)
+        ema_17 = snapshot.ema(Interval.in_4_hour, 17, N_BARS_EMAS_CURTAS)
+        ema_34 = snapshot.ema(Interval.in_4_hour, 34, N_BARS_EMAS_CURTAS)
+        ema_144_atual = snapshot.ema_atual(Interval.in_4_hour, 144, N_BARS_4H)
         
         # Valores atuais (última barra)
         ema_17_atual = float(ema_17.iloc[-1])
         ema_34_atual = float(ema_34.iloc[-1])
-        preco_atual = float(df['close'].iloc[-1])
+        preco_atual = snapshot.preco_atual(Interval.in_4_hour, N_BARS_EMAS_CURTAS)
         
         # Valores anteriores (penúltima barra) para detectar cruzamento
         ema_17_anterior = float(ema_17.iloc[-2])
         ema_34_anterior = float(ema_34.iloc[-2])
         
         # Validações
-        if any(v <= 0 for v in [ema_17_atual, ema_34_atual, ema_17_anterior, ema_34_anterior]):
+        if any(v <= 0 for v in [ema_17_atual, ema_34_atual, ema_17_anterior, ema_34_anterior, ema_144_atual]):
             raise ValueError("EMAs com valores inválidos")
         
         return {
@@ -110,6 +107,7 @@ def _buscar_emas_17_34_4h() -> Dict[str, float]:
             "ema_34_atual": ema_34_atual,
             "ema_17_anterior": ema_17_anterior,
             "ema_34_anterior": ema_34_anterior,
+            "ema_144_atual": ema_144_atual,
             "preco_atual": preco_atual
         }
         
@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime
 from typing import Dict
+from app.services.utils.helpers.json_response_helper import JsonBruto, dumps, montar_objeto
 
 logger = logging.getLogger(__name__)
 
-def build_dashboard_data(dados_mercado: dict, dados_risco: dict, dados_alavancagem: dict, dados_tatica: dict) -> dict:
+def build_dashboard_data(dados_mercado: dict, dados_risco: dict, dados_alavancagem: dict, dados_tatica: dict, snapshot=None) -> dict:
     """
     Constrói dados formato compatível com JSON esperado
     
@@ -13,6 +14,7 @@ def build_dashboard_data(dados_mercado: dict, dados_risco: dict, dados_alavancag
         dados_risco: Dados reais Camada 2  
         dados_alavancagem: Dados reais Camada 3
         dados_tatica: Dados reais Camada 4 (tecnicos + estrategia)
+        snapshot: MarketSnapshot da requisição (evita nova busca do preço)
     """
     try:
         logger.info("🔧 Construindo dados Dashboard V1.5...")
@@ -34,7 +36,7 @@ def build_dashboard_data(dados_mercado: dict, dados_risco: dict, dados_alavancag
         estrategia = dados_tatica["estrategia"]
         
         # Extrair dados reais das 4 camadas
-        btc_price = _extract_btc_price(dados_mercado, dados_risco)
+        btc_price = _extract_btc_price(dados_mercado, dados_risco, snapshot)
         position_usd = _extract_position_value(dados_alavancagem)
         
         # Campos para PostgreSQL
@@ -95,7 +97,7 @@ def build_dashboard_data(dados_mercado: dict, dados_risco: dict, dados_alavancag
         logger.error(f"❌ Erro construir dados V1.5: {str(e)}")
         raise Exception(f"Falha construir dados: {str(e)}")
 
-def _extract_btc_price(dados_mercado: dict, dados_risco: dict) -> float:
+def _extract_btc_price(dados_mercado: dict, dados_risco: dict, snapshot=None) -> float:
     """Extrai preço BTC dos dados disponíveis"""
     try:
         if "btc_price" in dados_mercado:
@@ -103,11 +105,13 @@ def _extract_btc_price(dados_mercado: dict, dados_risco: dict) -> float:
         elif "btc_price" in dados_risco:
             return float(dados_risco["btc_price"])
         else:
-            from app.services.utils.helpers.tradingview.tradingview_helper import fetch_ohlc_data
             from tvDatafeed import Interval
             
-            df = fetch_ohlc_data("BTCUSDT", "BINANCE", Interval.in_4_hour, 1)
-            return float(df['close'].iloc[-1])
+            if snapshot is None:
+                from app.services.utils.helpers.tradingview.market_snapshot import MarketSnapshot
+                snapshot = MarketSnapshot()
+            
+            return snapshot.preco_atual(Interval.in_4_hour, 1)
             
     except Exception as e:
         logger.error(f"❌ Erro extrair BTC price: {str(e)}")
@@ -128,37 +132,31 @@ def _extract_position_value(dados_alavancagem: dict) -> float:
         logger.error(f"❌ Erro extrair position: {str(e)}")
         return 0.0
 
-def build_response_format(dados_db: dict) -> dict:
-    """Constrói resposta formato API a partir dos dados do banco"""
-    try:
-        dashboard_json = dados_db.get("dashboard_json")
-        
-        if isinstance(dashboard_json, str):
-            import json
-            dashboard_json = json.loads(dashboard_json)
-        
-        if not dashboard_json:
-            logger.warning("⚠️ JSON vazio - construindo a partir dos campos")
-            dashboard_json = _build_from_fields(dados_db)
-        
-        return {
-            "status": "success",
-            "data": dashboard_json,
-            "metadata": {
-                "id": dados_db.get("id", 0),
-                "timestamp": dados_db["created_at"].isoformat() if dados_db.get("created_at") else datetime.utcnow().isoformat(),
-                "age_minutes": _calculate_age_minutes(dados_db.get("created_at")) if dados_db.get("created_at") else 0,
-                "versao": "v1.5_4_camadas"
-            }
-        }
-        
-    except Exception as e:
-        logger.error(f"❌ Erro build response: {str(e)}")
-        return {
-            "status": "error",
-            "erro": str(e),
-            "versao": "v1.5"
+def build_data_json(dados_db: dict) -> bytes:
+    """
+    Bloco "data" da resposta: texto do dashboard_json como está no banco
+    (sem json.loads / re-encode); JSON vazio é reconstruído a partir dos campos
+    """
+    dashboard_json = dados_db.get("dashboard_json")
+    if dashboard_json and dashboard_json.strip() not in ("{}", "null"):
+        return dashboard_json.encode("utf-8")
+
+    logger.warning("⚠️ JSON vazio - construindo a partir dos campos")
+    return dumps(_build_from_fields(dados_db))
+
+def build_response_format(ref: dict, data_json: bytes) -> bytes:
+    """Constrói resposta formato API: data (bytes prontos) + metadata da requisição"""
+    created_at = ref.get("created_at")
+    return montar_objeto({
+        "status": "success",
+        "data": JsonBruto(data_json),
+        "metadata": {
+            "id": ref.get("id", 0),
+            "timestamp": created_at.isoformat() if created_at else datetime.utcnow().isoformat(),
+            "age_minutes": _calculate_age_minutes(created_at) if created_at else 0,
+            "versao": "v1.5_4_camadas"
         }
+    })
 
 def _build_from_fields(dados_db: dict) -> dict:
     """Constrói JSON a partir dos campos do banco em caso de falha"""
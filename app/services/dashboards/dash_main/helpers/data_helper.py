@@ -5,6 +5,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,7 @@ def save_dashboard(dashboard_data: Dict) -> bool:
         )
         
         execute_query(query, valores)
+        invalidar_tabela("dash_main")
         logger.info("✅ Dashboard salvo com sucesso")
         return True
         
@@ -54,32 +56,38 @@ def save_dashboard(dashboard_data: Dict) -> bool:
         logger.error(f"❌ Erro salvando Dashboard: {str(e)}")
         return False
 
-def get_latest_dashboard() -> Optional[Dict]:
+# JSONB como texto; valores antigos gravados como string JSON são desembrulhados
+JSON_TEXTO_SQL = "CASE WHEN jsonb_typeof({coluna}::jsonb) = 'string' THEN {coluna}::jsonb #>> '{{}}' ELSE {coluna}::text END"
+
+@cache_ultimo_registro("dash_main")
+def get_latest_dashboard_ref() -> Optional[Dict]:
     """
-    Busca último dashboard
+    Id e data do último dashboard (chave do cache de renderização)
     """
     try:
-        logger.info("🔍 Buscando último Dashboard...")
-        
-        query = """
-            SELECT * FROM dash_main 
-            ORDER BY created_at DESC 
-            LIMIT 1
-        """
-        
-        result = execute_query(query, fetch_one=True)
-        
-        if result:
-            logger.info(f"✅ Dashboard encontrado: ID {result['id']}")
-            return result
-        else:
-            logger.warning("⚠️ Nenhum Dashboard encontrado")
-            return None
-            
+        return execute_query(
+            "SELECT id, created_at FROM dash_main ORDER BY created_at DESC LIMIT 1",
+            fetch_one=True
+        )
     except Exception as e:
-        logger.error(f"❌ Erro buscar Dashboard: {str(e)}")
+        logger.error(f"❌ Erro buscar referência Dashboard: {str(e)}")
         return None
 
+def get_dashboard_texto(dashboard_id: int) -> Optional[Dict]:
+    """
+    Dashboard por id com dashboard_json como texto (sem parse do JSONB)
+    Inclui os campos usados quando o JSON está vazio
+    """
+    query = f"""
+        SELECT
+            id, btc_price, score_mercado, score_risco, ciclo_atual, setup,
+            decisao_final, health_factor, ema_distance, rsi_diario,
+            {JSON_TEXTO_SQL.format(coluna="dashboard_json")} AS dashboard_json
+        FROM dash_main
+        WHERE id = %s
+    """
+    return execute_query(query, params=(dashboard_id,), fetch_one=True)
+
 def _create_table_if_not_exists():
     """
     Cria tabela se não existir (mesma da V2)
@@ -3,11 +3,13 @@
 import logging
 from datetime import datetime
 from app.services.scores import riscos
-from .dash_main.helpers.data_helper import save_dashboard, get_latest_dashboard
-from .dash_main.helpers.data_builder import build_dashboard_data, build_response_format
+from .dash_main.helpers.data_helper import save_dashboard, get_latest_dashboard_ref, get_dashboard_texto
+from .dash_main.helpers.data_builder import build_dashboard_data, build_data_json, build_response_format
 from .dash_main.analise_alavancagem import executar_analise_alavancagem
 from .dash_main.analise_tecnica.analise_tecnica_service import executar_analise
 from  app.services.utils.helpers.postgres.mercado.database_helper import get_ciclo_mercado
+from app.services.utils.helpers.tradingview.market_snapshot import MarketSnapshot
+from app.services.utils.helpers.json_response_helper import renderizado
 
 
 
@@ -20,6 +22,9 @@ def processar_dash_main() -> dict:
     try:
         logger.info("🚀 Processando Dash-main - POST")
 
+        # Snapshot de mercado da requisição: uma busca TradingView por timeframe
+        snapshot = MarketSnapshot()
+
         # 2: CAMADA TÁTICA - Score consolidado do mercado (cilco, momentum e técnico)
         dados_mercado =  get_ciclo_mercado()
         logger.info(f"✅ Camada 2: Score {dados_mercado['score_mercado']} - {dados_mercado['classificacao_mercado']}")
@@ -36,7 +41,7 @@ def processar_dash_main() -> dict:
         # Ações Táticas
         logger.info("🎯 Executando Analise Tática...")
         
-        dados_tatica = executar_analise(dados_mercado, dados_risco, dados_alavancagem)
+        dados_tatica = executar_analise(dados_mercado, dados_risco, dados_alavancagem, snapshot)
         
         # DEBUG: Verificar estrutura retornada
         logger.info(f"🔍 DEBUG Camada 4 - Tipo: {type(dados_tatica)}")
@@ -63,7 +68,7 @@ def processar_dash_main() -> dict:
         # Construir dados formato compatível
         logger.info("🔧 Construindo dashboard data...")
         dashboard_data = build_dashboard_data(
-            dados_mercado, dados_risco, dados_alavancagem, dados_tatica
+            dados_mercado, dados_risco, dados_alavancagem, dados_tatica, snapshot
         )
         
         # Salvar no PostgreSQL
@@ -94,14 +99,17 @@ def processar_dash_main() -> dict:
             "message": "Falha processar Dash-main"
         }
 
-def obter_dash_main() -> dict:
-    """Dashboard - GET: Recupera último processado"""
+def obter_dash_main():
+    """
+    Dashboard - GET: Recupera último processado
+    Sucesso retorna o corpo JSON em bytes (data renderizado uma vez por id)
+    """
     try:
         logger.info("🔍 Obtendo Dash-main")
         
-        dados = get_latest_dashboard()
+        ref = get_latest_dashboard_ref()
         
-        if not dados:
+        if not ref:
             return {
                 "status": "error",
                 "versao": "1.5", 
@@ -110,9 +118,9 @@ def obter_dash_main() -> dict:
                 "message": "Execute POST primeiro para gerar dados"
             }
         
-        response = build_response_format(dados)
-        logger.info(f"✅ Dashboard obtido: ID {dados['id']}")
-        return response
+        data_json = renderizado("dash_main", ref["id"], lambda: build_data_json(get_dashboard_texto(ref["id"]) or {}))
+        logger.info(f"✅ Dashboard obtido: ID {ref['id']}")
+        return build_response_format(ref, data_json)
         
     except Exception as e:
         logger.error(f"❌ Erro obter Dashboard: {str(e)}")
@@ -147,7 +155,7 @@ def _executar_camada_risco() -> dict:
 def debug_dashboard() -> dict:
     """Debug status implementação"""
     try:
-        ultimo = get_latest_dashboard()
+        ultimo = get_latest_dashboard_ref()
         
         return {
             "status": "success",
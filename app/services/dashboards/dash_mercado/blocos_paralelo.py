@@ -0,0 +1,33 @@
+# app/services/dashboards/dash_mercado/blocos_paralelo.py
+
+import logging
+from typing import Callable, Dict, Tuple
+from app.config import get_settings
+from app.services.utils.helpers.executor_helper import executar_em_paralelo
+
+logger = logging.getLogger(__name__)
+
+def executar_blocos(funcoes: Dict[str, Callable[[], dict]], etapa: str = "blocos") -> Tuple[Dict[str, dict], Dict[str, str], Dict[str, float]]:
+    """
+    Executa os blocos (ciclo, momentum, tecnico) em threads simultâneas
+
+    Cada bloco faz suas leituras com conexões próprias do pool PostgreSQL;
+    a latência total passa a ser a do bloco mais lento. Falha ou timeout de
+    um bloco não interrompe os demais: vai para `falhas`.
+
+    Args:
+        funcoes: nome do bloco -> função sem argumentos
+        etapa: rótulo do relatório de tempos no log
+
+    Returns:
+        (resultados, falhas, tempos_ms) - tempos_ms inclui "total"
+    """
+    resultados, falhas, tempos_ms = executar_em_paralelo(
+        funcoes, get_settings().DASH_MERCADO_BLOCO_TIMEOUT_SECONDS, prefixo="dash_bloco"
+    )
+    for nome in [nome for nome, dados in resultados.items() if not dados]:
+        del resultados[nome]
+        falhas[nome] = "sem dados"
+
+    logger.info(f"⏱️ Dash mercado {etapa}: {tempos_ms}" + (f" - falhas: {list(falhas)}" if falhas else ""))
+    return resultados, falhas, tempos_ms
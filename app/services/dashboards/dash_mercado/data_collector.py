@@ -6,6 +6,7 @@ import logging
 from app.services.indicadores import ciclos as indicadores_ciclos
 from app.services.indicadores import momentum as indicadores_momentum  
 from app.services.indicadores import tecnico as indicadores_tecnico
+from .blocos_paralelo import executar_blocos
 
 logger = logging.getLogger(__name__)
 
@@ -14,30 +15,35 @@ def collect_all_blocks_data() -> dict:
     Coleta dados dos 3 blocos usando APIs existentes
     
     Returns:
-        dict: {"status": "success/error", "dados": {ciclo, momentum, tecnico}}
+        dict: {"status": "success/error", "dados": {ciclo, momentum, tecnico}, "tempos_ms": {...}}
     """
     try:
         logger.info("📥 Coletando dados dos indicadores...")
 
-        # Coletar dados de cada bloco
-        dados_ciclo = indicadores_ciclos.obter_indicadores()
-        dados_momentum = indicadores_momentum.obter_indicadores()
-        dados_tecnico = indicadores_tecnico.obter_indicadores()
+        # Coletar dados de cada bloco (em paralelo)
+        dados, falhas, tempos_ms = executar_blocos({
+            "ciclo": indicadores_ciclos.obter_indicadores,
+            "momentum": indicadores_momentum.obter_indicadores,
+            "tecnico": indicadores_tecnico.obter_indicadores
+        }, etapa="coleta")
         
         # Verificar se todos os dados foram coletados
-        if not dados_ciclo or not dados_momentum or not dados_tecnico:
+        if falhas:
             return {
                 "status": "error",
-                "erro": "Falha na coleta de um ou mais blocos de dados"
+                "erro": "Falha na coleta de um ou mais blocos de dados",
+                "falhas": falhas,
+                "tempos_ms": tempos_ms
             }
         
         return {
             "status": "success",
             "dados": {
-                "ciclo": dados_ciclo,
-                "momentum": dados_momentum, 
-                "tecnico": dados_tecnico
-            }
+                "ciclo": dados["ciclo"],
+                "momentum": dados["momentum"], 
+                "tecnico": dados["tecnico"]
+            },
+            "tempos_ms": tempos_ms
         }
         
     except Exception as e:
@@ -3,6 +3,7 @@
 import logging
 from datetime import datetime,timedelta
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,7 @@ def save_scores_to_db(dados_scores: dict) -> dict:
         resultado = execute_query(query, params, fetch_one=True)
         
         if resultado:
+            invalidar_tabela("dash_mercado")
             logger.info(f"✅ Scores + Gatilhos salvos - ID: {resultado['id']}")
             logger.info(f"📊 Pesos: {pesos_utilizados}")
             logger.info(f"🎯 Gatilho: {gatilhos_acionados}")
@@ -115,6 +117,38 @@ def _build_indicators_json(dados_scores: dict) -> str:
         logger.error(f"❌ Erro _build_indicators_json: {str(e)}")
         return "{}"
 
+@cache_ultimo_registro("dash_mercado")
+def get_latest_scores_ref() -> dict:
+    """
+    Id e campos escalares do último registro (chave do cache de renderização)
+    """
+    try:
+        return execute_query("""
+            SELECT id, timestamp, score_consolidado, classificacao_consolidada
+            FROM dash_mercado
+            WHERE indicadores_json IS NOT NULL
+            ORDER BY timestamp DESC
+            LIMIT 1
+        """, fetch_one=True)
+    except Exception as e:
+        logger.error(f"❌ Erro get_latest_scores_ref: {str(e)}")
+        return None
+
+def get_indicadores_json_texto(registro_id: int) -> str:
+    """
+    indicadores_json do registro como texto (sem parse do JSONB);
+    valores antigos gravados como string JSON são desembrulhados
+    """
+    resultado = execute_query("""
+        SELECT CASE WHEN jsonb_typeof(indicadores_json::jsonb) = 'string'
+                    THEN indicadores_json::jsonb #>> '{}'
+                    ELSE indicadores_json::text END AS indicadores_json
+        FROM dash_mercado
+        WHERE id = %s
+    """, params=(registro_id,), fetch_one=True)
+    return resultado["indicadores_json"] if resultado else None
+
+@cache_ultimo_registro("dash_mercado")
 def get_latest_scores_from_db() -> dict:
     """
     Obtém último registro com JSON já formatado + GATILHOS
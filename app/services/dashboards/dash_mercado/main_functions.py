@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from .database_helper import save_scores_to_db, get_latest_scores_from_db
+from .database_helper import save_scores_to_db
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +28,3 @@ def save_dashboard_scores(dados_scores: dict) -> dict:
             "status": "error",
             "erro": str(e)
         }
-
-def get_latest_dashboard_scores() -> dict:
-    
-    try:
-        return get_latest_scores_from_db()
-        
-    except Exception as e:
-        logger.error(f"❌ Erro get_latest_dashboard_scores: {str(e)}")
-        return None
\ No newline at end of file
@@ -5,6 +5,7 @@ import logging
 from app.services.scores.ciclos import calcular_score as calcular_score_ciclo
 from app.services.scores.momentum import calcular_score as calcular_score_momentum
 from app.services.scores.tecnico  import calcular_score as calcular_score_tecnico
+from .blocos_paralelo import executar_blocos
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +14,26 @@ def calculate_all_scores() -> dict:
     try:
         logger.info("🧮 Calculando scores dos 3 blocos...")
 
-        # Calcular scores individuais
-        resultado_ciclo = calcular_score_ciclo()
-        resultado_momentum =  calcular_score_momentum()
-        resultado_tecnico = calcular_score_tecnico()
+        # Calcular scores individuais (blocos em paralelo)
+        resultados, falhas, tempos_ms = executar_blocos({
+            "ciclo": calcular_score_ciclo,
+            "momentum": calcular_score_momentum,
+            "tecnico": calcular_score_tecnico
+        }, etapa="scores")
         
         # Verificar se todos os scores foram calculados
-        if not resultado_ciclo or not resultado_momentum or not resultado_tecnico:
+        if falhas:
             return {
                 "status": "error",
-                "erro": "Falha no cálculo de um ou mais scores"
+                "erro": "Falha no cálculo de um ou mais scores",
+                "falhas": falhas,
+                "tempos_ms": tempos_ms
             }
         
         # Consolidar todos os scores
-
-        logger.info("🧮 Calculando scores dos 3 blocos...")
+        resultado_ciclo = resultados["ciclo"]
+        resultado_momentum = resultados["momentum"]
+        resultado_tecnico = resultados["tecnico"]
 
         scores_consolidados = {
             "score_ciclo": resultado_ciclo["score_consolidado"] ,
@@ -41,7 +47,8 @@ def calculate_all_scores() -> dict:
         logger.info("✅ Todos os scores calculados")
         return {
             "status": "success",
-            "scores": scores_consolidados
+            "scores": scores_consolidados,
+            "tempos_ms": tempos_ms
         }
         
     except Exception as e:
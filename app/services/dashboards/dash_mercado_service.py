@@ -2,8 +2,11 @@
 
 import logging
 from datetime import datetime
-from .dash_mercado.main_functions import save_dashboard_scores, get_latest_dashboard_scores
+from .dash_mercado.main_functions import save_dashboard_scores
 from .dash_mercado.gatilhos_score import aplicar_gatilhos_score  # ← NOVO IMPORT
+from .dash_mercado.blocos_paralelo import executar_blocos
+from .dash_mercado.database_helper import get_latest_scores_ref, get_indicadores_json_texto
+from app.services.utils.helpers.json_response_helper import montar_objeto, renderizado
 from app.services.scores.ciclos import calcular_score as calcular_score_ciclo
 from app.services.scores.momentum import calcular_score as calcular_score_momentum
 from app.services.scores.tecnico  import calcular_score as calcular_score_tecnico
@@ -12,8 +15,17 @@ logger = logging.getLogger(__name__)
 
 def processar_dash_mercado() -> dict:
     try:
-        # 1 - Busca os scores calculados (todos os blocos)
-        scores = _get_scores_data()
+        # 1 - Busca os scores calculados (todos os blocos, em paralelo)
+        scores, falhas, tempos_ms = _get_scores_data()
+        if falhas:
+            # Score consolidado exige os 3 blocos: não grava resultado parcial
+            return {
+                "status": "error",
+                "erro": "Falha no cálculo de um ou mais blocos",
+                "falhas": falhas,
+                "tempos_ms": tempos_ms,
+                "timestamp": datetime.utcnow().isoformat()
+            }
        
         # 2. Calcula o score consolidado COM PESOS PADRÃO
         logger.info("🔄 Coletando e calculando scores...")
@@ -44,6 +56,7 @@ def processar_dash_mercado() -> dict:
                 "score_consolidado": dados_completos["score_consolidado"],
                 "classificacao": dados_completos["classificacao_consolidada"],
                 "gatilho": gatilho_info,  # ← NOVO: Info do gatilho aplicado
+                "tempos_ms": tempos_ms,
                 "blocos": {
                     "ciclo": {
                         "score": scores["ciclo"]["score_consolidado"],
@@ -75,38 +88,34 @@ def processar_dash_mercado() -> dict:
         }
 
 # Resto das funções mantém igual
-def _get_scores_data() -> dict:
-    # [Código existente sem alteração]
-    ciclo = calcular_score_ciclo()
-    tecnico = calcular_score_tecnico()
-    momentum = calcular_score_momentum()
-
-    return {
-        "ciclo": ciclo,
-        "momentum": momentum, 
-        "tecnico": tecnico
-    }
+def _get_scores_data() -> tuple:
+    """Scores dos 3 blocos em paralelo -> (scores, falhas, tempos_ms)"""
+    return executar_blocos({
+        "ciclo": calcular_score_ciclo,
+        "momentum": calcular_score_momentum,
+        "tecnico": calcular_score_tecnico
+    }, etapa="scores")
 
-def obter_dash_mercado() -> dict:
-    # [Código existente sem alteração]
+def obter_dash_mercado():
+    """
+    Último dash mercado - GET
+    Sucesso retorna o corpo JSON em bytes, renderizado uma vez por id:
+    campos do registro + chaves do indicadores_json (texto do banco, sem parse)
+    """
     try:
-        import json
-        
-        dash_mercado = get_latest_dashboard_scores()
+        dash_mercado = get_latest_scores_ref()
         
         if dash_mercado:
-            indicadores_json = dash_mercado["indicadores_json"]
-            if isinstance(indicadores_json, str):
-                indicadores_json = json.loads(indicadores_json)
-            
-            return {
-                "status": "success",
-                "id": dash_mercado["id"],
-                "timestamp": dash_mercado["timestamp"].isoformat(),
-                "score_consolidado": float(dash_mercado["score_consolidado"]),
-                "classificacao": dash_mercado["classificacao_consolidada"],
-                **indicadores_json
-            }
+            return renderizado("dash_mercado", dash_mercado["id"], lambda: montar_objeto(
+                {
+                    "status": "success",
+                    "id": dash_mercado["id"],
+                    "timestamp": dash_mercado["timestamp"].isoformat(),
+                    "score_consolidado": float(dash_mercado["score_consolidado"]),
+                    "classificacao": dash_mercado["classificacao_consolidada"]
+                },
+                expandir=(get_indicadores_json_texto(dash_mercado["id"]) or "{}").encode("utf-8")
+            ))
         else:
             return {
                 "status": "error", 
@@ -6,6 +6,7 @@ from typing import Dict, Optional
 from app.services.tendencia.utils.data_helper import obter as obter_score_tendencia
 from app.services.scores.ciclos import calcular_score as calcular_score_ciclo
 from .utils  import  data_helper_matriz_v2 as data_helper
+from .utils.matriz_memoria import obter_matriz
 
 logger = logging.getLogger(__name__)
 
@@ -207,11 +208,16 @@ def debug_matriz_estrategica() -> Dict:
         logger.info("🔍 Debug da matriz estratégica...")
         
         validacao = data_helper.validar_matriz_completa()
+        matriz_memoria = obter_matriz()
         
         return {
             "status": "success",
             "timestamp": datetime.utcnow().isoformat(),
-            "matriz": validacao
+            "matriz": validacao,
+            "grade_memoria": {
+                **matriz_memoria.validacao,
+                "carregada_em": datetime.utcfromtimestamp(matriz_memoria.carregada_em).isoformat()
+            }
         }
         
     except Exception as e:
@@ -3,7 +3,8 @@
 import logging
 from datetime import datetime
 from typing import Dict, Optional
-from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.base import execute_query, execute_query_tuplas
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +114,7 @@ def inserir_decisao(dados: Dict) -> bool:
         )
         
         execute_query(query, params)
+        invalidar_tabela("decisao_estrategica")
         logger.info("✅ Decisão estratégica + JSONs auditoria inseridos com sucesso")
         return True
         
@@ -120,6 +122,7 @@ def inserir_decisao(dados: Dict) -> bool:
         logger.error(f"❌ Erro ao inserir decisão: {str(e)}")
         return False
 
+@cache_ultimo_registro("decisao_estrategica")
 def get_ultima_decisao() -> Optional[Dict]:
     """
     Busca última decisão estratégica
@@ -151,6 +154,7 @@ def get_ultima_decisao() -> Optional[Dict]:
         logger.error(f"❌ Erro ao buscar última decisão: {str(e)}")
         return None
 
+@cache_ultimo_registro("decisao_estrategica")
 def get_detalhe_estrategia() -> Optional[Dict]:
     """
     Busca os JSONs com detalhe da última estratégia
@@ -206,11 +210,12 @@ def get_historico_decisoes(limit: int = 10) -> list:
             LIMIT %s
         """
         
-        result = execute_query(query, params=(limit,), fetch_all=True)
+        # Tuplas do driver -> um único dict por linha (sem cópias intermediárias)
+        colunas, linhas = execute_query_tuplas(query, params=(limit,))
         
-        if result:
-            logger.info(f"✅ {len(result)} decisões históricas encontradas")
-            return [dict(row) for row in result]
+        if linhas:
+            logger.info(f"✅ {len(linhas)} decisões históricas encontradas")
+            return [dict(zip(colunas, linha)) for linha in linhas]
         else:
             logger.warning("⚠️ Nenhum histórico encontrado")
             return []
@@ -3,7 +3,10 @@
 import logging
 from datetime import datetime
 from typing import Dict, Optional
-from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.base import execute_query, execute_query_tuplas
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
+from app.config import get_settings
+from .matriz_memoria import CAMPOS, obter_matriz
 
 logger = logging.getLogger(__name__)
 
@@ -25,34 +28,21 @@ def obter_estrategia(score_tendencia: int, score_ciclo: int) -> Optional[Dict]:
         if not (0 <= score_tendencia <= 100) or not (0 <= score_ciclo <= 100):
             raise ValueError(f"Scores inválidos: tendência={score_tendencia}, ciclo={score_ciclo}")
         
-        query = """
-            SELECT 
-                id, tendencia, alavancagem, satelite_percent, acao, protecao,
-                score_tendencia_min, score_tendencia_max, fase_operacional,
-                score_onchain_min, score_onchain_max
-            FROM matriz_estrategica_v2 
-            WHERE %s BETWEEN score_tendencia_min AND score_tendencia_max
-              AND %s BETWEEN score_onchain_min AND score_onchain_max
-            ORDER BY id
-            LIMIT 1
-        """
-        
-        result = execute_query(query, params=(score_tendencia, score_ciclo), fetch_one=True)
+        if get_settings().MATRIZ_MEMORIA_ENABLED:
+            result = obter_matriz().buscar(int(score_tendencia), int(score_ciclo))
+        else:
+            query = f"""
+                SELECT {CAMPOS}
+                FROM matriz_estrategica_v2 
+                WHERE %s BETWEEN score_tendencia_min AND score_tendencia_max
+                  AND %s BETWEEN score_onchain_min AND score_onchain_max
+                ORDER BY id
+                LIMIT 1
+            """
+            result = execute_query(query, params=(score_tendencia, score_ciclo), fetch_one=True)
         
         if result:
-            # Mapear campos para manter compatibilidade
-            estrategia = {
-                "id": result["id"],
-                "fase_operacional": result["fase_operacional"], 
-                "alavancagem": result["alavancagem"],
-                "satelite": result["satelite_percent"] / 100.0,  # converter % para decimal
-                "acao": result["acao"],
-                "tendencia": _mapear_tendencia(result["tendencia"]),  
-                "score_tendencia_min": result["score_tendencia_min"],
-                "score_tendencia_max": result["score_tendencia_max"],
-                "score_ciclo_min": result["score_onchain_min"],
-                "score_ciclo_max": result["score_onchain_max"]
-            }
+            estrategia = _mapear_estrategia(result)
             
             logger.info(f"✅ Estratégia encontrada: {estrategia['fase_operacional']} - {estrategia['tendencia']}")
             return estrategia
@@ -64,6 +54,21 @@ def obter_estrategia(score_tendencia: int, score_ciclo: int) -> Optional[Dict]:
         logger.error(f"❌ Erro ao buscar estratégia: {str(e)}")
         return None
 
+def _mapear_estrategia(result: Dict) -> Dict:
+    """Linha da matriz v2 -> formato de estratégia (compatibilidade)"""
+    return {
+        "id": result["id"],
+        "fase_operacional": result["fase_operacional"], 
+        "alavancagem": result["alavancagem"],
+        "satelite": result["satelite_percent"] / 100.0,  # converter % para decimal
+        "acao": result["acao"],
+        "tendencia": _mapear_tendencia(result["tendencia"]),  
+        "score_tendencia_min": result["score_tendencia_min"],
+        "score_tendencia_max": result["score_tendencia_max"],
+        "score_ciclo_min": result["score_onchain_min"],
+        "score_ciclo_max": result["score_onchain_max"]
+    }
+
 def _mapear_tendencia(cenario: str) -> str:
     """
     Mapeia cenário para tendência para manter compatibilidade
@@ -133,6 +138,7 @@ def inserir_decisao(dados: Dict) -> bool:
         )
         
         execute_query(query, params)
+        invalidar_tabela("decisao_estrategica")
         logger.info("✅ Decisão estratégica + JSONs auditoria inseridos com sucesso")
         return True
         
@@ -140,6 +146,7 @@ def inserir_decisao(dados: Dict) -> bool:
         logger.error(f"❌ Erro ao inserir decisão: {str(e)}")
         return False
 
+@cache_ultimo_registro("decisao_estrategica")
 def get_ultima_decisao() -> Optional[Dict]:
     """
     Busca última decisão estratégica
@@ -171,6 +178,7 @@ def get_ultima_decisao() -> Optional[Dict]:
         logger.error(f"❌ Erro ao buscar última decisão: {str(e)}")
         return None
 
+@cache_ultimo_registro("decisao_estrategica")
 def get_detalhe_estrategia() -> Optional[Dict]:
     """
     Busca os JSONs com detalhe da última estratégia
@@ -226,11 +234,12 @@ def get_historico_decisoes(limit: int = 10) -> list:
             LIMIT %s
         """
         
-        result = execute_query(query, params=(limit,), fetch_all=True)
+        # Tuplas do driver -> um único dict por linha (sem cópias intermediárias)
+        colunas, linhas = execute_query_tuplas(query, params=(limit,))
         
-        if result:
-            logger.info(f"✅ {len(result)} decisões históricas encontradas")
-            return [dict(row) for row in result]
+        if linhas:
+            logger.info(f"✅ {len(linhas)} decisões históricas encontradas")
+            return [dict(zip(colunas, linha)) for linha in linhas]
         else:
             logger.warning("⚠️ Nenhum histórico encontrado")
             return []
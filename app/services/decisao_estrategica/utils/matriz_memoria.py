@@ -0,0 +1,134 @@
+# app/services/decisao_estrategica/utils/matriz_memoria.py
+
+"""
+Matriz estratégica v2 em memória - grade 101×101 (score_tendencia × score_ciclo)
+
+- Carregada uma vez por processo; cada célula guarda o índice da linha
+  da matriz (mesma regra da consulta: menor id vence), -1 = sem cenário.
+- Recarregada quando o conteúdo da tabela muda: a impressão digital (md5
+  das linhas) é conferida no máximo a cada MATRIZ_RECHECK_SECONDS.
+- Lacunas e sobreposições são apontadas na carga (validacao).
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import get_settings
+from app.services.utils.helpers.postgres.base import execute_query
+
+logger = logging.getLogger(__name__)
+
+TAMANHO = 101  # scores inteiros 0..100
+
+CAMPOS = """
+    id, tendencia, alavancagem, satelite_percent, acao, protecao,
+    score_tendencia_min, score_tendencia_max, fase_operacional,
+    score_onchain_min, score_onchain_max
+"""
+
+QUERY_IMPRESSAO = "SELECT md5(COALESCE(string_agg(m::text, '|' ORDER BY id), '')) AS impressao FROM matriz_estrategica_v2 m"
+
+class MatrizMemoria:
+    """Grade imutável: substituída inteira a cada recarga (leitura sem lock)"""
+
+    def __init__(self, linhas: List[Dict], impressao: str):
+        self.linhas = linhas
+        self.impressao = impressao
+        self.carregada_em = time.time()
+        self.grade = np.full((TAMANHO, TAMANHO), -1, dtype=np.int32)
+        self.validacao = self._construir()
+        # Listas aninhadas: indexação Python pura é mais rápida que np para 1 célula
+        self._grade_lista = self.grade.tolist()
+
+    def _construir(self) -> Dict:
+        cobertura = np.zeros((TAMANHO, TAMANHO), dtype=np.int32)
+        invalidas = []
+
+        # Ordem decrescente de id: a linha de menor id sobrescreve (ORDER BY id LIMIT 1)
+        for indice in sorted(range(len(self.linhas)), key=lambda i: self.linhas[i]["id"], reverse=True):
+            linha = self.linhas[indice]
+            t_min, t_max = linha["score_tendencia_min"], linha["score_tendencia_max"]
+            c_min, c_max = linha["score_onchain_min"], linha["score_onchain_max"]
+            if not (0 <= t_min <= t_max <= 100 and 0 <= c_min <= c_max <= 100):
+                invalidas.append(linha["id"])
+                t_min, t_max = max(t_min, 0), min(t_max, 100)
+                c_min, c_max = max(c_min, 0), min(c_max, 100)
+                if t_min > t_max or c_min > c_max:
+                    continue
+            self.grade[t_min:t_max + 1, c_min:c_max + 1] = indice
+            cobertura[t_min:t_max + 1, c_min:c_max + 1] += 1
+
+        lacunas = np.argwhere(cobertura == 0)
+        sobrepostas = np.argwhere(cobertura > 1)
+
+        return {
+            "valida": not (lacunas.size or sobrepostas.size or invalidas),
+            "cenarios": len(self.linhas),
+            "celulas_sem_cenario": int(lacunas.shape[0]),
+            "celulas_sobrepostas": int(sobrepostas.shape[0]),
+            "exemplos_sem_cenario": [tuple(int(v) for v in c) for c in lacunas[:5]],
+            "exemplos_sobrepostas": [tuple(int(v) for v in c) for c in sobrepostas[:5]],
+            "ids_ranges_invalidos": invalidas
+        }
+
+    def buscar(self, score_tendencia: int, score_ciclo: int) -> Optional[Dict]:
+        """Linha da matriz para os scores (None = célula sem cenário)"""
+        indice = self._grade_lista[score_tendencia][score_ciclo]
+        return self.linhas[indice] if indice >= 0 else None
+
+    def buscar_lote(self, scores_tendencia, scores_ciclo) -> np.ndarray:
+        """
+        Avaliação em lote (what-if): ids da matriz para arrays de scores
+        Retorna -1 onde não há cenário
+        """
+        indices = self.grade[np.asarray(scores_tendencia, dtype=np.intp), np.asarray(scores_ciclo, dtype=np.intp)]
+        ids = np.array([linha["id"] for linha in self.linhas] + [-1], dtype=np.int64)
+        return ids[indices]
+
+_matriz: Optional[MatrizMemoria] = None
+_conferida_em = 0.0
+_lock = threading.Lock()
+
+def obter_matriz() -> MatrizMemoria:
+    """Matriz atual; confere a impressão digital da tabela se o intervalo expirou"""
+    global _conferida_em
+    matriz = _matriz
+    if matriz is not None and time.monotonic() - _conferida_em < get_settings().MATRIZ_RECHECK_SECONDS:
+        return matriz
+
+    with _lock:
+        if _matriz is not None and time.monotonic() - _conferida_em < get_settings().MATRIZ_RECHECK_SECONDS:
+            return _matriz
+
+        impressao = execute_query(QUERY_IMPRESSAO, fetch_one=True)["impressao"]
+        if _matriz is None or _matriz.impressao != impressao:
+            _carregar(impressao)
+        _conferida_em = time.monotonic()
+        return _matriz
+
+def recarregar_matriz() -> Dict:
+    """Força nova carga da tabela (ex.: após editar a matriz)"""
+    global _conferida_em
+    with _lock:
+        impressao = execute_query(QUERY_IMPRESSAO, fetch_one=True)["impressao"]
+        _carregar(impressao)
+        _conferida_em = time.monotonic()
+        return _matriz.validacao
+
+def _carregar(impressao: str):
+    """Lê a tabela e troca a matriz em memória (lock já adquirido)"""
+    global _matriz
+    linhas = execute_query(f"SELECT {CAMPOS} FROM matriz_estrategica_v2 ORDER BY id", fetch_all=True) or []
+    nova = MatrizMemoria([dict(linha) for linha in linhas], impressao)
+
+    validacao = nova.validacao
+    if validacao["valida"]:
+        logger.info(f"✅ Matriz estratégica em memória: {validacao['cenarios']} cenários, grade {TAMANHO}x{TAMANHO} completa")
+    else:
+        logger.warning(
+            f"⚠️ Matriz estratégica em memória: {validacao['celulas_sem_cenario']} células sem cenário, "
+            f"{validacao['celulas_sobrepostas']} sobrepostas, ranges inválidos {validacao['ids_ranges_invalidos']}"
+        )
+    _matriz = nova
@@ -0,0 +1,271 @@
+# app/services/pipeline/pipeline_service.py
+
+"""
+Pipeline de atualização completa (substitui a sequência de chamadas HTTP do n8n)
+
+Grafo de dependências:
+
+    coleta_tecnico ──► dash_mercado ──┐
+    tendencia ───────► decisao_estrategica ──► dash_main ──► historico_colunar
+    coleta_riscos ────────────────────┘
+
+- Etapas sem dependência pendente rodam em paralelo.
+- Etapas com `tabelas_entrada` são puladas quando o conteúdo do último
+  registro dessas tabelas (impressão md5 sem id/timestamp) não mudou desde a
+  última execução bem-sucedida (forcar=True ignora). Timestamp não serve:
+  coleta_tecnico e tendencia regravam a cada execução, mesmo sem mudança.
+- Coletas, tendência e dash_main leem fontes externas/ao vivo (TradingView,
+  AAVE) e por isso sempre executam.
+- Falha de uma etapa bloqueia apenas as que dependem dela.
+- historico_colunar exporta o incremental para o store Parquet/Arrow
+  (só com ANALYTICS_STORE_ENABLED).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import get_settings
+from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.chaves import ordem_recente
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Etapa:
+    nome: str
+    executar: Callable[[bool], dict]  # recebe forcar_coleta
+    dependencias: Tuple[str, ...] = ()
+    tabelas_entrada: Tuple[str, ...] = ()
+    tabela_saida: Optional[str] = None
+
+def _coleta_riscos(forcar_coleta: bool) -> dict:
+    from app.services.coleta import riscos
+    return riscos.coletar(forcar_coleta)
+
+def _coleta_tecnico(forcar_coleta: bool) -> dict:
+    from app.services.coleta.tecnico_v3.tecnico import coletar
+    return coletar(forcar_coleta)
+
+def _tendencia(_: bool) -> dict:
+    from app.services.tendencia import tendecia_service
+    return tendecia_service.calcular_score()
+
+def _dash_mercado(_: bool) -> dict:
+    from app.services.dashboards.dash_mercado_service import processar_dash_mercado
+    return processar_dash_mercado()
+
+def _decisao_estrategica(_: bool) -> dict:
+    from app.services.decisao_estrategica.estrategia_service import processar_decisao_estrategica
+    return processar_decisao_estrategica()
+
+def _dash_main(_: bool) -> dict:
+    from app.services.dashboards.dash_main_service import processar_dash_main
+    return processar_dash_main()
+
+def _historico_colunar(_: bool) -> dict:
+    if not get_settings().ANALYTICS_STORE_ENABLED:
+        return {"status": "success", "mensagem": "ANALYTICS_STORE_ENABLED desativado"}
+    from app.services.utils.helpers.analytics.historico_store import exportar_incremental
+    return exportar_incremental()
+
+ETAPAS: List[Etapa] = [
+    Etapa("coleta_riscos", _coleta_riscos, tabela_saida="indicadores_risco"),
+    Etapa("coleta_tecnico", _coleta_tecnico, tabela_saida="indicadores_tecnico"),
+    Etapa("tendencia", _tendencia, tabela_saida="score_tendencia"),
+    Etapa(
+        "dash_mercado", _dash_mercado,
+        dependencias=("coleta_tecnico",),
+        tabelas_entrada=("indicadores_ciclo", "indicadores_momentum", "indicadores_tecnico"),
+        tabela_saida="dash_mercado"
+    ),
+    Etapa(
+        "decisao_estrategica", _decisao_estrategica,
+        dependencias=("tendencia",),
+        tabelas_entrada=("score_tendencia", "indicadores_ciclo"),
+        tabela_saida="decisao_estrategica"
+    ),
+    Etapa(
+        "dash_main", _dash_main,
+        dependencias=("coleta_riscos", "dash_mercado", "decisao_estrategica"),
+        tabela_saida="dash_main"
+    ),
+    Etapa("historico_colunar", _historico_colunar, dependencias=("dash_main",)),
+]
+
+# Colunas fora da impressão de conteúdo (mudam a cada gravação)
+COLUNAS_SEM_CONTEUDO = ("id", "timestamp", "created_at", "updated_at")
+
+# Impressão do último registro das tabelas de entrada na última execução bem-sucedida (por etapa)
+_ultimas_entradas: Dict[str, Dict[str, Optional[str]]] = {}
+_execucao_lock = threading.Lock()
+
+def executar_pipeline(forcar: bool = False, forcar_coleta: bool = False) -> dict:
+    """
+    Executa o pipeline completo respeitando as dependências
+
+    Args:
+        forcar: executa também etapas cujas entradas não mudaram
+        forcar_coleta: repassado às coletas (mesmo parâmetro de /coletar-indicadores)
+
+    Returns:
+        dict com status geral, status/tempo por etapa e tempo total
+    """
+    if not _execucao_lock.acquire(blocking=False):
+        return {
+            "status": "error",
+            "erro": "Pipeline já em execução",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    try:
+        logger.info("🚀 Pipeline: iniciando atualização completa...")
+        inicio = time.monotonic()
+        etapas = _validar_grafo(ETAPAS)
+        resultados: Dict[str, dict] = {}
+
+        executor = ThreadPoolExecutor(max_workers=get_settings().PIPELINE_WORKERS, thread_name_prefix="pipeline")
+        try:
+            pendentes = dict(etapas)
+            em_execucao = {}
+
+            while pendentes or em_execucao:
+                for nome, etapa in list(pendentes.items()):
+                    status_deps = [resultados[d]["status"] for d in etapa.dependencias if d in resultados]
+                    if len(status_deps) < len(etapa.dependencias):
+                        continue
+
+                    del pendentes[nome]
+                    if any(s in ("error", "bloqueado") for s in status_deps):
+                        resultados[nome] = {"status": "bloqueado", "tempo_ms": 0.0}
+                        logger.warning(f"⛔ Pipeline {nome}: bloqueado por dependência com falha")
+                        continue
+
+                    em_execucao[executor.submit(_executar_etapa, etapa, forcar, forcar_coleta, inicio)] = nome
+
+                if not em_execucao:
+                    continue
+
+                concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for future in concluidos:
+                    resultados[em_execucao.pop(future)] = future.result()
+        finally:
+            executor.shutdown(wait=True)
+
+        total_ms = round((time.monotonic() - inicio) * 1000, 1)
+        falhas = [nome for nome, r in resultados.items() if r["status"] in ("error", "bloqueado")]
+        logger.info(
+            f"⏱️ Pipeline: {total_ms}ms - "
+            + ", ".join(f"{nome}={r['status']}({r['tempo_ms']}ms)" for nome, r in resultados.items())
+        )
+
+        return {
+            "status": "error" if falhas else "success",
+            "timestamp": datetime.utcnow().isoformat(),
+            "tempo_total_ms": total_ms,
+            "falhas": falhas,
+            "etapas": {nome: resultados[nome] for nome in etapas}
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Erro pipeline: {str(e)}")
+        return {
+            "status": "error",
+            "erro": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    finally:
+        _execucao_lock.release()
+
+def _executar_etapa(etapa: Etapa, forcar: bool, forcar_coleta: bool, inicio_pipeline: float) -> dict:
+    """Executa uma etapa (ou pula se entradas inalteradas) e mede o tempo"""
+    t0 = time.monotonic()
+    inicio_ms = round((t0 - inicio_pipeline) * 1000, 1)
+
+    try:
+        entradas = _marcas_entrada(etapa.tabelas_entrada) if etapa.tabelas_entrada else None
+        if entradas is not None and not forcar and _ultimas_entradas.get(etapa.nome) == entradas:
+            logger.info(f"⏭️ Pipeline {etapa.nome}: entradas inalteradas, pulando")
+            return {"status": "pulado", "inicio_ms": inicio_ms, "tempo_ms": round((time.monotonic() - t0) * 1000, 1)}
+
+        logger.info(f"▶️ Pipeline {etapa.nome}: executando...")
+        resposta = etapa.executar(forcar_coleta) or {}
+        sucesso = resposta.get("status") in ("success", "sucesso")
+
+        if sucesso and entradas is not None:
+            _ultimas_entradas[etapa.nome] = entradas
+
+        resultado = {
+            "status": "success" if sucesso else "error",
+            "inicio_ms": inicio_ms,
+            "tempo_ms": round((time.monotonic() - t0) * 1000, 1)
+        }
+        if not sucesso:
+            resultado["erro"] = resposta.get("erro") or resposta.get("detalhes") or resposta.get("error")
+        return resultado
+
+    except Exception as e:
+        logger.error(f"❌ Pipeline {etapa.nome}: {str(e)}")
+        return {
+            "status": "error",
+            "erro": str(e),
+            "inicio_ms": inicio_ms,
+            "tempo_ms": round((time.monotonic() - t0) * 1000, 1)
+        }
+
+def _marcas_entrada(tabelas: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """md5 do conteúdo do último registro de cada tabela de entrada (uma consulta)"""
+    ignoradas = "ARRAY[" + ", ".join(f"'{coluna}'" for coluna in COLUNAS_SEM_CONTEUDO) + "]"
+    campos = ", ".join(
+        f"(SELECT md5((to_jsonb(t) - {ignoradas})::text) FROM {tabela} t "
+        f"ORDER BY {ordem_recente(tabela, 't')} LIMIT 1) AS {tabela}"
+        for tabela in tabelas
+    )
+    linha = execute_query(f"SELECT {campos}", fetch_one=True) or {}
+    return {tabela: linha.get(tabela) for tabela in tabelas}
+
+def _validar_grafo(etapas: List[Etapa]) -> Dict[str, Etapa]:
+    """Indexa etapas por nome; falha em dependência desconhecida ou ciclo"""
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    for etapa in etapas:
+        desconhecidas = set(etapa.dependencias) - set(por_nome)
+        if desconhecidas:
+            raise ValueError(f"Etapa {etapa.nome}: dependências desconhecidas {desconhecidas}")
+
+    visitados, em_visita = set(), set()
+
+    def _visitar(nome: str):
+        if nome in em_visita:
+            raise ValueError(f"Ciclo no pipeline envolvendo {nome}")
+        if nome in visitados:
+            return
+        em_visita.add(nome)
+        for dep in por_nome[nome].dependencias:
+            _visitar(dep)
+        em_visita.discard(nome)
+        visitados.add(nome)
+
+    for nome in por_nome:
+        _visitar(nome)
+    return por_nome
+
+def obter_grafo() -> dict:
+    """Descrição do grafo e das últimas entradas processadas (GET /pipeline)"""
+    return {
+        "status": "success",
+        "etapas": [
+            {
+                "nome": etapa.nome,
+                "dependencias": list(etapa.dependencias),
+                "tabelas_entrada": list(etapa.tabelas_entrada),
+                "tabela_saida": etapa.tabela_saida,
+                "ultimas_entradas": _ultimas_entradas.get(etapa.nome)
+            }
+            for etapa in ETAPAS
+        ],
+        "em_execucao": _execucao_lock.locked()
+    }
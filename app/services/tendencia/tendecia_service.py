@@ -8,16 +8,19 @@ from .utils import data_helper
 
 logger = logging.getLogger(__name__)
 
-def calcular_score():
+def calcular_score(incluir_formacao: bool = False):
     
     try:
-        """Coleta dados técnicos EMAs via TradingView e calcula score """
+        """
+        Coleta dados técnicos EMAs via TradingView e calcula score
+        EMAs semanais memorizadas até o próximo fechamento (incluir_formacao=True: intrabar)
+        """
 
         logger.info("🚀 Iniciando coleta tendencias...")
         
         # 1. Buscar EMAs do TradingView (mesmo helper atual)
         logger.info("📊 Buscando EMAs TradingView...")
-        analysis = get_complete_ema_analysis()
+        analysis = get_complete_ema_analysis(timeframes=("1W",), incluir_formacao=incluir_formacao)
         
         if analysis.get("status") != "success":
             raise Exception(f"TradingView falhou: {analysis.get('error')}")
@@ -5,6 +5,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ def inserir(dados: Dict) -> bool:
         )
         
         execute_query(query, params)
+        invalidar_tabela("score_tendencia")
         logger.info("✅ Emas tendencia inseridos com sucesso")
         return True
         
@@ -36,6 +38,7 @@ def inserir(dados: Dict) -> bool:
         logger.error(f"❌ Erro ao inserir emas tendencia: {str(e)}")
         return False
 
+@cache_ultimo_registro("score_tendencia")
 def obter() -> Optional[Dict]:
     """Busca dados score tendencia mais recentes"""
     try:
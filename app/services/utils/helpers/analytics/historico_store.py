@@ -0,0 +1,376 @@
+# app/services/utils/helpers/analytics/historico_store.py
+
+"""
+Store analítico colunar (Parquet / Arrow IPC) do histórico do PostgreSQL
+
+Layout em ANALYTICS_STORE_DIR (particionamento hive):
+
+    <tabela>/ano=2025/mes=06/part-<seq>.parquet
+    ohlc_bars/symbol=BTCUSDT/intervalo=1D/ano=2025/part-<seq>.parquet
+    _watermarks.json   (último timestamp/id exportado por tabela)
+
+- Exportação incremental: lê do banco só as linhas após o watermark, em
+  lotes (keyset por timestamp, id) e grava um arquivo por partição.
+  Barras OHLC só são exportadas depois de fechadas.
+- Leitura: arquivos .parquet com memory_map; .arrow (IPC) mapeados sem cópia.
+  ler_arrays devolve colunas NumPy (zero-copy quando sem nulos).
+
+    python -m app.services.utils.helpers.analytics.historico_store --exportar
+    python -m app.services.utils.helpers.analytics.historico_store --exportar --tabela dash_mercado
+    python -m app.services.utils.helpers.analytics.historico_store --compactar
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from app.config import get_settings
+from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.chaves import CHAVES
+
+logger = logging.getLogger(__name__)
+
+# tabela -> coluna de tempo e colunas que identificam a linha (chaves compartilhadas com o pipeline)
+TABELAS = {tabela: dict(chave) for tabela, chave in CHAVES.items()}
+TABELAS["ohlc_bars"]["particao"] = ("symbol", "intervalo")
+
+_lock = threading.Lock()
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+        import pyarrow.compute
+        return pyarrow
+    except ImportError as e:
+        raise ImportError(f"Store analítico requer pyarrow (requirements.txt): {str(e)}")
+
+def _diretorio() -> str:
+    return get_settings().ANALYTICS_STORE_DIR
+
+def _extensao() -> str:
+    return ".arrow" if get_settings().ANALYTICS_STORE_FORMAT == "arrow" else ".parquet"
+
+# ==========================================
+# WATERMARKS
+# ==========================================
+
+def _caminho_watermarks() -> str:
+    return os.path.join(_diretorio(), "_watermarks.json")
+
+def _ler_watermarks() -> Dict[str, Dict]:
+    try:
+        with open(_caminho_watermarks()) as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return {}
+
+def _gravar_watermarks(watermarks: Dict[str, Dict]):
+    """Grava atomicamente (arquivo temporário + rename)"""
+    os.makedirs(_diretorio(), exist_ok=True)
+    temporario = _caminho_watermarks() + ".tmp"
+    with open(temporario, "w") as arquivo:
+        json.dump(watermarks, arquivo, indent=2)
+    os.replace(temporario, _caminho_watermarks())
+
+# ==========================================
+# EXPORTAÇÃO
+# ==========================================
+
+def exportar_incremental(tabelas: Optional[List[str]] = None) -> Dict:
+    """
+    Exporta as linhas novas de cada tabela desde o último watermark
+
+    Returns:
+        dict com linhas e arquivos gravados por tabela
+    """
+    _pyarrow()
+    with _lock:
+        inicio = time.monotonic()
+        watermarks = _ler_watermarks()
+        resumo = {}
+
+        for tabela in tabelas or list(TABELAS):
+            try:
+                if tabela == "ohlc_bars":
+                    resumo[tabela] = _exportar_barras(watermarks)
+                else:
+                    resumo[tabela] = _exportar_tabela(tabela, watermarks)
+            except Exception as e:
+                logger.error(f"❌ Export {tabela}: {str(e)}")
+                resumo[tabela] = {"status": "error", "erro": str(e)}
+            _gravar_watermarks(watermarks)
+
+        tempo_ms = round((time.monotonic() - inicio) * 1000, 1)
+        total = sum(r.get("linhas", 0) for r in resumo.values())
+        logger.info(f"✅ Store analítico: {total} linhas exportadas em {tempo_ms}ms")
+
+        falhas = [t for t, r in resumo.items() if r.get("status") == "error"]
+        return {
+            "status": "error" if falhas else "success",
+            "diretorio": _diretorio(),
+            "tabelas": resumo,
+            "tempo_ms": tempo_ms
+        }
+
+def _exportar_tabela(tabela: str, watermarks: Dict[str, Dict]) -> Dict:
+    """Keyset por (tempo, id) a partir do watermark, lote a lote"""
+    config = TABELAS[tabela]
+    tempo, coluna_id = config["tempo"], config["id"]
+    lote = get_settings().ANALYTICS_EXPORT_BATCH
+    marca = watermarks.get(tabela, {})
+    linhas_total, arquivos = 0, 0
+
+    while True:
+        if coluna_id:
+            chave = f"({tempo}, {coluna_id})"
+            filtro = f"WHERE {chave} > (%s, %s)" if marca else ""
+            params = (marca["tempo"], marca["id"]) if marca else ()
+            ordem = f"{tempo}, {coluna_id}"
+        else:
+            filtro = f"WHERE {tempo} > %s" if marca else ""
+            params = (marca["tempo"],) if marca else ()
+            ordem = tempo
+
+        linhas = execute_query(
+            f"SELECT * FROM {tabela} {filtro} ORDER BY {ordem} LIMIT %s",
+            params + (lote,), fetch_all=True
+        ) or []
+        if not linhas:
+            break
+
+        arquivos += _gravar_particoes(tabela, linhas, tempo, ("ano", "mes"))
+        linhas_total += len(linhas)
+
+        ultima = linhas[-1]
+        marca = {"tempo": ultima[tempo].isoformat(), "id": ultima[coluna_id] if coluna_id else None}
+        watermarks[tabela] = marca
+        if len(linhas) < lote:
+            break
+
+    if linhas_total:
+        logger.info(f"💾 Store analítico {tabela}: {linhas_total} linhas, {arquivos} arquivos")
+    return {"status": "success", "linhas": linhas_total, "arquivos": arquivos, "watermark": marca or None}
+
+def _exportar_barras(watermarks: Dict[str, Dict]) -> Dict:
+    """Barras fechadas por (symbol, exchange, intervalo), a partir do último datetime exportado"""
+    from app.services.utils.helpers.tradingview.bar_store import INTERVALO_SEGUNDOS
+
+    series = execute_query("SELECT DISTINCT symbol, exchange, intervalo FROM ohlc_bars", fetch_all=True) or []
+    lote = get_settings().ANALYTICS_EXPORT_BATCH
+    linhas_total, arquivos = 0, 0
+
+    for serie in series:
+        chave = f"ohlc_bars:{serie['exchange']}:{serie['symbol']}:{serie['intervalo']}"
+        segundos = INTERVALO_SEGUNDOS.get(serie["intervalo"])
+        if segundos is None:
+            continue
+        # Mesmo relógio local (sem timezone) do índice do tvDatafeed
+        fechadas_ate = datetime.now() - timedelta(seconds=segundos)
+
+        while True:
+            marca = watermarks.get(chave)
+            linhas = execute_query(f"""
+                SELECT * FROM ohlc_bars
+                WHERE symbol = %s AND exchange = %s AND intervalo = %s
+                  AND datetime <= %s {"AND datetime > %s" if marca else ""}
+                ORDER BY datetime
+                LIMIT %s
+            """, (serie["symbol"], serie["exchange"], serie["intervalo"], fechadas_ate,
+                  *((marca["tempo"],) if marca else ()), lote), fetch_all=True) or []
+            if not linhas:
+                break
+
+            arquivos += _gravar_particoes("ohlc_bars", linhas, "datetime", ("symbol", "intervalo", "ano"))
+            linhas_total += len(linhas)
+            watermarks[chave] = {"tempo": linhas[-1]["datetime"].isoformat(), "id": None}
+            if len(linhas) < lote:
+                break
+
+    if linhas_total:
+        logger.info(f"💾 Store analítico ohlc_bars: {linhas_total} barras, {arquivos} arquivos")
+    return {"status": "success", "linhas": linhas_total, "arquivos": arquivos}
+
+def _normalizar(valor):
+    """Decimal -> float, JSONB (dict/list) -> texto JSON"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, default=str, ensure_ascii=False)
+    return valor
+
+def _gravar_particoes(tabela: str, linhas: List[Dict], tempo: str, particao: tuple) -> int:
+    """Agrupa as linhas pela partição e grava um arquivo novo em cada uma"""
+    pa = _pyarrow()
+    grupos: Dict[tuple, List[Dict]] = {}
+    for linha in linhas:
+        valores = {"ano": f"{linha[tempo].year}", "mes": f"{linha[tempo].month:02d}"}
+        chave = tuple((campo, valores.get(campo, linha.get(campo))) for campo in particao)
+        grupos.setdefault(chave, []).append(linha)
+
+    sequencia = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+    for chave, grupo in grupos.items():
+        pasta = os.path.join(_diretorio(), tabela, *(f"{campo}={valor}" for campo, valor in chave))
+        os.makedirs(pasta, exist_ok=True)
+
+        colunas = {nome: [_normalizar(linha[nome]) for linha in grupo] for nome in grupo[0]}
+        _escrever(pa.table(colunas), os.path.join(pasta, f"part-{sequencia}{_extensao()}"))
+
+    return len(grupos)
+
+def _escrever(tabela_arrow, caminho: str):
+    pa = _pyarrow()
+    temporario = caminho + ".tmp"
+    if caminho.endswith(".arrow"):
+        with pa.OSFile(temporario, "wb") as sink, pa.ipc.new_file(sink, tabela_arrow.schema) as writer:
+            writer.write_table(tabela_arrow)
+    else:
+        pa.parquet.write_table(tabela_arrow, temporario, compression="zstd")
+    os.replace(temporario, caminho)
+
+def compactar(tabelas: Optional[List[str]] = None, minimo_arquivos: int = 8) -> Dict:
+    """Junta os arquivos de cada partição com muitos arquivos pequenos num só"""
+    pa = _pyarrow()
+    resumo = {}
+    with _lock:
+        for tabela in tabelas or list(TABELAS):
+            compactadas = 0
+            for pasta in {os.path.dirname(f) for f in _arquivos(tabela)}:
+                arquivos = sorted(glob.glob(os.path.join(pasta, "part-*")))
+                arquivos = [f for f in arquivos if not f.endswith(".tmp")]
+                if len(arquivos) < minimo_arquivos:
+                    continue
+                unida = pa.concat_tables([_ler_arquivo(f) for f in arquivos], promote_options="default")
+                _escrever(unida, os.path.join(pasta, f"part-{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}{_extensao()}"))
+                for arquivo in arquivos:
+                    os.remove(arquivo)
+                compactadas += 1
+            resumo[tabela] = compactadas
+    logger.info(f"🗜️ Store analítico compactado: {resumo}")
+    return {"status": "success", "particoes_compactadas": resumo}
+
+# ==========================================
+# LEITURA
+# ==========================================
+
+def _arquivos(tabela: str, filtros_particao: Optional[Dict[str, str]] = None) -> List[str]:
+    """Arquivos da tabela, podando partições por igualdade (ex.: {"symbol": "BTCUSDT"})"""
+    arquivos = []
+    for caminho in glob.glob(os.path.join(_diretorio(), tabela, "**", "part-*"), recursive=True):
+        if caminho.endswith(".tmp"):
+            continue
+        if filtros_particao:
+            partes = dict(p.split("=", 1) for p in os.path.relpath(os.path.dirname(caminho), os.path.join(_diretorio(), tabela)).split(os.sep) if "=" in p)
+            if any(campo in partes and partes[campo] != str(valor) for campo, valor in filtros_particao.items()):
+                continue
+        arquivos.append(caminho)
+    return sorted(arquivos)
+
+def _ler_arquivo(caminho: str, colunas: Optional[List[str]] = None):
+    pa = _pyarrow()
+    if caminho.endswith(".arrow"):
+        # IPC mapeado em memória: buffers apontam direto para o arquivo
+        tabela = pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+        return tabela.select(colunas) if colunas else tabela
+    return pa.parquet.read_table(caminho, columns=colunas, memory_map=True)
+
+def _no_intervalo(caminho: str, desde: Optional[datetime], ate: Optional[datetime]) -> bool:
+    """Poda por ano/mes do caminho antes de abrir o arquivo"""
+    partes = dict(p.split("=", 1) for p in caminho.split(os.sep) if "=" in p)
+    if "ano" not in partes:
+        return True
+    ano, mes = int(partes["ano"]), int(partes.get("mes", 0))
+    if desde and (ano, mes or 12) < (desde.year, desde.month if mes else 12):
+        return False
+    if ate and (ano, mes or 1) > (ate.year, ate.month if mes else 1):
+        return False
+    return True
+
+def ler_tabela(tabela: str, colunas: Optional[List[str]] = None, desde: Optional[datetime] = None,
+               ate: Optional[datetime] = None, **filtros_particao):
+    """
+    Histórico da tabela como pyarrow.Table, ordenado pela coluna de tempo
+
+    Args:
+        colunas: subconjunto de colunas (a de tempo é sempre incluída)
+        desde/ate: intervalo (inclusive) na coluna de tempo
+        filtros_particao: igualdade em colunas de partição (ohlc_bars: symbol, intervalo)
+    """
+    pa = _pyarrow()
+    tempo = TABELAS[tabela]["tempo"]
+    if colunas and tempo not in colunas:
+        colunas = [tempo] + list(colunas)
+
+    partes = [
+        _ler_arquivo(f, colunas) for f in _arquivos(tabela, filtros_particao)
+        if _no_intervalo(f, desde, ate)
+    ]
+    if not partes:
+        return None
+
+    resultado = pa.concat_tables(partes, promote_options="default")
+    if desde is not None:
+        resultado = resultado.filter(pa.compute.greater_equal(resultado[tempo], pa.scalar(desde, resultado.schema.field(tempo).type)))
+    if ate is not None:
+        resultado = resultado.filter(pa.compute.less_equal(resultado[tempo], pa.scalar(ate, resultado.schema.field(tempo).type)))
+    return resultado.sort_by(tempo)
+
+def ler_dataframe(tabela: str, **kwargs):
+    """Histórico como pandas.DataFrame (vazio se não exportado)"""
+    import pandas as pd
+
+    resultado = ler_tabela(tabela, **kwargs)
+    return resultado.to_pandas() if resultado is not None else pd.DataFrame()
+
+def ler_arrays(tabela: str, colunas: List[str], **kwargs) -> Dict:
+    """
+    Colunas como arrays NumPy
+
+    Colunas numéricas sem nulos em um único bloco são entregues sem cópia
+    (views sobre os buffers Arrow); as demais são convertidas.
+    """
+    resultado = ler_tabela(tabela, colunas=colunas, **kwargs)
+    if resultado is None:
+        return {}
+    resultado = resultado.combine_chunks()
+    arrays = {}
+    for nome in resultado.column_names:
+        coluna = resultado.column(nome)
+        if coluna.num_chunks == 1 and coluna.null_count == 0:
+            arrays[nome] = coluna.chunk(0).to_numpy(zero_copy_only=False)
+        else:
+            arrays[nome] = coluna.to_numpy()
+    return arrays
+
+def status_store() -> Dict:
+    """Arquivos e watermark por tabela"""
+    watermarks = _ler_watermarks()
+    return {
+        tabela: {
+            "arquivos": len(_arquivos(tabela)),
+            "watermark": watermarks.get(tabela) if tabela != "ohlc_bars" else
+                {k: v for k, v in watermarks.items() if k.startswith("ohlc_bars:")}
+        }
+        for tabela in TABELAS
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store analítico colunar do histórico")
+    parser.add_argument("--exportar", action="store_true", help="Exportação incremental")
+    parser.add_argument("--compactar", action="store_true", help="Junta arquivos pequenos por partição")
+    parser.add_argument("--tabela", nargs="+", default=None, choices=list(TABELAS))
+    args = parser.parse_args()
+
+    if args.exportar:
+        print(json.dumps(exportar_incremental(args.tabela), indent=2, default=str))
+    if args.compactar:
+        print(json.dumps(compactar(args.tabela), indent=2))
+    if not (args.exportar or args.compactar):
+        print(json.dumps(status_store(), indent=2, default=str))
@@ -0,0 +1,100 @@
+# app/services/utils/helpers/executor_helper.py
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_executores: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+def _get_executor(nome: str) -> ThreadPoolExecutor:
+    """Executor limitado por categoria (criado sob demanda)"""
+    if nome not in _executores:
+        with _lock:
+            if nome not in _executores:
+                settings = get_settings()
+                workers = {
+                    "leitura": settings.EXECUTOR_LEITURA_WORKERS,
+                    "processamento": settings.EXECUTOR_PROCESSAMENTO_WORKERS
+                }[nome]
+                _executores[nome] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"exec_{nome}")
+                logger.info(f"🚀 Executor '{nome}' criado ({workers} workers)")
+    return _executores[nome]
+
+async def executar_leitura(func: Callable, *args, **kwargs) -> Any:
+    """
+    Executa função bloqueante de leitura (GETs: PostgreSQL) fora do event loop
+    Pool separado: leituras não ficam na fila atrás de POSTs pesados
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor("leitura"), functools.partial(func, *args, **kwargs))
+
+async def executar_processamento(func: Callable, *args, **kwargs) -> Any:
+    """
+    Executa função bloqueante pesada (POSTs, coletas: TradingView, web3, Notion)
+    fora do event loop, limitada a EXECUTOR_PROCESSAMENTO_WORKERS simultâneas
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor("processamento"), functools.partial(func, *args, **kwargs))
+
+def executar_em_paralelo(funcoes: Dict[str, Callable[[], Any]], timeout: float,
+                         prefixo: str = "paralelo") -> Tuple[Dict[str, Any], Dict[str, str], Dict[str, Optional[float]]]:
+    """
+    Executa funções sem argumentos em threads simultâneas, com prazo total
+
+    A latência passa a ser a da função mais lenta. Falha ou timeout de uma
+    não interrompe as demais: vai para `erros`, com tempo None. Threads
+    penduradas não bloqueiam o retorno (terminam sozinhas).
+
+    Args:
+        funcoes: nome -> função sem argumentos
+        timeout: prazo (s) para todas, contado do início
+        prefixo: nome das threads
+
+    Returns:
+        (resultados, erros, tempos_ms) - tempos_ms inclui "total"
+    """
+    inicio = time.monotonic()
+    resultados, erros, tempos_ms = {}, {}, {}
+
+    def _executar(func: Callable[[], Any]) -> Tuple[Any, float]:
+        t0 = time.monotonic()
+        dados = func()
+        return dados, round((time.monotonic() - t0) * 1000, 1)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(funcoes)), thread_name_prefix=prefixo)
+    try:
+        futures = {nome: executor.submit(_executar, func) for nome, func in funcoes.items()}
+
+        for nome, future in futures.items():
+            restante = max(0.0, timeout - (time.monotonic() - inicio))
+            try:
+                resultados[nome], tempos_ms[nome] = future.result(timeout=restante)
+            except FuturesTimeout:
+                logger.error(f"⏱️ Timeout {nome} após {timeout}s")
+                erros[nome] = f"timeout após {timeout}s"
+                tempos_ms[nome] = None
+            except Exception as e:
+                logger.error(f"❌ Erro {nome}: {str(e)}")
+                erros[nome] = str(e)
+                tempos_ms[nome] = None
+    finally:
+        executor.shutdown(wait=False)
+
+    tempos_ms["total"] = round((time.monotonic() - inicio) * 1000, 1)
+    return resultados, erros, tempos_ms
+
+def encerrar_executores():
+    """Finaliza executores (shutdown da aplicação)"""
+    with _lock:
+        for nome, executor in _executores.items():
+            executor.shutdown(wait=False)
+            logger.info(f"🛑 Executor '{nome}' encerrado")
+        _executores.clear()
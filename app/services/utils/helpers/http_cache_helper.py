@@ -0,0 +1,100 @@
+# app/services/utils/helpers/http_cache_helper.py
+
+"""
+Respostas condicionais (ETag / If-None-Match) para os GETs de leitura
+
+- A ETag vem da marca (MAX(id) ou MAX(timestamp)) das tabelas de origem,
+  memorizada pelo cache de último registro: inserts chamam invalidar_tabela,
+  então a marca só é relida do banco após uma gravação ou pelo TTL.
+- If-None-Match igual à ETag atual -> 304 sem executar a consulta nem
+  montar o JSON.
+- Cache-Control: max-age curto (HTTP_CACHE_MAX_AGE_SECONDS) + revalidação.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+from fastapi import Request
+from fastapi.responses import Response
+from app.config import get_settings
+from app.services.utils.helpers.executor_helper import executar_leitura
+from app.services.utils.helpers.json_response_helper import resposta_json
+from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro
+
+logger = logging.getLogger(__name__)
+
+# tabela -> coluna monotônica usada como marca
+MARCAS = {
+    "dash_main": "id",
+    "dash_mercado": "id",
+    "decisao_estrategica": "id",
+    "indicadores_risco": "id",
+}
+
+@cache_ultimo_registro(*MARCAS)
+def marca_tabela(tabela: str) -> Optional[dict]:
+    """Último id da tabela (memorizado até o próximo insert em qualquer tabela de MARCAS)"""
+    try:
+        return execute_query(f"SELECT MAX({MARCAS[tabela]}) AS marca FROM {tabela}", fetch_one=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Marca ETag indisponível ({tabela}): {str(e)}")
+        return None
+
+def calcular_etag(tabelas: Sequence[str], *extras) -> Optional[str]:
+    """ETag fraca das marcas das tabelas + parâmetros da requisição (None se alguma marca falhar)"""
+    marcas = []
+    for tabela in tabelas:
+        resultado = marca_tabela(tabela)
+        if resultado is None:
+            return None
+        marcas.append(f"{tabela}={resultado['marca']}")
+
+    chave = "|".join(marcas + [str(extra) for extra in extras])
+    return f'W/"{hashlib.sha1(chave.encode("utf-8")).hexdigest()[:20]}"'
+
+def _etag_confere(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = [valor.strip() for valor in if_none_match.split(",")]
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    return "*" in candidatos or etag.removeprefix("W/") in (c.removeprefix("W/") for c in candidatos)
+
+def _sucesso(resultado: Any) -> bool:
+    return isinstance(resultado, (bytes, bytearray)) or (
+        isinstance(resultado, dict) and resultado.get("status") == "success"
+    )
+
+async def responder_condicional(request: Request, tabelas: Sequence[str], func: Callable, *args,
+                                extras: Sequence = ()) -> Response:
+    """
+    GET com ETag: 304 quando o cliente já tem a versão atual; senão executa
+    `func(*args)` no executor de leitura e anexa ETag + Cache-Control ao sucesso
+
+    Args:
+        tabelas: tabelas de origem da resposta (chaves de MARCAS)
+        extras: parâmetros que mudam a resposta (período, limit, dia corrente...)
+    """
+    settings = get_settings()
+    if not settings.HTTP_CACHE_ENABLED:
+        return resposta_json(await executar_leitura(func, *args))
+
+    etag = await executar_leitura(calcular_etag, tabelas, *extras)
+    cabecalhos = {
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate"
+    }
+
+    if etag and _etag_confere(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, **cabecalhos})
+
+    resultado = await executar_leitura(func, *args)
+    resposta = resposta_json(resultado)
+    if etag and _sucesso(resultado):
+        resposta.headers["ETag"] = etag
+        resposta.headers.update(cabecalhos)
+    return resposta
+
+def dia_utc() -> str:
+    """Extra de ETag para janelas relativas a hoje (períodos do dash-finance)"""
+    return datetime.utcnow().date().isoformat()
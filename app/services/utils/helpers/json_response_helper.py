@@ -0,0 +1,113 @@
+# app/services/utils/helpers/json_response_helper.py
+
+"""
+Respostas JSON rápidas para os GETs de dashboard
+
+- JSON salvo no banco é lido como texto (coluna::text) e entra na resposta
+  sem json.loads / re-encode (montar_objeto).
+- Corpos renderizados ficam em cache por (tabela, id): o registro gravado é
+  imutável, então a entrada só sai do cache por capacidade (LRU).
+- OrjsonResponse para respostas que ainda passam por dicts.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Tuple
+from fastapi.responses import JSONResponse, Response
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # requirements.txt instala; fallback mantém a API funcionando
+    orjson = None
+
+class JsonBruto(bytes):
+    """JSON já serializado, inserido literalmente por montar_objeto"""
+
+def _padrao(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def dumps(conteudo: Any) -> bytes:
+    """Serializa para bytes UTF-8 (orjson quando disponível)"""
+    if orjson is not None:
+        return orjson.dumps(conteudo, default=_padrao, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(conteudo, default=_padrao, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def montar_objeto(campos: Dict[str, Any], expandir: bytes = None) -> bytes:
+    """
+    Objeto JSON a partir de campos; valores JsonBruto entram sem re-serializar
+
+    Args:
+        expandir: texto de um objeto JSON cujas chaves são mescladas no final
+                  (equivale a {**campos, **json.loads(expandir)})
+    """
+    partes = [dumps(chave) + b":" + (valor if isinstance(valor, JsonBruto) else dumps(valor))
+              for chave, valor in campos.items()]
+    corpo = b"{" + b",".join(partes)
+
+    if expandir:
+        interno = expandir.strip()
+        if not (interno.startswith(b"{") and interno.endswith(b"}")):
+            raise ValueError("expandir requer um objeto JSON")
+        interno = interno[1:-1].strip()
+        if interno:
+            corpo += (b"," if partes else b"") + interno
+
+    return corpo + b"}"
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse serializada com orjson (Decimal, datetime e NumPy suportados)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def resposta_json(resultado: Any) -> Response:
+    """Bytes prontos -> Response direta; demais conteúdos -> OrjsonResponse"""
+    if isinstance(resultado, (bytes, bytearray)):
+        return Response(content=bytes(resultado), media_type="application/json")
+    return OrjsonResponse(content=resultado)
+
+# ==========================================
+# CACHE DE RENDERIZAÇÃO POR REGISTRO
+# ==========================================
+
+_renderizados: "OrderedDict[Tuple[str, Any], bytes]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+def renderizado(tabela: str, registro_id: Any, gerar: Callable[[], bytes]) -> bytes:
+    """
+    Corpo JSON do registro `registro_id` de `tabela`, gerado uma única vez
+
+    Registros gravados não mudam; um novo insert gera outro id (outra chave).
+    """
+    chave = (tabela, registro_id)
+    with _lock:
+        corpo = _renderizados.get(chave)
+        if corpo is not None:
+            _renderizados.move_to_end(chave)
+            _stats["hits"] += 1
+            return corpo
+        _stats["misses"] += 1
+
+    corpo = gerar()
+
+    with _lock:
+        _renderizados[chave] = corpo
+        while len(_renderizados) > get_settings().RENDER_CACHE_MAX_ENTRIES:
+            _renderizados.popitem(last=False)
+    return corpo
+
+def get_render_cache_stats() -> Dict:
+    with _lock:
+        return {**_stats, "entradas": len(_renderizados), "bytes": sum(len(c) for c in _renderizados.values())}
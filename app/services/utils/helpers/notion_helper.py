@@ -1,162 +1,173 @@
 # app/services/utils/helpers/notion_helper.py - COMPLETO SIMPLIFICADO
 
+"""
+Leitura do Notion Database de indicadores (blocos ciclo e momentum)
+
+Um único snapshot compartilhado pelos coletores:
+- consulta paginada (sem o corte silencioso em 100 linhas) e parse único de
+  todas as linhas em IndicadorNotion, indexadas por página;
+- reaproveitado por NOTION_CACHE_TTL_SECONDS (ciclo + momentum = 1 leitura);
+- depois do TTL, busca só as páginas com last_edited_time >= última edição
+  vista; a cada NOTION_FULL_REFRESH_SECONDS refaz a leitura completa
+  (remove páginas apagadas/arquivadas).
+"""
+
+from dataclasses import dataclass
 from datetime import datetime
 from notion_client import Client
-from typing import Dict
+from typing import Dict, List, Optional
 from app.config import get_settings
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-def get_ciclo_data_from_notion() -> Dict:
-    """Busca dados do bloco CICLO do Notion Database"""
+# Indicadores aceitos por bloco (nome no Notion em minúsculas = chave do retorno)
+CAMPOS_BLOCO = {
+    "ciclo": ("mvrv_z_score", "realized_ratio", "puell_multiple", "nupl"),
+    "momentum": ("rsi_semanal", "funding_rates", "exchange_netflow", "long_short_ratio", "sopr"),
+}
+
+@dataclass(frozen=True)
+class IndicadorNotion:
+    page_id: str
+    bloco: str
+    indicador: str
+    valor: float
+    last_edited_time: str
+
+_lock = threading.Lock()
+_client: Optional[Client] = None
+_paginas: Dict[str, IndicadorNotion] = {}
+_ultima_edicao: Optional[str] = None
+_atualizado_em: float = 0.0
+_leitura_completa_em: float = 0.0
+
+def _get_client() -> Client:
+    global _client
+    if _client is None:
+        _client = Client(auth=get_settings().NOTION_TOKEN)
+    return _client
+
+def _parse_linha(row: dict) -> Optional[IndicadorNotion]:
+    """Linha do Notion -> IndicadorNotion (None se faltar indicador, valor ou bloco)"""
+    props = row.get("properties", {})
+
+    indicador_nome = None
+    if "indicador" in props and props["indicador"].get("title"):
+        indicador_nome = props["indicador"]["title"][0]["plain_text"].strip()
+
+    valor = None
+    if "valor" in props and props["valor"].get("number") is not None:
+        valor = props["valor"]["number"]
+
+    bloco = None
+    if "bloco" in props and props["bloco"].get("select"):
+        bloco = props["bloco"]["select"]["name"].strip()
+
+    if not (indicador_nome and valor is not None and bloco):
+        return None
+
+    return IndicadorNotion(
+        page_id=row["id"],
+        bloco=bloco,
+        indicador=indicador_nome.lower().strip(),
+        valor=float(valor),
+        last_edited_time=row.get("last_edited_time", "")
+    )
+
+def _consultar(desde: Optional[str] = None) -> List[dict]:
+    """databases.query paginado; `desde` filtra por last_edited_time (ISO)"""
+    notion = _get_client()
+    database_id = get_settings().NOTION_DATABASE_ID.strip().replace('"', '')
+
+    parametros = {"database_id": database_id, "page_size": 100}
+    if desde:
+        parametros["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": desde}}
+
+    linhas, cursor = [], None
+    while True:
+        response = notion.databases.query(**parametros, **({"start_cursor": cursor} if cursor else {}))
+        linhas.extend(response["results"])
+        if not response.get("has_more"):
+            return linhas
+        cursor = response["next_cursor"]
+
+def obter_snapshot(forcar: bool = False) -> Dict[str, Dict[str, IndicadorNotion]]:
+    """
+    Indicadores do Notion por bloco: {bloco: {indicador: IndicadorNotion}}
+    Página editada mais recentemente vence quando o mesmo indicador se repete
+    """
+    global _ultima_edicao, _atualizado_em, _leitura_completa_em
+    settings = get_settings()
+
+    with _lock:
+        agora = time.monotonic()
+        if forcar or not _paginas or agora - _atualizado_em >= settings.NOTION_CACHE_TTL_SECONDS:
+            completa = forcar or not _paginas or agora - _leitura_completa_em >= settings.NOTION_FULL_REFRESH_SECONDS
+
+            linhas = _consultar(None if completa else _ultima_edicao)
+            if completa:
+                _paginas.clear()
+                _leitura_completa_em = agora
+
+            for row in linhas:
+                indicador = _parse_linha(row)
+                if indicador is not None:
+                    _paginas[indicador.page_id] = indicador
+                else:
+                    _paginas.pop(row.get("id"), None)
+                _ultima_edicao = max(_ultima_edicao or "", row.get("last_edited_time", "")) or None
+
+            _atualizado_em = agora
+            logger.info(
+                f"🔗 Notion {'completo' if completa else 'incremental'}: "
+                f"{len(linhas)} linhas lidas, {len(_paginas)} indicadores no snapshot"
+            )
+
+        blocos: Dict[str, Dict[str, IndicadorNotion]] = {}
+        for indicador in sorted(_paginas.values(), key=lambda i: i.last_edited_time):
+            blocos.setdefault(indicador.bloco, {})[indicador.indicador] = indicador
+        return blocos
+
+def invalidar_snapshot():
+    """Força leitura completa na próxima consulta"""
+    global _atualizado_em, _leitura_completa_em
+    with _lock:
+        _paginas.clear()
+        _atualizado_em = _leitura_completa_em = 0.0
+
+def _dados_bloco(bloco: str, forcar: bool = False) -> Optional[Dict]:
+    """Campos do bloco a partir do snapshot (None se nenhum indicador encontrado)"""
+    indicadores = obter_snapshot(forcar).get(bloco, {})
+
+    dados = {campo: None for campo in CAMPOS_BLOCO[bloco]}
+    for campo in CAMPOS_BLOCO[bloco]:
+        if campo in indicadores:
+            dados[campo] = indicadores[campo].valor
+            logger.info(f"📈 {bloco.upper()} - {campo}: {dados[campo]}")
+
+    indicadores_encontrados = [k for k, v in dados.items() if v is not None]
+    if not indicadores_encontrados:
+        logger.error(f"❌ Nenhum indicador de {bloco.upper()} encontrado!")
+        return None
+
+    logger.info(f"✅ Indicadores {bloco.upper()} coletados: {indicadores_encontrados}")
+    return {**dados, "fonte": "Notion", "timestamp": datetime.utcnow().isoformat()}
+
+def get_ciclo_data_from_notion(forcar: bool = False) -> Dict:
+    """Busca dados do bloco CICLO do Notion Database (forcar=True ignora o snapshot em cache)"""
     try:
-        settings = get_settings()
-        notion = Client(auth=settings.NOTION_TOKEN)
-        database_id = settings.NOTION_DATABASE_ID.strip().replace('"', '')
-        
-        logger.info(f"🔗 Conectando ao Notion Database: {database_id}")
-        
-        # Buscar dados da database
-        response = notion.databases.query(database_id=database_id)
-        
-        # Dados padrão
-        dados_ciclo = {
-            "mvrv_z_score": None,
-            "realized_ratio": None,
-            "puell_multiple": None,
-            "nupl": None,
-            "fonte": "Notion",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        logger.info(f"📊 Processando {len(response['results'])} registros para CICLO...")
-        
-        # LÓGICA SIMPLES: Para cada row, pegar indicador + valor + bloco
-        for row in response["results"]:
-            props = row.get("properties", {})
-            
-            # Pegar nome do indicador
-            indicador_nome = None
-            if "indicador" in props and props["indicador"].get("title"):
-                indicador_nome = props["indicador"]["title"][0]["plain_text"].strip()
-            
-            # Pegar valor
-            valor = None
-            if "valor" in props and props["valor"].get("number") is not None:
-                valor = props["valor"]["number"]
-            
-            # Pegar bloco (para filtrar só os de ciclo)
-            bloco = None
-            if "bloco" in props and props["bloco"].get("select"):
-                bloco = props["bloco"]["select"]["name"].strip()
-            
-            # Se temos indicador + valor + bloco correto, mapear
-            if indicador_nome and valor is not None and bloco == "ciclo":
-                indicador_lower = indicador_nome.lower().strip()
-                
-                # MAPEAMENTO DIRETO CICLO
-                if indicador_lower == "mvrv_z_score":
-                    dados_ciclo["mvrv_z_score"] = float(valor)
-                elif indicador_lower == "realized_ratio":
-                    dados_ciclo["realized_ratio"] = float(valor)
-                elif indicador_lower == "puell_multiple":
-                    dados_ciclo["puell_multiple"] = float(valor)
-                elif indicador_lower == "nupl":
-                    dados_ciclo["nupl"] = float(valor)
-                    logger.info(f"✅ NUPL encontrado: {valor}")
-                
-                logger.info(f"📈 CICLO - {indicador_nome}: {valor}")
-        
-        # Verificar se encontrou dados
-        indicadores_encontrados = [k for k, v in dados_ciclo.items() 
-                                 if k not in ["fonte", "timestamp"] and v is not None]
-        
-        if not indicadores_encontrados:
-            logger.error("❌ Nenhum indicador de CICLO encontrado!")
-            return None
-        
-        logger.info(f"✅ Indicadores CICLO coletados: {indicadores_encontrados}")
-        return dados_ciclo
-        
+        return _dados_bloco("ciclo", forcar)
     except Exception as e:
         logger.error(f"❌ Erro na conexão com Notion (CICLO): {str(e)}")
         return None
 
-def get_momentum_data_from_notion() -> Dict:
-    """Busca dados do bloco MOMENTUM do Notion Database"""
+def get_momentum_data_from_notion(forcar: bool = False) -> Dict:
+    """Busca dados do bloco MOMENTUM do Notion Database (forcar=True ignora o snapshot em cache)"""
     try:
-        settings = get_settings()
-        notion = Client(auth=settings.NOTION_TOKEN)
-        database_id = settings.NOTION_DATABASE_ID.strip().replace('"', '')
-        
-        logger.info(f"🔗 Conectando ao Notion Database: {database_id}")
-        
-        # Buscar dados da database
-        response = notion.databases.query(database_id=database_id)
-        
-        # Dados padrão
-        dados_momentum = {
-            "rsi_semanal": None,
-            "funding_rates": None,
-            "exchange_netflow": None,
-            "long_short_ratio": None,
-            "sopr": None,
-            "fonte": "Notion",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        logger.info(f"📊 Processando {len(response['results'])} registros para MOMENTUM...")
-        
-        # LÓGICA SIMPLES: Para cada row, pegar indicador + valor + bloco
-        for row in response["results"]:
-            props = row.get("properties", {})
-            
-            # Pegar nome do indicador
-            indicador_nome = None
-            if "indicador" in props and props["indicador"].get("title"):
-                indicador_nome = props["indicador"]["title"][0]["plain_text"].strip()
-            
-            # Pegar valor
-            valor = None
-            if "valor" in props and props["valor"].get("number") is not None:
-                valor = props["valor"]["number"]
-            
-            # Pegar bloco (para filtrar só os de momentum)
-            bloco = None
-            if "bloco" in props and props["bloco"].get("select"):
-                bloco = props["bloco"]["select"]["name"].strip()
-            
-            # Se temos indicador + valor + bloco correto, mapear
-            if indicador_nome and valor is not None and bloco == "momentum":
-                indicador_lower = indicador_nome.lower().strip()
-                
-                # MAPEAMENTO DIRETO MOMENTUM
-                if indicador_lower == "rsi_semanal":
-                    dados_momentum["rsi_semanal"] = float(valor)
-                elif indicador_lower == "funding_rates":
-                    dados_momentum["funding_rates"] = float(valor)
-                elif indicador_lower == "exchange_netflow":
-                    dados_momentum["exchange_netflow"] = float(valor)
-                elif indicador_lower == "long_short_ratio":
-                    dados_momentum["long_short_ratio"] = float(valor)
-                elif indicador_lower == "sopr":
-                    dados_momentum["sopr"] = float(valor)
-                    logger.info(f"✅ SOPR encontrado: {valor}")
-                
-                logger.info(f"📈 MOMENTUM - {indicador_nome}: {valor}")
-        
-        # Verificar se encontrou dados
-        indicadores_encontrados = [k for k, v in dados_momentum.items() 
-                                 if k not in ["fonte", "timestamp"] and v is not None]
-        
-        if not indicadores_encontrados:
-            logger.error("❌ Nenhum indicador de MOMENTUM encontrado!")
-            return None
-        
-        logger.info(f"✅ Indicadores MOMENTUM coletados: {indicadores_encontrados}")
-        return dados_momentum
-        
+        return _dados_bloco("momentum", forcar)
     except Exception as e:
         logger.error(f"❌ Erro na conexão com Notion (MOMENTUM): {str(e)}")
-        return None
\ No newline at end of file
+        return None
@@ -1,7 +1,9 @@
 # app/services/utils/helpers/postgres/__init__.py - ADICIONAR
 
 # Imports da base
-from .base import get_db_connection, execute_query, test_connection
+from .base import get_db_connection, get_pooled_connection, execute_query, execute_many, test_connection
+from .pool import get_pool_stats
+from .latest_cache import get_latest_cache_stats, invalidar_tabela
 
 # Imports específicos por bloco
 from .indicadores.ciclo_helper import get_dados_ciclo, insert_dados_ciclo, get_historico_ciclo
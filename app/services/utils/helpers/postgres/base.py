@@ -2,11 +2,13 @@
 
 import logging
 from datetime import datetime
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Sequence, Tuple
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2 import OperationalError, DatabaseError
+from psycopg2.extensions import cursor as TupleCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2 import OperationalError, InterfaceError, DatabaseError
 from app.config import get_settings
+from .pool import get_pool
 
 # Configurar logging específico para PostgreSQL
 logging.basicConfig(level=logging.INFO)
@@ -65,41 +67,119 @@ def get_db_connection():
             logger.error(f"🚨 Erro inesperado na conexão: {str(e)}")
             raise
 
+def get_pooled_connection():
+    """
+    Empresta conexão do pool do processo (context manager)
+    Conexões novas são abertas via get_db_connection()
+    """
+    return get_pool(get_db_connection).conexao()
+
 def execute_query(query: str, params: tuple = None, fetch_one: bool = False, fetch_all: bool = False):
     """
     Executa query com tratamento robusto de erros
     Função genérica reutilizada por todos os helpers
+    Usa o pool de conexões; SELECTs são repetidos uma vez após queda de conexão (failover)
+    """
+    tentativas = 2 if query.lstrip().upper().startswith("SELECT") else 1
+
+    for tentativa in range(1, tentativas + 1):
+        try:
+            with get_pooled_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+
+                    if fetch_one:
+                        result = cursor.fetchone()
+                        return dict(result) if result else None
+                    elif fetch_all:
+                        results = cursor.fetchall()
+                        return [dict(row) for row in results] if results else []
+                    else:
+                        conn.commit()
+                        return {"status": "success", "affected_rows": cursor.rowcount}
+
+        except (OperationalError, InterfaceError) as e:
+            if tentativa < tentativas:
+                logger.warning(f"⚠️ Conexão perdida, repetindo query com nova conexão: {str(e)}")
+                continue
+            logger.error(f"🚨 Erro de conexão na execução da query: {str(e)}")
+            logger.error(f"Query: {query}")
+            raise Exception(f"Erro no banco de dados: {str(e)}")
+        except DatabaseError as e:
+            logger.error(f"🚨 Erro na execução da query: {str(e)}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise Exception(f"Erro no banco de dados: {str(e)}")
+        except Exception as e:
+            logger.error(f"🚨 Erro inesperado: {str(e)}")
+            raise
+
+def execute_query_tuplas(query: str, params: tuple = None, registro=None) -> Tuple[Tuple[str, ...], List]:
     """
+    SELECT sem RealDictCursor: nomes das colunas + linhas como tuplas do driver
+    (nenhum dict por linha). Mesmo failover de execute_query.
+
+    Args:
+        registro: NamedTuple opcional com os campos na ordem do SELECT (linhas via _make)
+    """
+    for tentativa in (1, 2):
+        try:
+            with get_pooled_connection() as conn:
+                with conn.cursor(cursor_factory=TupleCursor) as cursor:
+                    cursor.execute(query, params)
+                    nomes = tuple(coluna.name for coluna in cursor.description)
+                    linhas = cursor.fetchall()
+                    return nomes, (list(map(registro._make, linhas)) if registro else linhas)
+
+        except (OperationalError, InterfaceError) as e:
+            if tentativa < 2:
+                logger.warning(f"⚠️ Conexão perdida, repetindo query com nova conexão: {str(e)}")
+                continue
+            logger.error(f"🚨 Erro de conexão na execução da query: {str(e)}")
+            logger.error(f"Query: {query}")
+            raise Exception(f"Erro no banco de dados: {str(e)}")
+        except DatabaseError as e:
+            logger.error(f"🚨 Erro na execução da query: {str(e)}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise Exception(f"Erro no banco de dados: {str(e)}")
+
+def execute_query_colunas(query: str, params: tuple = None) -> Dict[str, Sequence]:
+    """
+    SELECT em formato colunar: {coluna: (valores...)} na ordem das linhas
+    Colunas vazias quando não há linhas; serializadores iteram com zip()
+    """
+    nomes, linhas = execute_query_tuplas(query, params)
+    if not linhas:
+        return {nome: () for nome in nomes}
+    return dict(zip(nomes, zip(*linhas)))
+
+def execute_many(query: str, rows: List[tuple], page_size: int = 500) -> Dict:
+    """
+    Executa INSERT em lote (execute_values) numa única conexão do pool
+    A query deve conter um único placeholder VALUES %s
+    """
+    if not rows:
+        return {"status": "success", "affected_rows": 0}
+
     try:
-        with get_db_connection() as conn:
+        with get_pooled_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                
-                if fetch_one:
-                    result = cursor.fetchone()
-                    return dict(result) if result else None
-                elif fetch_all:
-                    results = cursor.fetchall()
-                    return [dict(row) for row in results] if results else []
-                else:
-                    conn.commit()
-                    return {"status": "success", "affected_rows": cursor.rowcount}
-                    
+                execute_values(cursor, query, rows, page_size=page_size)
+                conn.commit()
+                return {"status": "success", "affected_rows": len(rows)}
+
     except DatabaseError as e:
-        logger.error(f"🚨 Erro na execução da query: {str(e)}")
+        logger.error(f"🚨 Erro na execução em lote: {str(e)}")
         logger.error(f"Query: {query}")
-        logger.error(f"Params: {params}")
         raise Exception(f"Erro no banco de dados: {str(e)}")
-    except Exception as e:
-        logger.error(f"🚨 Erro inesperado: {str(e)}")
-        raise
 
 def test_connection() -> bool:
     """Testa conexão básica com o PostgreSQL"""
     try:
         logger.info("🧪 Testando conexão PostgreSQL...")
         
-        with get_db_connection() as conn:
+        with get_pooled_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT version()")
                 version = cursor.fetchone()
@@ -0,0 +1,29 @@
+# app/services/utils/helpers/postgres/chaves.py
+
+"""
+Chave de ordenação das tabelas de histórico
+
+Coluna de tempo e coluna id (desempate) de cada tabela; id None quando a
+tabela não tem id e a ordem é só pelo tempo. Compartilhado pelo store
+analítico (keyset da exportação) e pelo pipeline (último registro).
+"""
+
+from typing import Dict, Optional
+
+CHAVES: Dict[str, Dict[str, Optional[str]]] = {
+    "indicadores_ciclo": {"tempo": "timestamp", "id": "id"},
+    "indicadores_momentum": {"tempo": "timestamp", "id": "id"},
+    "indicadores_tecnico": {"tempo": "timestamp", "id": "id"},
+    "indicadores_risco": {"tempo": "timestamp", "id": "id"},
+    "score_tendencia": {"tempo": "timestamp", "id": None},
+    "dash_mercado": {"tempo": "timestamp", "id": "id"},
+    "decisao_estrategica": {"tempo": "timestamp", "id": "id"},
+    "ohlc_bars": {"tempo": "datetime", "id": None},
+}
+
+def ordem_recente(tabela: str, alias: str = "") -> str:
+    """ORDER BY do registro mais recente primeiro (tempo, depois id quando houver)"""
+    chave = CHAVES[tabela]
+    prefixo = f"{alias}." if alias else ""
+    colunas = [chave["tempo"]] + ([chave["id"]] if chave["id"] else [])
+    return ", ".join(f"{prefixo}{coluna} DESC" for coluna in colunas)
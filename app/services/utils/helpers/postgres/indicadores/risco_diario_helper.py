@@ -0,0 +1,247 @@
+# app/services/utils/helpers/postgres/indicadores/risco_diario_helper.py
+
+"""
+Rollup diário de indicadores_risco (indicadores_risco_diario)
+
+Uma linha por dia com último/mín/máx/soma/contagem de cada métrica; a média
+é soma / contagem. <metrica>_ultimo_id guarda o id da amostra que forneceu o
+último valor (timestamp e colunas dessa amostra via get_historico_diario).
+insert_dados_risco_completo atualiza o dia da amostra na mesma instrução do
+INSERT; o backfill reconstrói o rollup a partir das amostras brutas (passo
+explícito - a verificação da tabela só avisa quando o rollup não cobre o
+histórico bruto):
+
+    python -m app.services.utils.helpers.postgres.indicadores.risco_diario_helper --desde 2024-01-01
+"""
+
+import argparse
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+from ..base import execute_query, execute_query_colunas
+
+logger = logging.getLogger(__name__)
+
+METRICAS = [
+    "health_factor", "net_asset_value", "btc_price",
+    "alavancagem", "saldo_btc_core", "supplied_asset_value"
+]
+
+_tabela_verificada = False
+
+def _colunas_insert() -> str:
+    colunas = ["data", "amostras", "ultimo_timestamp", "ultimo_id"]
+    for m in METRICAS:
+        colunas += [f"{m}_ultimo", f"{m}_ultimo_id", f"{m}_min", f"{m}_max", f"{m}_soma", f"{m}_n"]
+    return ", ".join(colunas)
+
+def _select_agregado() -> str:
+    """Agrega a relação `amostras` (timestamp, id, métricas) por dia"""
+    campos = [
+        "DATE(timestamp)",
+        "COUNT(*)",
+        "MAX(timestamp)",
+        "(ARRAY_AGG(id ORDER BY timestamp DESC, id DESC))[1]"
+    ]
+    for m in METRICAS:
+        campos += [
+            f"(ARRAY_AGG({m} ORDER BY timestamp DESC, id DESC) FILTER (WHERE {m} IS NOT NULL))[1]",
+            f"(ARRAY_AGG(id ORDER BY timestamp DESC, id DESC) FILTER (WHERE {m} IS NOT NULL))[1]",
+            f"MIN({m})", f"MAX({m})", f"SUM({m})", f"COUNT({m})"
+        ]
+    return f"SELECT {', '.join(campos)} FROM amostras GROUP BY DATE(timestamp)"
+
+def _merge_conflito() -> str:
+    """Mescla o agregado novo com o dia existente (LEAST/GREATEST ignoram NULL)"""
+    novo_mais_recente = "EXCLUDED.ultimo_timestamp >= d.ultimo_timestamp"
+    sets = [
+        "amostras = d.amostras + EXCLUDED.amostras",
+        "ultimo_timestamp = GREATEST(d.ultimo_timestamp, EXCLUDED.ultimo_timestamp)",
+        f"ultimo_id = CASE WHEN {novo_mais_recente} THEN EXCLUDED.ultimo_id ELSE d.ultimo_id END"
+    ]
+    for m in METRICAS:
+        novo_ultimo = f"EXCLUDED.{m}_ultimo IS NOT NULL AND ({novo_mais_recente} OR d.{m}_ultimo IS NULL)"
+        sets += [
+            f"{m}_ultimo = CASE WHEN {novo_ultimo} THEN EXCLUDED.{m}_ultimo ELSE d.{m}_ultimo END",
+            f"{m}_ultimo_id = CASE WHEN {novo_ultimo} THEN EXCLUDED.{m}_ultimo_id ELSE d.{m}_ultimo_id END",
+            f"{m}_min = LEAST(d.{m}_min, EXCLUDED.{m}_min)",
+            f"{m}_max = GREATEST(d.{m}_max, EXCLUDED.{m}_max)",
+            f"{m}_soma = CASE WHEN EXCLUDED.{m}_n = 0 THEN d.{m}_soma ELSE COALESCE(d.{m}_soma, 0) + EXCLUDED.{m}_soma END",
+            f"{m}_n = d.{m}_n + EXCLUDED.{m}_n"
+        ]
+    return ",\n            ".join(sets)
+
+UPSERT_DIARIO = f"""
+    INSERT INTO indicadores_risco_diario AS d ({_colunas_insert()})
+    {_select_agregado()}
+    ON CONFLICT (data) DO UPDATE SET
+            {_merge_conflito()}
+"""
+
+def sql_insert_com_rollup(insert_risco: str) -> str:
+    """
+    Envolve o INSERT em indicadores_risco numa única instrução que também
+    atualiza o dia no rollup (mesma transação)
+    """
+    return f"""
+        WITH amostras AS (
+            {insert_risco.strip()}
+            RETURNING id, timestamp, {", ".join(METRICAS)}
+        )
+        {UPSERT_DIARIO}
+    """
+
+def inserir_com_rollup(insert_risco: str, params: tuple):
+    """
+    Grava a amostra e atualiza o rollup na mesma instrução
+    Sem rollup (tabela indisponível) grava só a amostra; o backfill recompõe o dia
+    """
+    try:
+        _create_table_if_not_exists()
+        execute_query(sql_insert_com_rollup(insert_risco), params)
+    except Exception as e:
+        logger.warning(f"⚠️ Rollup risco diário não atualizado, inserindo só a amostra: {str(e)}")
+        execute_query(insert_risco, params)
+
+def get_historico_diario(data_inicio, metricas: List[str], ancora: str,
+                         exigir: Optional[List[str]] = None, colunar: bool = False):
+    """
+    Último valor de cada dia (mais recente primeiro) a partir do rollup
+
+    Args:
+        ancora: métrica cuja última amostra do dia fornece timestamp, ultimo_id e
+                o valor de todas as métricas (mesma linha, como DISTINCT ON com
+                `ancora IS NOT NULL`); mín/máx/média continuam do rollup
+        exigir: métricas que precisam de valor no dia (padrão: só a âncora)
+        colunar: retorna {coluna: valores} (execute_query_colunas) em vez de lista de dicts
+
+    Returns:
+        Lista com data, timestamp e ultimo_id (amostra da âncora) e, por
+        métrica, <metrica> (último), <metrica>_min, <metrica>_max, <metrica>_media
+    """
+    _create_table_if_not_exists()
+
+    for m in metricas + (exigir or []) + [ancora]:
+        if m not in METRICAS:
+            raise ValueError(f"Métrica sem rollup: {m}")
+
+    campos = []
+    for m in metricas:
+        campos += [
+            f"r.{m} AS {m}",
+            f"d.{m}_min", f"d.{m}_max",
+            f"d.{m}_soma / NULLIF(d.{m}_n, 0) AS {m}_media"
+        ]
+
+    query = f"""
+        SELECT d.data, r.timestamp AS timestamp, r.id AS ultimo_id, {", ".join(campos)}
+        FROM indicadores_risco_diario d
+        JOIN indicadores_risco r ON r.id = d.{ancora}_ultimo_id
+        WHERE r.timestamp >= %s
+          AND {" AND ".join(f"d.{m}_ultimo IS NOT NULL" for m in (exigir or [ancora]))}
+        ORDER BY d.data DESC
+    """
+
+    if colunar:
+        return execute_query_colunas(query, params=(data_inicio,))
+    return execute_query(query, params=(data_inicio,), fetch_all=True)
+
+def backfill_risco_diario(desde: Optional[date] = None) -> Dict:
+    """
+    Reconstrói o rollup a partir de indicadores_risco (todos os dias ou a partir de `desde`)
+
+    Executa numa transação com o rollup bloqueado: inserts concorrentes
+    aguardam e são mesclados depois, sem contagem dupla.
+    """
+    _create_table_if_not_exists()
+    logger.info(f"🔄 Backfill rollup risco diário desde {desde or 'o início'}...")
+
+    filtro = "WHERE DATE(timestamp) >= %(desde)s" if desde else ""
+    filtro_rollup = "WHERE data >= %(desde)s" if desde else ""
+
+    query = f"""
+        BEGIN;
+        LOCK TABLE indicadores_risco_diario IN EXCLUSIVE MODE;
+        DELETE FROM indicadores_risco_diario {filtro_rollup};
+        WITH amostras AS (
+            SELECT id, timestamp, {", ".join(METRICAS)}
+            FROM indicadores_risco
+            {filtro}
+        )
+        {UPSERT_DIARIO};
+        COMMIT;
+    """
+
+    execute_query(query, {"desde": desde})
+    total = execute_query("SELECT COUNT(*) AS dias, COALESCE(SUM(amostras), 0) AS amostras FROM indicadores_risco_diario",
+                          fetch_one=True)
+    logger.info(f"✅ Rollup risco diário: {total['dias']} dias, {total['amostras']} amostras")
+    return {"status": "success", "dias": total["dias"], "amostras": int(total["amostras"])}
+
+def _create_table_if_not_exists():
+    """Cria tabela do rollup diário se não existir (uma vez por processo)"""
+    global _tabela_verificada
+    if _tabela_verificada:
+        return
+
+    colunas_metricas = ",\n".join(
+        f"""            {m}_ultimo DECIMAL(20,8),
+            {m}_ultimo_id INTEGER,
+            {m}_min DECIMAL(20,8),
+            {m}_max DECIMAL(20,8),
+            {m}_soma DECIMAL(30,8),
+            {m}_n INTEGER NOT NULL DEFAULT 0"""
+        for m in METRICAS
+    )
+
+    query = f"""
+        CREATE TABLE IF NOT EXISTS indicadores_risco_diario (
+            data DATE PRIMARY KEY,
+            amostras INTEGER NOT NULL,
+            ultimo_timestamp TIMESTAMP NOT NULL,
+            ultimo_id INTEGER,
+{colunas_metricas}
+        )
+    """
+
+    execute_query(query)
+    _tabela_verificada = True
+    logger.info("✅ Tabela indicadores_risco_diario verificada")
+
+    if _rollup_incompleto():
+        logger.warning(
+            "⚠️ Rollup risco diário não cobre as amostras brutas - rode o backfill: "
+            "python -m app.services.utils.helpers.postgres.indicadores.risco_diario_helper"
+        )
+
+def _rollup_incompleto() -> bool:
+    """
+    Rollup recém-criado: começa depois das amostras brutas (o primeiro
+    insert cria um único dia) ou tem dias sem <metrica>_ultimo_id
+    """
+    sem_id = " OR ".join(f"({m}_ultimo IS NOT NULL AND {m}_ultimo_id IS NULL)" for m in METRICAS)
+    try:
+        estado = execute_query(f"""
+            SELECT
+                (SELECT MIN(data) FROM indicadores_risco_diario) AS inicio_rollup,
+                (SELECT DATE(MIN(timestamp)) FROM indicadores_risco) AS inicio_bruto,
+                EXISTS (SELECT 1 FROM indicadores_risco_diario WHERE {sem_id}) AS sem_id
+        """, fetch_one=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Cobertura do rollup risco diário não verificada: {str(e)}")
+        return False
+
+    if estado["inicio_bruto"] is None:
+        return False
+    return (
+        estado["sem_id"]
+        or estado["inicio_rollup"] is None
+        or estado["inicio_rollup"] > estado["inicio_bruto"]
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill do rollup diário de indicadores_risco")
+    parser.add_argument("--desde", type=date.fromisoformat, default=None, help="Reconstrói a partir desta data (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    print(backfill_risco_diario(args.desde))
@@ -4,9 +4,12 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 from ..base import execute_query
+from ..latest_cache import cache_ultimo_registro, invalidar_tabela
+from .risco_diario_helper import inserir_com_rollup
 
 logger = logging.getLogger(__name__)
 
+@cache_ultimo_registro("indicadores_risco")
 def get_dados_risco() -> Optional[Dict]:
     """Busca dados mais recentes do bloco risco"""
     try:
@@ -61,7 +64,8 @@ def insert_dados_risco_completo(
             supplied_asset_value, net_asset_value, alavancagem, liquidation_price, fonte, datetime.utcnow(),saldo_btc_core
         )
         
-        execute_query(query, params)
+        inserir_com_rollup(query, params)
+        invalidar_tabela("indicadores_risco")
         logger.info("✅ Dados risco completos inseridos com sucesso")
         return True
         
@@ -5,6 +5,7 @@ import json
 from datetime import datetime
 from typing import Dict, Optional
 from ..base import execute_query
+from ..latest_cache import cache_ultimo_registro, invalidar_tabela
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +99,7 @@ def insert_dados_tecnico_completo(dados: Dict) -> bool:
         )
         
         execute_query(query, params)
+        invalidar_tabela("indicadores_tecnico")
         logger.info("✅ Dados técnico completos com BBW inseridos com sucesso")
         return True
         
@@ -105,6 +107,7 @@ def insert_dados_tecnico_completo(dados: Dict) -> bool:
         logger.error(f"❌ Erro ao inserir dados técnico: {str(e)}")
         return False
 
+@cache_ultimo_registro("indicadores_tecnico")
 def get_dados_tecnico() -> Optional[Dict]:
     """
     Busca dados mais recentes do bloco técnico (ATUALIZADO para BBW)
@@ -148,6 +151,7 @@ def get_dados_tecnico() -> Optional[Dict]:
         logger.error(f"❌ Erro ao buscar dados do bloco técnico: {str(e)}")
         return None
 
+@cache_ultimo_registro("indicadores_tecnico")
 def get_emas_detalhadas() -> Optional[Dict]:
     """
     Busca EMAs detalhadas por timeframe (ATUALIZADO para incluir BBW)
@@ -281,6 +285,7 @@ def insert_dados_tecnico(sistema_emas: float, padroes: float, fonte: str = "Sist
         params = (sistema_emas, padroes, fonte, datetime.utcnow())
         
         execute_query(query, params)
+        invalidar_tabela("indicadores_tecnico")
         logger.info("✅ Dados técnico legados inseridos com sucesso")
         return True
         
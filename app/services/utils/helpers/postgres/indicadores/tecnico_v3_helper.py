@@ -5,6 +5,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro, invalidar_tabela
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ def insert_dados_tecnico(dados: Dict) -> bool:
         )
         
         execute_query(query, params)
+        invalidar_tabela("indicadores_tecnico")
         logger.info("✅ Dados técnico inseridos com sucesso")
         return True
         
@@ -39,6 +41,7 @@ def insert_dados_tecnico(dados: Dict) -> bool:
         logger.error(f"❌ Erro ao inserir dados técnico: {str(e)}")
         return False
 
+@cache_ultimo_registro("indicadores_tecnico")
 def get_dados_tecnico() -> Optional[Dict]:
     """Busca dados técnicos mais recentes"""
     try:
@@ -0,0 +1,184 @@
+# app/services/utils/helpers/postgres/latest_cache.py
+
+"""
+Cache em processo das consultas "último registro" (ORDER BY timestamp DESC LIMIT 1)
+
+- Leitura: @cache_ultimo_registro("tabela") memoriza o retorno da função
+  (resultado None não é memorizado - indica ausência de dado ou erro tratado).
+- Escrita: os helpers de insert chamam invalidar_tabela("tabela") após gravar.
+- Entre workers: com LATEST_CACHE_NOTIFY, a invalidação é propagada via
+  NOTIFY e cada processo mantém uma thread em LISTEN no mesmo canal.
+- LATEST_CACHE_TTL_SECONDS limita a defasagem para escritas feitas fora da API.
+- Tabelas gravadas direto pelo n8n (indicadores_ciclo, indicadores_momentum)
+  não passam por invalidar_tabela: suas leituras não usam o cache.
+"""
+
+import copy
+import functools
+import logging
+import os
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CANAL_NOTIFY = "btcturbo_latest_cache"
+
+_entradas: Dict[Tuple[str, tuple], Tuple[float, Any]] = {}
+_versoes: Dict[str, int] = {}
+_funcoes_por_tabela: Dict[str, set] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidacoes": 0, "notificacoes_recebidas": 0}
+
+_listener_thread = None
+_listener_parar = threading.Event()
+
+def cache_ultimo_registro(*tabelas: str) -> Callable:
+    """
+    Decorator read-through para funções que leem o último registro de `tabelas`
+
+    O retorno é copiado na entrega, então o chamador pode alterá-lo livremente.
+    """
+    def decorator(func: Callable) -> Callable:
+        nome = f"{func.__module__}.{func.__qualname__}"
+        for tabela in tabelas:
+            _funcoes_por_tabela.setdefault(tabela, set()).add(nome)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            settings = get_settings()
+            if not settings.LATEST_CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            chave = (nome, args + tuple(sorted(kwargs.items())))
+            agora = time.monotonic()
+            with _lock:
+                entrada = _entradas.get(chave)
+                if entrada is not None and agora - entrada[0] < settings.LATEST_CACHE_TTL_SECONDS:
+                    _stats["hits"] += 1
+                    return copy.deepcopy(entrada[1])
+                _stats["misses"] += 1
+                versoes = tuple(_versoes.get(tabela, 0) for tabela in tabelas)
+
+            resultado = func(*args, **kwargs)
+
+            if resultado is not None:
+                with _lock:
+                    # Insert concorrente durante a leitura: não memoriza valor possivelmente antigo
+                    if versoes == tuple(_versoes.get(tabela, 0) for tabela in tabelas):
+                        _entradas[chave] = (agora, copy.deepcopy(resultado))
+
+            return resultado
+
+        return wrapper
+    return decorator
+
+def invalidar_tabela(tabela: str, notificar: bool = True):
+    """
+    Descarta os últimos registros memorizados de `tabela`
+    Chamado pelos helpers de insert após gravar com sucesso
+    """
+    with _lock:
+        _invalidar_local(tabela)
+
+    if notificar and get_settings().LATEST_CACHE_NOTIFY:
+        _notificar(tabela)
+
+def limpar_cache():
+    """Descarta todo o cache de últimos registros"""
+    with _lock:
+        for tabela in list(_funcoes_por_tabela):
+            _invalidar_local(tabela)
+
+def get_latest_cache_stats() -> Dict:
+    """Métricas do cache (hits, misses, invalidações, entradas)"""
+    with _lock:
+        return {
+            **_stats,
+            "entradas": len(_entradas),
+            "listener_ativo": _listener_thread is not None and _listener_thread.is_alive()
+        }
+
+def _invalidar_local(tabela: str):
+    """Remove entradas das funções ligadas à tabela (lock já adquirido)"""
+    _versoes[tabela] = _versoes.get(tabela, 0) + 1
+    funcoes = _funcoes_por_tabela.get(tabela, set())
+    for chave in [c for c in _entradas if c[0] in funcoes]:
+        del _entradas[chave]
+    _stats["invalidacoes"] += 1
+
+def _notificar(tabela: str):
+    """Propaga a invalidação para os demais workers (payload tabela:pid)"""
+    try:
+        from .base import execute_query
+
+        execute_query("SELECT pg_notify(%s, %s)", (CANAL_NOTIFY, f"{tabela}:{os.getpid()}"), fetch_one=True)
+    except Exception as e:
+        logger.warning(f"⚠️ NOTIFY de invalidação falhou ({tabela}): {str(e)}")
+
+# ==========================================
+# LISTEN (coerência entre workers)
+# ==========================================
+
+def iniciar_listener():
+    """Inicia thread em LISTEN se LATEST_CACHE_NOTIFY estiver habilitado (startup)"""
+    global _listener_thread
+    settings = get_settings()
+    if not (settings.LATEST_CACHE_ENABLED and settings.LATEST_CACHE_NOTIFY):
+        return
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+
+    _listener_parar.clear()
+    _listener_thread = threading.Thread(target=_loop_listener, name="latest_cache_listener", daemon=True)
+    _listener_thread.start()
+
+def parar_listener():
+    """Sinaliza a thread de LISTEN para encerrar (shutdown)"""
+    _listener_parar.set()
+
+def _loop_listener():
+    from .base import get_db_connection
+
+    while not _listener_parar.is_set():
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CANAL_NOTIFY}")
+            logger.info(f"👂 Cache último registro: LISTEN {CANAL_NOTIFY}")
+
+            # Invalidações perdidas enquanto desconectado
+            limpar_cache()
+
+            while not _listener_parar.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _processar_notificacao(conn.notifies.pop(0).payload)
+
+        except Exception as e:
+            logger.warning(f"⚠️ Listener do cache desconectado: {str(e)}")
+            _listener_parar.wait(5.0)
+
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+def _processar_notificacao(payload: str):
+    tabela, _, pid = payload.rpartition(":")
+    if pid == str(os.getpid()):
+        return
+
+    with _lock:
+        _invalidar_local(tabela)
+        _stats["notificacoes_recebidas"] += 1
+    logger.debug(f"🔔 Cache último registro invalidado via NOTIFY: {tabela}")
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict
 from app.services.utils.helpers.postgres.base import execute_query
+from app.services.utils.helpers.postgres.latest_cache import cache_ultimo_registro
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,7 @@ def get_ciclo_mercado() -> dict:
         raise Exception(f"Falha na análise de mercado: {str(e)}")
 
 
+@cache_ultimo_registro("dash_mercado")
 def _get_scores_indicadores_mercado() -> dict:
     """
     Obtém último registro com JSON já formatado
@@ -0,0 +1,75 @@
+# app/services/utils/helpers/postgres/ohlc/bars_helper.py
+
+import logging
+from typing import Dict, List
+from app.services.utils.helpers.postgres.base import execute_query, execute_many
+
+logger = logging.getLogger(__name__)
+
+_tabela_verificada = False
+
+def get_barras_ohlc(symbol: str, exchange: str, intervalo: str, limit: int) -> List[Dict]:
+    """Busca as últimas `limit` barras armazenadas (ordem cronológica)"""
+    _create_table_if_not_exists()
+
+    query = """
+        SELECT datetime, open, high, low, close, volume
+        FROM (
+            SELECT datetime, open, high, low, close, volume
+            FROM ohlc_bars
+            WHERE symbol = %s AND exchange = %s AND intervalo = %s
+            ORDER BY datetime DESC
+            LIMIT %s
+        ) ultimas
+        ORDER BY datetime ASC
+    """
+
+    return execute_query(query, (symbol, exchange, intervalo, limit), fetch_all=True)
+
+def upsert_barras_ohlc(symbol: str, exchange: str, intervalo: str, barras: List[tuple]) -> int:
+    """
+    Insere/atualiza barras (datetime, open, high, low, close, volume)
+    Barra em formação é sobrescrita a cada sincronização
+    """
+    _create_table_if_not_exists()
+
+    query = """
+        INSERT INTO ohlc_bars (symbol, exchange, intervalo, datetime, open, high, low, close, volume)
+        VALUES %s
+        ON CONFLICT (symbol, exchange, intervalo, datetime) DO UPDATE SET
+            open = EXCLUDED.open,
+            high = EXCLUDED.high,
+            low = EXCLUDED.low,
+            close = EXCLUDED.close,
+            volume = EXCLUDED.volume
+    """
+
+    rows = [(symbol, exchange, intervalo, *barra) for barra in barras]
+    result = execute_many(query, rows)
+    logger.info(f"💾 {result['affected_rows']} barras {symbol} {intervalo} persistidas")
+    return result["affected_rows"]
+
+def _create_table_if_not_exists():
+    """Cria tabela de barras OHLC se não existir (uma vez por processo)"""
+    global _tabela_verificada
+    if _tabela_verificada:
+        return
+
+    query = """
+        CREATE TABLE IF NOT EXISTS ohlc_bars (
+            symbol VARCHAR(30) NOT NULL,
+            exchange VARCHAR(30) NOT NULL,
+            intervalo VARCHAR(5) NOT NULL,
+            datetime TIMESTAMP NOT NULL,
+            open DOUBLE PRECISION NOT NULL,
+            high DOUBLE PRECISION NOT NULL,
+            low DOUBLE PRECISION NOT NULL,
+            close DOUBLE PRECISION NOT NULL,
+            volume DOUBLE PRECISION,
+            PRIMARY KEY (symbol, exchange, intervalo, datetime)
+        )
+    """
+
+    execute_query(query)
+    _tabela_verificada = True
+    logger.info("✅ Tabela ohlc_bars verificada")
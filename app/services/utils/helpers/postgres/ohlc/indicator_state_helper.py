@@ -0,0 +1,71 @@
+# app/services/utils/helpers/postgres/ohlc/indicator_state_helper.py
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from psycopg2.extras import Json
+from app.services.utils.helpers.postgres.base import execute_query
+
+logger = logging.getLogger(__name__)
+
+_tabela_verificada = False
+
+def get_estado_indicador(symbol: str, exchange: str, intervalo: str, indicador: str, periodo: int,
+                         janela: int) -> Optional[Dict]:
+    """Busca o estado incremental persistido de um indicador (janela = n_bars da série)"""
+    _create_table_if_not_exists()
+
+    query = """
+        SELECT estado, origem, ultimo_ts, barras
+        FROM indicadores_estado
+        WHERE symbol = %s AND exchange = %s AND intervalo = %s
+          AND indicador = %s AND periodo = %s AND janela = %s
+    """
+
+    return execute_query(query, (symbol, exchange, intervalo, indicador, periodo, janela), fetch_one=True)
+
+def upsert_estado_indicador(symbol: str, exchange: str, intervalo: str, indicador: str, periodo: int, janela: int,
+                            estado: Dict, origem: datetime, ultimo_ts: datetime, barras: int):
+    """Grava o estado após consumir barras fechadas (uma linha por chave)"""
+    _create_table_if_not_exists()
+
+    query = """
+        INSERT INTO indicadores_estado
+            (symbol, exchange, intervalo, indicador, periodo, janela, estado, origem, ultimo_ts, barras, atualizado_em)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+        ON CONFLICT (symbol, exchange, intervalo, indicador, periodo, janela) DO UPDATE SET
+            estado = EXCLUDED.estado,
+            origem = EXCLUDED.origem,
+            ultimo_ts = EXCLUDED.ultimo_ts,
+            barras = EXCLUDED.barras,
+            atualizado_em = NOW()
+    """
+
+    execute_query(query, (symbol, exchange, intervalo, indicador, periodo, janela, Json(estado), origem, ultimo_ts, barras))
+
+def _create_table_if_not_exists():
+    """Cria tabela de estados de indicadores se não existir (uma vez por processo)"""
+    global _tabela_verificada
+    if _tabela_verificada:
+        return
+
+    query = """
+        CREATE TABLE IF NOT EXISTS indicadores_estado (
+            symbol VARCHAR(30) NOT NULL,
+            exchange VARCHAR(30) NOT NULL,
+            intervalo VARCHAR(5) NOT NULL,
+            indicador VARCHAR(10) NOT NULL,
+            periodo INTEGER NOT NULL,
+            janela INTEGER NOT NULL,
+            estado JSONB NOT NULL,
+            origem TIMESTAMP NOT NULL,
+            ultimo_ts TIMESTAMP NOT NULL,
+            barras INTEGER NOT NULL,
+            atualizado_em TIMESTAMP DEFAULT NOW(),
+            PRIMARY KEY (symbol, exchange, intervalo, indicador, periodo, janela)
+        );
+    """
+
+    execute_query(query)
+    _tabela_verificada = True
+    logger.info("✅ Tabela indicadores_estado verificada")
@@ -0,0 +1,223 @@
+# app/services/utils/helpers/postgres/pool.py
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from psycopg2 import OperationalError, InterfaceError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class PostgresPool:
+    """
+    Pool de conexões PostgreSQL compartilhado pelo processo (thread-safe)
+
+    - Checkout bloqueia até DB_POOL_TIMEOUT quando todas as conexões estão em uso
+    - Liveness checado no checkout (conexão fechada ou ociosa há muito tempo)
+    - Conexão quebrada é descartada; em failover as ociosas também são descartadas
+    """
+
+    def __init__(self, connect_fn: Callable, min_size: int, max_size: int,
+                 timeout: float, idle_check_seconds: float):
+        self._connect_fn = connect_fn
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.idle_check_seconds = idle_check_seconds
+
+        self._ociosas: List[Tuple[object, float]] = []
+        self._em_uso = 0
+        self._cond = threading.Condition()
+        self._metricas = {
+            "checkouts": 0,
+            "esperas_bloqueadas": 0,
+            "espera_total_ms": 0.0,
+            "espera_max_ms": 0.0,
+            "timeouts": 0,
+            "conexoes_criadas": 0,
+            "conexoes_descartadas": 0,
+            "falhas_liveness": 0,
+            "failovers": 0
+        }
+
+    def aquecer(self):
+        """Abre min_size conexões antecipadamente (falhas apenas logadas)"""
+        for _ in range(self.min_size):
+            try:
+                conn = self._nova_conexao()
+                with self._cond:
+                    self._ociosas.append((conn, time.monotonic()))
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao aquecer pool PostgreSQL: {str(e)}")
+                break
+
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão do pool e devolve ao final"""
+        conn = self._checkout()
+        descartar = False
+        try:
+            yield conn
+        except (OperationalError, InterfaceError):
+            descartar = True
+            if conn.closed:
+                # Servidor caiu/trocou: conexões ociosas apontam para o primário antigo
+                self.descartar_ociosas()
+            raise
+        finally:
+            self._checkin(conn, descartar)
+
+    def descartar_ociosas(self):
+        """Fecha todas as conexões ociosas (usado após failover)"""
+        with self._cond:
+            ociosas, self._ociosas = self._ociosas, []
+            self._metricas["failovers"] += 1
+        for conn, _ in ociosas:
+            self._fechar(conn)
+        if ociosas:
+            logger.warning(f"⚠️ Pool PostgreSQL: {len(ociosas)} conexões ociosas descartadas (failover)")
+
+    def get_stats(self) -> Dict:
+        """Retorna ocupação e métricas de espera do pool"""
+        with self._cond:
+            metricas = dict(self._metricas)
+            em_uso = self._em_uso
+            ociosas = len(self._ociosas)
+
+        checkouts = metricas["checkouts"]
+        return {
+            "min": self.min_size,
+            "max": self.max_size,
+            "em_uso": em_uso,
+            "ociosas": ociosas,
+            "total": em_uso + ociosas,
+            "ocupacao_percent": round(em_uso / self.max_size * 100, 1),
+            "espera_media_ms": round(metricas["espera_total_ms"] / checkouts, 2) if checkouts else 0.0,
+            "espera_max_ms": round(metricas["espera_max_ms"], 2),
+            **{k: v for k, v in metricas.items() if k not in ("espera_total_ms", "espera_max_ms")}
+        }
+
+    def _checkout(self):
+        inicio = time.monotonic()
+        conn, ultimo_uso = None, None
+        bloqueou = False
+
+        with self._cond:
+            while True:
+                if self._ociosas:
+                    conn, ultimo_uso = self._ociosas.pop()
+                    break
+                if self._em_uso + len(self._ociosas) < self.max_size:
+                    break
+
+                restante = self.timeout - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self._metricas["timeouts"] += 1
+                    raise Exception(
+                        f"Pool PostgreSQL esgotado: {self.max_size} conexões em uso após {self.timeout}s"
+                    )
+                bloqueou = True
+                self._cond.wait(restante)
+
+            self._em_uso += 1
+            espera_ms = (time.monotonic() - inicio) * 1000
+            self._metricas["checkouts"] += 1
+            self._metricas["espera_total_ms"] += espera_ms
+            self._metricas["espera_max_ms"] = max(self._metricas["espera_max_ms"], espera_ms)
+            if bloqueou:
+                self._metricas["esperas_bloqueadas"] += 1
+
+        try:
+            if conn is not None and not self._conexao_viva(conn, ultimo_uso):
+                self._fechar(conn)
+                conn = None
+            if conn is None:
+                conn = self._nova_conexao()
+            return conn
+        except Exception:
+            with self._cond:
+                self._em_uso -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, conn, descartar: bool = False):
+        if not descartar and not conn.closed:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                descartar = True
+
+        with self._cond:
+            self._em_uso -= 1
+            if not descartar and not conn.closed:
+                self._ociosas.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if descartar or conn.closed:
+            self._fechar(conn)
+
+    def _conexao_viva(self, conn, ultimo_uso: Optional[float]) -> bool:
+        """Liveness no checkout: só faz round trip se a conexão ficou ociosa muito tempo"""
+        if conn.closed:
+            self._registrar("falhas_liveness")
+            return False
+        if ultimo_uso is None or time.monotonic() - ultimo_uso < self.idle_check_seconds:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Conexão ociosa inválida, reconectando: {str(e)}")
+            self._registrar("falhas_liveness")
+            return False
+
+    def _nova_conexao(self):
+        conn = self._connect_fn()
+        # Cada execute_query é uma única instrução: autocommit evita BEGIN/COMMIT extras
+        conn.autocommit = True
+        self._registrar("conexoes_criadas")
+        return conn
+
+    def _fechar(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._registrar("conexoes_descartadas")
+
+    def _registrar(self, metrica: str):
+        with self._cond:
+            self._metricas[metrica] += 1
+
+_pool: Optional[PostgresPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool(connect_fn: Callable) -> PostgresPool:
+    """Retorna o pool do processo, criando-o na primeira chamada"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                pool = PostgresPool(
+                    connect_fn=connect_fn,
+                    min_size=settings.DB_POOL_MIN,
+                    max_size=settings.DB_POOL_MAX,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    idle_check_seconds=settings.DB_POOL_IDLE_CHECK_SECONDS
+                )
+                pool.aquecer()
+                logger.info(f"🚀 Pool PostgreSQL criado (min={pool.min_size}, max={pool.max_size})")
+                _pool = pool
+    return _pool
+
+def get_pool_stats() -> Dict:
+    """Métricas do pool (vazio se ainda não foi criado)"""
+    if _pool is None:
+        return {"status": "nao_inicializado"}
+    return _pool.get_stats()
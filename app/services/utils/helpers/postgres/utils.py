@@ -4,6 +4,8 @@ import logging
 from datetime import datetime
 from typing import Dict
 from .base import execute_query
+from .pool import get_pool_stats
+from .latest_cache import get_latest_cache_stats
 from .indicadores.ciclo_helper import get_dados_ciclo
 from .indicadores.momentum_helper import get_dados_momentum
 from .indicadores.risco_helper import get_dados_risco
@@ -44,7 +46,9 @@ def check_database_health() -> Dict:
         return {
             "timestamp": datetime.utcnow().isoformat(),
             "database_status": "CONECTADO",
-            "blocos": health_status
+            "blocos": health_status,
+            "pool": get_pool_stats(),
+            "latest_cache": get_latest_cache_stats()
         }
         
     except Exception as e:
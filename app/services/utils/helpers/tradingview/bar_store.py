@@ -0,0 +1,163 @@
+# app/services/utils/helpers/tradingview/bar_store.py
+
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+import pandas as pd
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Duração de cada Interval do tvDatafeed (Interval.value -> segundos)
+INTERVALO_SEGUNDOS = {
+    "1": 60, "3": 180, "5": 300, "15": 900, "30": 1800, "45": 2700,
+    "1H": 3600, "2H": 7200, "3H": 10800, "4H": 14400,
+    "1D": 86400, "1W": 604800, "1M": 31 * 86400
+}
+
+COLUNAS_OHLCV = ["open", "high", "low", "close", "volume"]
+
+class _SerieBarras:
+    """Série OHLC em memória de uma chave (symbol, exchange, intervalo)"""
+
+    def __init__(self):
+        self.df: Optional[pd.DataFrame] = None
+        self.ultima_sync: float = 0.0
+        self.esgotado = False  # vendor devolveu menos barras que o pedido: não há histórico mais antigo
+        self.lock = threading.Lock()
+
+_series: Dict[Tuple[str, str, str], _SerieBarras] = {}
+_series_lock = threading.Lock()
+
+def obter_barras(symbol: str, exchange: str, interval, n_bars: int,
+                 fetch_fn: Callable[[int], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Retorna as últimas n_bars barras usando o bar store (memória + Postgres)
+
+    Args:
+        interval: Interval do tvDatafeed
+        fetch_fn: função que baixa as últimas N barras do TradingView
+
+    Só baixa as barras que faltam desde o último candle armazenado;
+    a barra em formação é sempre rebaixada.
+    """
+    settings = get_settings()
+    if not settings.OHLC_CACHE_ENABLED:
+        return fetch_fn(n_bars)
+
+    intervalo = _intervalo_str(interval)
+    serie = _get_serie(symbol, exchange, intervalo)
+
+    with serie.lock:
+        if serie.df is None:
+            serie.df = _carregar_do_banco(symbol, exchange, intervalo, n_bars)
+
+        # Histórico esgotado: a série completa já está em memória, não rebaixar tudo
+        alvo = min(n_bars, len(serie.df)) if serie.esgotado and serie.df is not None else n_bars
+
+        idade = time.monotonic() - serie.ultima_sync
+        if serie.df is not None and len(serie.df) >= alvo and idade < settings.OHLC_CACHE_REFRESH_SECONDS:
+            logger.info(f"⚡ Bar store: {symbol} {intervalo} ({n_bars} barras) servido da memória")
+            return serie.df.tail(n_bars).copy()
+
+        faltantes = _calcular_barras_faltantes(serie.df, intervalo, alvo)
+        logger.info(f"🔄 Bar store: baixando {faltantes} barras {symbol} {intervalo}")
+
+        novos = fetch_fn(faltantes)
+        if novos is None or novos.empty:
+            raise Exception(f"TradingView retornou dados vazios para {symbol}")
+        if len(novos) < faltantes:
+            serie.esgotado = True
+
+        serie.df = _mesclar(serie.df, novos, max(n_bars, settings.OHLC_CACHE_MAX_BARS))
+        serie.ultima_sync = time.monotonic()
+        _persistir(symbol, exchange, intervalo, novos)
+
+        return serie.df.tail(n_bars).copy()
+
+def registrar_barras(symbol: str, exchange: str, interval, novos: pd.DataFrame):
+    """
+    Barras fechadas vindas de fora do TradingView (ex.: candles do price_stream)
+
+    Mescla na série em memória, se já carregada, e persiste; a próxima leitura
+    só baixa o gap desde a última barra registrada.
+    """
+    intervalo = _intervalo_str(interval)
+    serie = _get_serie(symbol, exchange, intervalo)
+
+    with serie.lock:
+        if serie.df is not None:
+            serie.df = _mesclar(serie.df, novos, get_settings().OHLC_CACHE_MAX_BARS)
+    _persistir(symbol, exchange, intervalo, novos)
+
+def limpar_bar_store():
+    """Descarta séries em memória (próxima leitura recarrega do banco)"""
+    with _series_lock:
+        _series.clear()
+
+def _get_serie(symbol: str, exchange: str, intervalo: str) -> _SerieBarras:
+    chave = (symbol, exchange, intervalo)
+    with _series_lock:
+        if chave not in _series:
+            _series[chave] = _SerieBarras()
+        return _series[chave]
+
+def _intervalo_str(interval) -> str:
+    return interval.value if hasattr(interval, "value") else str(interval)
+
+def _calcular_barras_faltantes(df: Optional[pd.DataFrame], intervalo: str, n_bars: int) -> int:
+    """Barras a baixar: histórico completo se insuficiente, senão só o gap + barra em formação"""
+    if df is None or len(df) < n_bars:
+        return n_bars
+
+    segundos = INTERVALO_SEGUNDOS.get(intervalo)
+    if segundos is None:
+        return n_bars
+
+    # Índice do tvDatafeed usa horário local sem timezone
+    decorrido = (pd.Timestamp.now() - df.index[-1]).total_seconds()
+    faltantes = max(0, math.ceil(decorrido / segundos)) + 2
+
+    return min(faltantes, n_bars)
+
+def _mesclar(atual: Optional[pd.DataFrame], novos: pd.DataFrame, max_barras: int) -> pd.DataFrame:
+    """Junta barras novas às armazenadas (novas prevalecem) e limita o tamanho"""
+    if atual is None or atual.empty:
+        df = novos
+    else:
+        df = pd.concat([atual, novos])
+        df = df[~df.index.duplicated(keep="last")]
+
+    return df.sort_index().tail(max_barras)
+
+def _carregar_do_banco(symbol: str, exchange: str, intervalo: str, n_bars: int) -> Optional[pd.DataFrame]:
+    try:
+        from app.services.utils.helpers.postgres.ohlc.bars_helper import get_barras_ohlc
+
+        rows = get_barras_ohlc(symbol, exchange, intervalo, n_bars)
+        if not rows:
+            return None
+
+        df = pd.DataFrame(rows).set_index("datetime")
+        df.insert(0, "symbol", f"{exchange}:{symbol}")
+        logger.info(f"💾 Bar store: {len(df)} barras {symbol} {intervalo} carregadas do banco")
+        return df
+
+    except Exception as e:
+        logger.warning(f"⚠️ Bar store sem persistência ({symbol} {intervalo}): {str(e)}")
+        return None
+
+def _persistir(symbol: str, exchange: str, intervalo: str, novos: pd.DataFrame):
+    try:
+        from app.services.utils.helpers.postgres.ohlc.bars_helper import upsert_barras_ohlc
+
+        barras = [
+            (ts.to_pydatetime(), *(float(v) for v in valores))
+            for ts, valores in zip(novos.index, novos[COLUNAS_OHLCV].itertuples(index=False))
+        ]
+        upsert_barras_ohlc(symbol, exchange, intervalo, barras)
+
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao persistir barras {symbol} {intervalo}: {str(e)}")
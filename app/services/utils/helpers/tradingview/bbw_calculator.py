@@ -4,6 +4,7 @@ import logging
 import pandas as pd
 import numpy as np
 from typing import Tuple, Optional
+from app.services.utils.helpers.tradingview import indicator_engine
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +24,9 @@ def calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: floa
         if len(prices) < period:
             raise ValueError(f"Dados insuficientes: {len(prices)} < {period}")
         
-        # Média móvel simples (middle band)
-        sma = prices.rolling(window=period).mean()
-        middle_band = float(sma.iloc[-1])
-        
-        # Desvio padrão
-        std = prices.rolling(window=period).std()
-        std_current = float(std.iloc[-1])
-        
-        # Bandas superior e inferior
-        upper_band = middle_band + (std_dev * std_current)
-        lower_band = middle_band - (std_dev * std_current)
+        # SMA (middle) ± std_dev * desvio padrão - última barra
+        upper, middle, lower = indicator_engine.bollinger(prices.to_numpy(dtype=float), period, std_dev)
+        upper_band, lower_band, middle_band = float(upper[-1]), float(lower[-1]), float(middle[-1])
         
         logger.info(f"✅ Bollinger Bands: Upper={upper_band:.2f}, Middle={middle_band:.2f}, Lower={lower_band:.2f}")
         
@@ -0,0 +1,105 @@
+# app/services/utils/helpers/tradingview/candle_cache.py
+
+"""
+Cache de indicadores por fechamento de candle
+
+Indicadores calculados só com barras fechadas não mudam até a próxima
+barra fechar. @cache_por_candle memoriza o resultado por
+(função, symbol, exchange, intervalo, última barra fechada, parâmetros):
+
+- a última barra fechada vem do relógio (fronteiras do resampler), então
+  o acerto não baixa barras nem recalcula nada;
+- a função decorada devolve (resultado, última barra usada, última barra
+  recebida); só memoriza quando a última usada é a fechada e os dados já
+  trazem uma barra posterior a ela (baixados depois do fechamento: uma
+  série sincronizada segundos antes da virada ainda tem a barra fechada
+  parcial). Caso contrário devolve sem memorizar (nova tentativa na
+  próxima chamada);
+- incluir_formacao=True (visões intrabar) ignora o cache: a função recebe
+  o flag e calcula com a barra em formação.
+"""
+
+import copy
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+from app.config import get_settings
+from app.services.utils.helpers.tradingview.bar_store import _intervalo_str
+from app.services.utils.helpers.tradingview.resampler import inicio_barra
+
+logger = logging.getLogger(__name__)
+
+_entradas: "OrderedDict[tuple, Any]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "intrabar": 0, "nao_memorizados": 0}
+
+def ultima_barra_fechada(interval, agora: Optional[datetime] = None) -> datetime:
+    """Início da última barra fechada do intervalo, no horário local ingênuo do tvDatafeed"""
+    intervalo = _intervalo_str(interval)
+    agora_utc = pd.Timestamp(agora or datetime.utcnow())
+    em_formacao = inicio_barra(intervalo, agora_utc)
+    fechada = inicio_barra(intervalo, em_formacao - pd.Timedelta(microseconds=1))
+    return datetime.fromtimestamp(fechada.value // 10**9)
+
+def barras_fechadas(df: pd.DataFrame, interval, agora: Optional[datetime] = None) -> pd.DataFrame:
+    """Remove a barra em formação (e qualquer barra posterior à última fechada)"""
+    return df[df.index <= pd.Timestamp(ultima_barra_fechada(interval, agora))]
+
+def cache_por_candle(func: Callable) -> Callable:
+    """
+    Decorator para funções f(symbol, exchange, interval, *params, incluir_formacao=False)
+    que devolvem (resultado, datetime da última barra usada, datetime da última barra recebida)
+
+    O wrapper devolve só o resultado (cópia, o chamador pode alterá-lo).
+    """
+    nome = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(symbol: str, exchange: str, interval, *args, incluir_formacao: bool = False, **kwargs):
+        settings = get_settings()
+        if incluir_formacao or not settings.CANDLE_CACHE_ENABLED:
+            with _lock:
+                _stats["intrabar"] += 1
+            return func(symbol, exchange, interval, *args, incluir_formacao=incluir_formacao, **kwargs)[0]
+
+        fechada = ultima_barra_fechada(interval)
+        chave = (nome, symbol, exchange, _intervalo_str(interval), fechada, args, tuple(sorted(kwargs.items())))
+
+        with _lock:
+            if chave in _entradas:
+                _entradas.move_to_end(chave)
+                _stats["hits"] += 1
+                return copy.deepcopy(_entradas[chave])
+            _stats["misses"] += 1
+
+        resultado, ultima_usada, ultima_recebida = func(symbol, exchange, interval, *args, incluir_formacao=False, **kwargs)
+
+        if pd.Timestamp(ultima_usada) != pd.Timestamp(fechada) or pd.Timestamp(ultima_recebida) <= pd.Timestamp(fechada):
+            logger.warning(
+                f"⚠️ {symbol} {_intervalo_str(interval)}: última barra {ultima_usada} (recebida até {ultima_recebida}) "
+                f"sem confirmação do fechamento de {fechada} - resultado não memorizado"
+            )
+            with _lock:
+                _stats["nao_memorizados"] += 1
+            return resultado
+
+        with _lock:
+            _entradas[chave] = copy.deepcopy(resultado)
+            while len(_entradas) > settings.CANDLE_CACHE_MAX_ENTRIES:
+                _entradas.popitem(last=False)
+        logger.info(f"🕯️ {symbol} {_intervalo_str(interval)}: resultado memorizado até o fechamento após {fechada}")
+        return resultado
+
+    return wrapper
+
+def limpar_candle_cache():
+    with _lock:
+        _entradas.clear()
+
+def get_candle_cache_stats() -> Dict:
+    with _lock:
+        return {**_stats, "entradas": len(_entradas)}
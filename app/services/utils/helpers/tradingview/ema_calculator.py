@@ -1,12 +1,18 @@
 # app/services/utils/helpers/ema_calculator.py
 
+import functools
 import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Dict, Tuple, Optional
-from tvDatafeed import TvDatafeed, Interval
+from tvDatafeed import Interval
 from app.config import get_settings
+from app.services.utils.helpers.executor_helper import executar_em_paralelo
+from app.services.utils.helpers.tradingview.resampler import buscar_barras
+from app.services.utils.helpers.tradingview.candle_cache import cache_por_candle, barras_fechadas
+from app.services.utils.helpers.tradingview import indicator_engine
+from app.services.utils.helpers.tradingview.tradingview_helper import calculate_ema_atual
 
 logger = logging.getLogger(__name__)
 
@@ -14,40 +20,15 @@ class EMACalculator:
     def __init__(self):
         """Inicializa calculadora EMAs com configurações"""
         self.settings = get_settings()
-        self.tv = None
         self.ema_periods = [10, 20, 50, 100, 200]
-        
-    def get_tv_session(self) -> TvDatafeed:
-        """Obtém sessão TradingView reutilizável"""
-        if self.tv is None:
-            try:
-                logger.info("🔗 Conectando TradingView...")
-                self.tv = TvDatafeed(
-                    username=self.settings.TV_USERNAME,
-                    password=self.settings.TV_PASSWORD
-                )
-                logger.info("✅ TradingView conectado")
-            except Exception as e:
-                logger.error(f"❌ Erro TradingView: {str(e)}")
-                # Fallback sem login
-                self.tv = TvDatafeed()
-                logger.warning("⚠️ TradingView sem login - dados limitados")
-        return self.tv
     
     def fetch_ohlc_data(self, symbol: str = "BTCUSDT", exchange: str = "BINANCE", 
                        interval: Interval = Interval.in_weekly, n_bars: int = 1000) -> Optional[pd.DataFrame]:
         """Busca dados OHLC do TradingView"""
         try:
-            tv = self.get_tv_session()
-            
             logger.info(f"📊 Buscando dados {symbol} {exchange} {interval} ({n_bars} barras)")
             
-            df = tv.get_hist(
-                symbol=symbol,
-                exchange=exchange,
-                interval=interval,
-                n_bars=n_bars
-            )
+            df = buscar_barras(symbol, exchange, interval, n_bars)
             
             if df is None or df.empty:
                 raise Exception("DataFrame vazio ou None")
@@ -59,8 +40,11 @@ class EMACalculator:
             logger.error(f"❌ Erro ao buscar dados: {str(e)}")
             return None
     
-    def calculate_emas(self, df: pd.DataFrame) -> Dict[int, float]:
-        """Calcula EMAs para todos os períodos"""
+    def calculate_emas(self, df: pd.DataFrame, chave: Optional[Tuple] = None) -> Dict[int, float]:
+        """
+        Calcula EMAs para todos os períodos
+        Com chave (symbol, exchange, interval) usa o estado incremental por período
+        """
         try:
             if df is None or df.empty:
                 df = Interval.in_daily
@@ -68,10 +52,15 @@ class EMACalculator:
             emas = {}
             current_price = float(df['close'].iloc[-1])
             
-            for period in self.ema_periods:
-                # Calcular EMA usando pandas
-                ema_series = df['close'].ewm(span=period, adjust=False).mean()
-                ema_value = float(ema_series.iloc[-1])
+            if chave is not None and self.settings.INDICATOR_STATE_ENABLED:
+                # Só as barras fechadas desde a última chamada (O(1) por barra)
+                ultimos = [calculate_ema_atual(df['close'], period, chave=chave) for period in self.ema_periods]
+            else:
+                # Todas EMAs numa única passada vetorizada
+                ema_matrix = indicator_engine.ema_multi(df['close'].to_numpy(dtype=float), self.ema_periods)
+                ultimos = [float(ema_series[-1]) for ema_series in ema_matrix]
+            
+            for period, ema_value in zip(self.ema_periods, ultimos):
                 emas[period] = round(ema_value, 2)
                 
                 logger.debug(f"EMA{period}: {ema_value:.2f}")
@@ -188,8 +177,34 @@ class EMACalculator:
             logger.error(f"❌ Erro score posição: {str(e)}")
             return 0.0, {}
     
-    def calculate_timeframe_scores(self, timeframe: str) -> Dict:
-        """Calcula scores completos para um timeframe"""
+    def _preco_atual(self, interval, close_memorizado: float) -> float:
+        """
+        Preço para o score sobre EMAs memorizadas: get_btc_price; com as fontes
+        fora, o close da barra em formação no bar store (o close memorizado
+        junto às EMAs pode ser de dias atrás)
+        """
+        from app.services.utils.helpers.tradingview.price_helper import get_btc_price
+
+        try:
+            return get_btc_price()
+        except Exception as e:
+            logger.warning(f"⚠️ Preço BTC indisponível ({str(e)}), usando último close recebido")
+
+        try:
+            return float(buscar_barras("BTCUSDT", "BINANCE", interval, 2)['close'].iloc[-1])
+        except Exception as e:
+            logger.warning(f"⚠️ Bar store indisponível ({str(e)}), usando close memorizado com as EMAs")
+            return close_memorizado
+
+    def calculate_timeframe_scores(self, timeframe: str, incluir_formacao: bool = False) -> Dict:
+        """
+        Calcula scores completos para um timeframe
+        
+        1W: EMAs das barras fechadas memorizadas até o próximo fechamento semanal
+        (preço atual via get_btc_price; se as fontes falharem, último close
+        recebido do TradingView); incluir_formacao=True recalcula com a barra
+        em formação (visão intrabar)
+        """
         try:
             logger.info(f"🎯 Calculando scores {timeframe}...")
             
@@ -197,13 +212,21 @@ class EMACalculator:
             interval = Interval.in_weekly if timeframe == "1W" else Interval.in_daily
             n_bars = 700 if timeframe == "1W" else 700  # Suficiente para EMA 610
             
-            # Buscar dados
-            df = self.fetch_ohlc_data(interval=interval, n_bars=n_bars)
-            if df is None:
-                raise Exception(f"Dados {timeframe} indisponíveis")
-            
-            # Calcular EMAs
-            emas, current_price = self.calculate_emas(df)
+            if timeframe == "1W" and self.settings.CANDLE_CACHE_ENABLED:
+                emas, current_price = calcular_emas_candle(
+                    "BTCUSDT", "BINANCE", interval, tuple(self.ema_periods), n_bars,
+                    incluir_formacao=incluir_formacao
+                )
+                if not incluir_formacao:
+                    current_price = self._preco_atual(interval, current_price)
+            else:
+                # Buscar dados
+                df = self.fetch_ohlc_data(interval=interval, n_bars=n_bars)
+                if df is None:
+                    raise Exception(f"Dados {timeframe} indisponíveis")
+                
+                # Calcular EMAs
+                emas, current_price = self.calculate_emas(df, chave=("BTCUSDT", "BINANCE", interval))
             if not emas:
                 raise Exception(f"EMAs {timeframe} não calculadas")
             
@@ -268,27 +291,65 @@ class EMACalculator:
             logger.error(f"❌ Erro score ponderado: {str(e)}")
             return {"error": str(e)}
 
-def get_complete_ema_analysis() -> Dict:
+@cache_por_candle
+def calcular_emas_candle(symbol: str, exchange: str, interval, periodos: Tuple[int, ...], n_bars: int,
+                         incluir_formacao: bool = False):
+    """
+    EMAs da última barra numa passada vetorizada (memorizadas por candle fechado)
+    
+    Returns:
+        ((emas, close da última barra recebida), última barra usada, última barra recebida)
+    """
+    recebido = buscar_barras(symbol, exchange, interval, n_bars + 1)
+    if recebido is None or recebido.empty:
+        raise Exception(f"Dados {symbol} {interval} indisponíveis")
+    df = recebido if incluir_formacao else barras_fechadas(recebido, interval)
+    
+    ema_matrix = indicator_engine.ema_multi(df['close'].to_numpy(dtype=float), list(periodos))
+    emas = {period: round(float(serie[-1]), 2) for period, serie in zip(periodos, ema_matrix)}
+    return (emas, float(recebido['close'].iloc[-1])), df.index[-1].to_pydatetime(), recebido.index[-1].to_pydatetime()
+
+def get_complete_ema_analysis(timeframes: Tuple[str, ...] = ("1W", "1D"), incluir_formacao: bool = False) -> Dict:
     """
     Função principal - retorna análise completa EMAs
+    
+    Timeframes calculados em paralelo (wall time = timeframe mais lento),
+    cada um com timeout próprio (TV_TIMEFRAME_TIMEOUT_SECONDS).
+    Falha/timeout de um timeframe não descarta os demais (resultado_parcial).
+    
+    Args:
+        timeframes: Timeframes a calcular ("1W", "1D")
+        incluir_formacao: 1W com a barra semanal em formação (sem cache por candle)
     """
     try:
-        logger.info("🚀 Iniciando análise completa EMAs...")
+        logger.info(f"🚀 Iniciando análise completa EMAs {list(timeframes)}...")
         
-        calculator = EMACalculator()
+        resultados, tempos_ms = _calcular_timeframes_paralelo(timeframes, incluir_formacao)
         
-        # Calcular para ambos timeframes
-        weekly_data = calculator.calculate_timeframe_scores("1W")
-        daily_data = calculator.calculate_timeframe_scores("1D")
+        weekly_data = resultados.get("1W", {"timeframe": "1W", "status": "skipped"})
+        daily_data = resultados.get("1D", {"timeframe": "1D", "status": "skipped"})
         
-        # Score final ponderado
-        final_weighted = calculator.calculate_final_weighted_score(weekly_data, daily_data)
+        falhas = {
+            tf: dados.get("error") for tf, dados in resultados.items()
+            if dados.get("status") != "success"
+        }
+        if len(falhas) == len(timeframes):
+            raise Exception(f"Todos timeframes falharam: {falhas}")
+        
+        # Score final ponderado (só faz sentido com ambos timeframes)
+        if "1W" in resultados and "1D" in resultados:
+            final_weighted = EMACalculator().calculate_final_weighted_score(weekly_data, daily_data)
+        else:
+            final_weighted = {"error": "Ponderação requer timeframes 1W e 1D"}
         
         return {
             "timestamp": datetime.utcnow().isoformat(),
             "weekly": weekly_data,
             "daily": daily_data,
             "final_weighted": final_weighted,
+            "resultado_parcial": bool(falhas),
+            "falhas": falhas,
+            "tempos_ms": tempos_ms,
             "status": "success"
         }
         
@@ -299,73 +360,62 @@ def get_complete_ema_analysis() -> Dict:
             "status": "error",
             "error": str(e)
         }
+
+def _calcular_timeframes_paralelo(timeframes: Tuple[str, ...], incluir_formacao: bool = False) -> Tuple[Dict[str, Dict], Dict[str, float]]:
+    """
+    Executa calculate_timeframe_scores de cada timeframe numa thread
+    
+    Downloads simultâneos usam sessões distintas do pool TradingView
+    (TvDatafeed guarda o websocket na instância).
+    """
+    resultados, erros, tempos_ms = executar_em_paralelo(
+        {tf: functools.partial(EMACalculator().calculate_timeframe_scores, tf, incluir_formacao) for tf in timeframes},
+        get_settings().TV_TIMEFRAME_TIMEOUT_SECONDS, prefixo="ema_tf"
+    )
+    for tf, erro in erros.items():
+        resultados[tf] = {"timeframe": tf, "status": "error", "error": erro}
+
+    logger.info(f"⏱️ Timeframes EMA: {tempos_ms}")
+    return resultados, tempos_ms
     
-def detect_ema_crossover(lookback_hours: int = 24) -> Dict:
+def detect_ema_crossover(lookback_hours: int = 24, snapshot=None) -> Dict:
     """
     Detecta cruzamentos EMA17/EMA34 nas últimas 24h (timeframe 4H)
     
     Args:
         lookback_hours: Horas para verificar cruzamento (padrão: 24h)
+        snapshot: MarketSnapshot compartilhado (evita nova busca 4H)
     
     Returns:
         Dict com informações do cruzamento
     """
     try:
-        from tvDatafeed import Interval
+        from app.services.utils.helpers.tradingview.market_snapshot import MarketSnapshot
         
         logger.info(f"🔍 Detectando cruzamentos EMA17/EMA34 nas últimas {lookback_hours}h...")
         
         # Calcular quantos períodos 4H verificar
         lookback_periods = lookback_hours // 4  # 24h = 6 períodos 4H
         
-        # Buscar dados 4H (precisamos de mais barras para calcular EMAs)
-        df = fetch_ohlc_data(
-            symbol="BTCUSDT",
-            exchange="BINANCE", 
-            interval=Interval.in_4_hour,
-            n_bars=200  # Suficiente para EMA34
-        )
+        if snapshot is None:
+            snapshot = MarketSnapshot()
+        
+        # Dados 4H (200 barras, suficiente para EMA34)
+        df = snapshot.ohlc(Interval.in_4_hour, 200)
         
         if df is None or len(df) < 50:
             raise Exception("Dados insuficientes para análise")
         
-        # Calcular EMAs
-        ema_17 = df['close'].ewm(span=17, adjust=False).mean()
-        ema_34 = df['close'].ewm(span=34, adjust=False).mean()
-        
-        # Verificar cruzamentos nos últimos períodos
-        golden_cross_detected = False
-        death_cross_detected = False
-        hours_ago = None
-        
-        for i in range(1, min(lookback_periods + 1, len(df))):
-            current_idx = -i
-            previous_idx = -(i + 1)
-            
-            # Valores atuais e anteriores
-            ema17_current = ema_17.iloc[current_idx]
-            ema34_current = ema_34.iloc[current_idx]
-            ema17_previous = ema_17.iloc[previous_idx]
-            ema34_previous = ema_34.iloc[previous_idx]
-            
-            # Detectar GOLDEN CROSS (EMA17 cruza para cima da EMA34)
-            if (ema17_previous <= ema34_previous and ema17_current > ema34_current):
-                golden_cross_detected = True
-                hours_ago = i * 4
-                logger.info(f"✅ GOLDEN CROSS detectado há {hours_ago}h")
-                break
-                
-            # Detectar DEATH CROSS (EMA17 cruza para baixo da EMA34)
-            if (ema17_previous >= ema34_previous and ema17_current < ema34_current):
-                death_cross_detected = True
-                hours_ago = i * 4
-                logger.info(f"🔴 DEATH CROSS detectado há {hours_ago}h")
-                break
+        # Cruzamentos nos últimos períodos (EMAs memorizadas no snapshot)
+        cruzamento = snapshot.cruzamento(Interval.in_4_hour, 17, 34, n_bars=200, lookback=lookback_periods)
+        golden_cross_detected = cruzamento["golden_cross"]
+        death_cross_detected = cruzamento["death_cross"]
+        hours_ago = cruzamento["barras_atras"] * 4 if cruzamento["barras_atras"] else None
         
-        # Status atual das EMAs
-        ema17_now = float(ema_17.iloc[-1])
-        ema34_now = float(ema_34.iloc[-1])
-        current_alignment = "bullish" if ema17_now > ema34_now else "bearish"
+        # Status atual das EMAs: mesmas séries da janela usadas no cruzamento
+        ema17_now = float(snapshot.ema(Interval.in_4_hour, 17, 200).iloc[-1])
+        ema34_now = float(snapshot.ema(Interval.in_4_hour, 34, 200).iloc[-1])
+        current_alignment = cruzamento["alinhamento"]
         
         result = {
             "golden_cross": golden_cross_detected,
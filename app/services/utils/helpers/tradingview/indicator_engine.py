@@ -0,0 +1,190 @@
+# app/services/utils/helpers/tradingview/indicator_engine.py
+
+"""
+Motor de indicadores vetorizado (NumPy)
+
+Kernels operam sobre arrays float64 contíguos, sem loop Python por barra.
+Resultados equivalentes às versões pandas usadas antes:
+- ewm(adjust=False)            -> ewm / ema_multi / rma
+- RSI Wilder (ewm alpha=1/n)   -> rsi_wilder
+- rolling(window).mean/std     -> rolling_mean / rolling_std
+Entradas devem estar validadas (sem NaN), como já garante fetch_ohlc_data.
+"""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+# Maior expoente usado no bloco: d^-k fica <= 1e150 (sem overflow no cumsum)
+_LOG_LIMITE = np.log(1e150)
+
+def ewm(valores: np.ndarray, alphas: Sequence[float]) -> np.ndarray:
+    """
+    Média exponencial (adjust=False) para vários alphas numa única passada
+
+    y[t] = a * x[t] + (1 - a) * y[t-1], com y[0] = x[0]
+
+    Resolve a recorrência em blocos: dentro do bloco
+    y[i] = a * d^i * (cumsum(d^-k * x[k]) + y_ant * d / a),
+    com o tamanho do bloco limitado para d^-k não estourar float64.
+
+    Args:
+        valores: array (n,) ou (m, n) - uma série por alpha
+        alphas: m fatores de suavização em (0, 1]
+
+    Returns:
+        np.ndarray (m, n)
+    """
+    x = np.ascontiguousarray(valores, dtype=np.float64)
+    a = np.asarray(alphas, dtype=np.float64).reshape(-1, 1)
+    n = x.shape[-1]
+    saida = np.empty((a.shape[0], n))
+    if n == 0:
+        return saida
+
+    # alpha == 1: média é a própria série
+    identidade = a[:, 0] >= 1.0
+    if identidade.any():
+        saida[identidade] = np.broadcast_to(x, (a.shape[0], n))[identidade]
+        if identidade.all():
+            return saida
+
+    linhas = ~identidade
+    a = a[linhas]
+    x_linhas = x[linhas] if x.ndim == 2 else x
+    log_d = np.log1p(-a)
+
+    bloco = int(max(1, min(n, _LOG_LIMITE // -log_d.min())))
+    k = np.arange(bloco)
+    pot_inv = np.exp(-log_d * k)
+    pot_a = a * np.exp(log_d * k)
+    fator_anterior = (1.0 - a[:, 0]) / a[:, 0]
+
+    # y_ant entra como termo inicial do cumsum: a*d^i*(S_i + y_ant*d/a)
+    anterior = np.broadcast_to(x_linhas[..., 0], (a.shape[0],))
+    resultado = np.empty((a.shape[0], n))
+    buffer = np.empty((a.shape[0], bloco))
+    for inicio in range(0, n, bloco):
+        seg = x_linhas[..., inicio:inicio + bloco]
+        tam = seg.shape[-1]
+        y = buffer[:, :tam] if tam < bloco else buffer
+        np.multiply(pot_inv[:, :tam], seg, out=y)
+        y[:, 0] += anterior * fator_anterior
+        np.cumsum(y, axis=1, out=y)
+        y *= pot_a[:, :tam]
+        resultado[:, inicio:inicio + tam] = y
+        anterior = resultado[:, inicio + tam - 1]
+
+    saida[linhas] = resultado
+    return saida
+
+def ema_multi(close: np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """EMAs (span) de vários períodos numa passada -> array (len(spans), n)"""
+    return ewm(close, [2.0 / (span + 1.0) for span in spans])
+
+def ema(close: np.ndarray, span: int) -> np.ndarray:
+    """EMA de um período (equivale a ewm(span=span, adjust=False))"""
+    return ema_multi(close, [span])[0]
+
+def rma(valores: np.ndarray, period: int) -> np.ndarray:
+    """Média de Wilder (ewm alpha=1/period, adjust=False)"""
+    return ewm(valores, [1.0 / period])[0]
+
+def wilder_medias(close: np.ndarray, period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+    """Médias de Wilder de ganhos e perdas a partir do primeiro delta (tamanho n-1)"""
+    delta = np.diff(np.asarray(close, dtype=np.float64))
+    ganhos_perdas = np.vstack((np.maximum(delta, 0.0), np.maximum(-delta, 0.0)))
+    media_ganho, media_perda = ewm(ganhos_perdas, [1.0 / period, 1.0 / period])
+    return media_ganho, media_perda
+
+def rsi_wilder(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI de Wilder a partir do primeiro delta (tamanho n-1)
+    Perda média zero é trocada por 1e-10, como em calculate_rsi
+    """
+    media_ganho, media_perda = wilder_medias(close, period)
+    media_perda[media_perda == 0] = 1e-10
+
+    return 100.0 - 100.0 / (1.0 + media_ganho / media_perda)
+
+def rolling_mean(valores: np.ndarray, window: int) -> np.ndarray:
+    """Média móvel simples; primeiras window-1 posições = NaN"""
+    media, _ = _rolling_momentos(valores, window, ddof=1)
+    return media
+
+def rolling_std(valores: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Desvio padrão móvel (amostral por padrão, como pandas)"""
+    _, desvio = _rolling_momentos(valores, window, ddof)
+    return desvio
+
+def bollinger(close: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bandas de Bollinger -> (upper, middle, lower)"""
+    middle, desvio = _rolling_momentos(close, period, ddof=1)
+    return middle + desvio * std_dev, middle, middle - desvio * std_dev
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range (suavização de Wilder); TR da 1ª barra = high - low"""
+    high, low, close = (np.asarray(v, dtype=np.float64) for v in (high, low, close))
+    fechamento_anterior = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum.reduce([
+        high - low,
+        np.abs(high - fechamento_anterior),
+        np.abs(low - fechamento_anterior)
+    ])
+    true_range[0] = high[0] - low[0]
+    return rma(true_range, period)
+
+def cruzamentos(rapida: np.ndarray, lenta: np.ndarray) -> np.ndarray:
+    """
+    Marca cruzamentos barra a barra: +1 golden cross, -1 death cross, 0 nenhum
+
+    golden: rápida <= lenta na barra anterior e > na atual
+    death:  rápida >= lenta na barra anterior e < na atual
+    """
+    rapida, lenta = np.asarray(rapida, dtype=np.float64), np.asarray(lenta, dtype=np.float64)
+    sinais = np.zeros(rapida.shape[0], dtype=np.int8)
+    if rapida.shape[0] < 2:
+        return sinais
+
+    anterior_rapida, anterior_lenta = rapida[:-1], lenta[:-1]
+    atual_rapida, atual_lenta = rapida[1:], lenta[1:]
+    sinais[1:][(anterior_rapida <= anterior_lenta) & (atual_rapida > atual_lenta)] = 1
+    sinais[1:][(anterior_rapida >= anterior_lenta) & (atual_rapida < atual_lenta)] = -1
+    return sinais
+
+def ultimo_cruzamento(rapida: np.ndarray, lenta: np.ndarray, lookback: int) -> Tuple[int, Optional[int]]:
+    """
+    Cruzamento mais recente nas últimas `lookback` barras
+
+    Returns:
+        (sinal, barras_atras): sinal +1/-1/0; barras_atras 1 = última barra
+    """
+    janela = min(lookback + 1, len(rapida))
+    sinais = cruzamentos(rapida[-janela:], lenta[-janela:])[1:]
+    indices = np.flatnonzero(sinais)
+    if indices.size == 0:
+        return 0, None
+
+    ultimo = indices[-1]
+    return int(sinais[ultimo]), int(sinais.size - ultimo)
+
+def _rolling_momentos(valores: np.ndarray, window: int, ddof: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Média e desvio móveis via somas acumuladas (O(n), independente da janela)
+    Série centralizada na média global para reduzir cancelamento numérico
+    """
+    x = np.asarray(valores, dtype=np.float64)
+    media = np.full(x.shape[0], np.nan)
+    desvio = np.full(x.shape[0], np.nan)
+    if x.shape[0] < window:
+        return media, desvio
+
+    centro = x.mean()
+    c = x - centro
+    soma = np.cumsum(np.concatenate(([0.0], c)))
+    soma_quad = np.cumsum(np.concatenate(([0.0], c * c)))
+    s1 = soma[window:] - soma[:-window]
+    s2 = soma_quad[window:] - soma_quad[:-window]
+
+    media[window - 1:] = s1 / window + centro
+    desvio[window - 1:] = np.sqrt(np.maximum((s2 - s1 * s1 / window) / (window - ddof), 0.0))
+    return media, desvio
@@ -0,0 +1,334 @@
+# app/services/utils/helpers/tradingview/indicator_state.py
+
+"""
+Estado incremental de indicadores (streaming)
+
+Por chave (symbol, exchange, intervalo, indicador, período, janela) guarda o
+estado mínimo para avançar uma barra em O(1): último valor da EMA, médias de
+Wilder de ganho/perda do RSI e o buffer da janela móvel (Bollinger).
+
+A janela (n_bars da série recebida) faz parte da chave: EMA e RSI dependem
+da origem da semeadura, então janelas diferentes do mesmo indicador não
+compartilham estado.
+
+- Só barras fechadas avançam o estado; a última barra da série (em formação)
+  entra apenas no valor retornado, sem alterar o estado.
+- O estado é semeado com o motor vetorizado na primeira chamada (ou se houver
+  buraco entre o estado e a série recebida) e persistido no Postgres;
+  falha de persistência degrada para memória.
+- verificar_estado compara o estado com um recálculo completo desde a origem.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.config import get_settings
+from app.services.utils.helpers.tradingview import indicator_engine
+
+logger = logging.getLogger(__name__)
+
+class EstadoEMA:
+    """EMA (ewm span, adjust=False): y = a * close + (1 - a) * y_anterior"""
+
+    tipo = "ema"
+    minimo_barras = 1
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1.0)
+        self.valor: Optional[float] = None
+
+    def semear(self, closes: np.ndarray):
+        self.valor = float(indicator_engine.ema(closes, self.period)[-1])
+
+    def atualizar(self, close: float):
+        self.valor = self.alpha * close + (1.0 - self.alpha) * self.valor
+
+    def espiar(self, close: float) -> float:
+        """Valor incluindo a barra em formação (sem alterar o estado)"""
+        return self.alpha * close + (1.0 - self.alpha) * self.valor
+
+    def componentes(self) -> Tuple[float, ...]:
+        return (self.valor,)
+
+    def para_dict(self) -> Dict:
+        return {"valor": self.valor}
+
+    def carregar_dict(self, dados: Dict):
+        self.valor = float(dados["valor"])
+
+class EstadoRSI:
+    """RSI de Wilder: médias de ganho/perda (alpha = 1/period) e último close"""
+
+    tipo = "rsi"
+    minimo_barras = 2
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 1.0 / period
+        self.media_ganho: Optional[float] = None
+        self.media_perda: Optional[float] = None
+        self.ultimo_close: Optional[float] = None
+
+    def semear(self, closes: np.ndarray):
+        media_ganho, media_perda = indicator_engine.wilder_medias(closes, self.period)
+        self.media_ganho = float(media_ganho[-1])
+        self.media_perda = float(media_perda[-1])
+        self.ultimo_close = float(closes[-1])
+
+    def atualizar(self, close: float):
+        self.media_ganho, self.media_perda = self._medias(close)
+        self.ultimo_close = close
+
+    def espiar(self, close: float) -> float:
+        media_ganho, media_perda = self._medias(close)
+        media_perda = media_perda if media_perda != 0 else 1e-10
+        return 100.0 - 100.0 / (1.0 + media_ganho / media_perda)
+
+    def _medias(self, close: float) -> Tuple[float, float]:
+        delta = close - self.ultimo_close
+        media_ganho = self.alpha * max(delta, 0.0) + (1.0 - self.alpha) * self.media_ganho
+        media_perda = self.alpha * max(-delta, 0.0) + (1.0 - self.alpha) * self.media_perda
+        return media_ganho, media_perda
+
+    def componentes(self) -> Tuple[float, ...]:
+        return (self.media_ganho, self.media_perda)
+
+    def para_dict(self) -> Dict:
+        return {"media_ganho": self.media_ganho, "media_perda": self.media_perda, "ultimo_close": self.ultimo_close}
+
+    def carregar_dict(self, dados: Dict):
+        self.media_ganho = float(dados["media_ganho"])
+        self.media_perda = float(dados["media_perda"])
+        self.ultimo_close = float(dados["ultimo_close"])
+
+class EstadoJanela:
+    """Janela móvel (Bollinger): buffer com as últimas period-1 barras fechadas"""
+
+    tipo = "janela"
+
+    def __init__(self, period: int):
+        self.period = period
+        self.minimo_barras = period - 1
+        self.buffer: deque = deque(maxlen=period - 1)
+
+    def semear(self, closes: np.ndarray):
+        self.buffer = deque((float(c) for c in closes[-(self.period - 1):]), maxlen=self.period - 1)
+
+    def atualizar(self, close: float):
+        self.buffer.append(close)
+
+    def espiar(self, close: float) -> Tuple[float, float]:
+        """(média, desvio amostral) da janela com a barra em formação"""
+        janela = np.fromiter(self.buffer, dtype=np.float64, count=len(self.buffer))
+        janela = np.append(janela, close)
+        return float(janela.mean()), float(janela.std(ddof=1))
+
+    def componentes(self) -> Tuple[float, ...]:
+        return tuple(self.buffer)
+
+    def para_dict(self) -> Dict:
+        return {"buffer": list(self.buffer)}
+
+    def carregar_dict(self, dados: Dict):
+        self.buffer = deque((float(c) for c in dados["buffer"]), maxlen=self.period - 1)
+
+TIPOS_ESTADO = {classe.tipo: classe for classe in (EstadoEMA, EstadoRSI, EstadoJanela)}
+
+class _Entrada:
+    """Estado de uma chave + metadados (origem, última barra fechada consumida)"""
+
+    def __init__(self):
+        self.estado = None
+        self.origem: Optional[pd.Timestamp] = None
+        self.ultimo_ts: Optional[pd.Timestamp] = None
+        self.barras: int = 0
+        self.carregada = False
+        self.lock = threading.Lock()
+
+_entradas: Dict[Tuple[str, str, str, str, int, int], _Entrada] = {}
+_entradas_lock = threading.Lock()
+
+def ema_atual(chave: tuple, prices: pd.Series, period: int) -> float:
+    """
+    EMA da última barra de `prices` via estado incremental
+
+    Args:
+        chave: (symbol, exchange, interval)
+        prices: closes ordenados (janela de n_bars); a última barra é a em formação
+    """
+    return _valor_atual(chave, "ema", period, prices)
+
+def rsi_atual(chave: tuple, prices: pd.Series, period: int = 14) -> float:
+    """RSI de Wilder da última barra de `prices` via estado incremental"""
+    return _valor_atual(chave, "rsi", period, prices)
+
+def bollinger_atual(chave: tuple, prices: pd.Series, period: int = 20, std_dev: float = 2.0) -> Dict[str, float]:
+    """Bandas de Bollinger da última barra via buffer da janela"""
+    media, desvio = _valor_atual(chave, "janela", period, prices)
+    return {"upper": media + desvio * std_dev, "middle": media, "lower": media - desvio * std_dev}
+
+def verificar_estado(chave: tuple, indicador: str, period: int, prices: pd.Series, janela: int,
+                     tolerancia: float = 1e-9) -> Dict:
+    """
+    Compara o estado armazenado com um recálculo completo desde a origem
+
+    Args:
+        prices: série que cobre da origem do estado até a última barra consumida
+        janela: n_bars das séries que alimentaram o estado
+
+    Returns:
+        Dict com status ("ok", "divergente", "sem_estado", "historico_insuficiente")
+        e a maior diferença relativa entre os componentes
+    """
+    entrada = _get_entrada(chave, indicador, period, janela)
+    with entrada.lock:
+        _carregar(entrada, chave, indicador, period, janela)
+        if entrada.estado is None:
+            return {"status": "sem_estado"}
+
+        indice = prices.index
+        if entrada.origem not in indice or entrada.ultimo_ts not in indice:
+            return {
+                "status": "historico_insuficiente",
+                "origem": str(entrada.origem),
+                "ultimo_ts": str(entrada.ultimo_ts)
+            }
+
+        inicio, fim = indice.get_loc(entrada.origem), indice.get_loc(entrada.ultimo_ts)
+        referencia = TIPOS_ESTADO[indicador](period)
+        referencia.semear(prices.to_numpy(dtype=float)[inicio:fim + 1])
+
+        atual = np.asarray(entrada.estado.componentes(), dtype=np.float64)
+        esperado = np.asarray(referencia.componentes(), dtype=np.float64)
+        escala = np.maximum(np.abs(esperado), 1e-12)
+        diferenca = float(np.max(np.abs(atual - esperado) / escala)) if esperado.size else 0.0
+
+        return {
+            "status": "ok" if diferenca <= tolerancia else "divergente",
+            "diferenca_relativa": diferenca,
+            "barras": entrada.barras,
+            "origem": str(entrada.origem),
+            "ultimo_ts": str(entrada.ultimo_ts)
+        }
+
+def limpar_estados():
+    """Descarta estados em memória (próxima leitura recarrega do banco)"""
+    with _entradas_lock:
+        _entradas.clear()
+
+def _valor_atual(chave: tuple, indicador: str, period: int, prices: pd.Series):
+    symbol, exchange, interval = chave
+    intervalo = _intervalo_str(interval)
+    closes = prices.to_numpy(dtype=float)
+    fechadas = len(closes) - 1
+    janela = len(closes)
+    estado_tipo = TIPOS_ESTADO[indicador]
+
+    entrada = _get_entrada(chave, indicador, period, janela)
+    with entrada.lock:
+        _carregar(entrada, chave, indicador, period, janela)
+        minimo = max(estado_tipo(period).minimo_barras, 1)
+        if fechadas < minimo:
+            raise Exception(f"Dados insuficientes para estado {indicador}{period}: {fechadas} barras fechadas")
+
+        indice = prices.index
+        ts_fechada = indice[fechadas - 1]
+        if entrada.estado is None:
+            posicao = -1
+        elif entrada.ultimo_ts == ts_fechada:
+            posicao = fechadas - 1
+        else:
+            # Índice ordenado (bar store): busca binária
+            posicao = int(indice.searchsorted(entrada.ultimo_ts))
+            if posicao >= fechadas or indice[posicao] != entrada.ultimo_ts:
+                posicao = -1
+
+        if entrada.estado is not None and entrada.ultimo_ts > ts_fechada:
+            # Série mais antiga que o estado: calcula sem tocar no estado
+            temporario = estado_tipo(period)
+            temporario.semear(closes[:fechadas])
+            return temporario.espiar(closes[-1])
+
+        if posicao < 0:
+            entrada.estado = estado_tipo(period)
+            entrada.estado.semear(closes[:fechadas])
+            entrada.origem = indice[0]
+            entrada.barras = fechadas
+            logger.info(f"🌱 Estado {indicador}{period} {symbol} {intervalo} semeado ({fechadas} barras)")
+        else:
+            novas = closes[posicao + 1:fechadas]
+            for close in novas:
+                entrada.estado.atualizar(float(close))
+            entrada.barras += len(novas)
+            if len(novas):
+                logger.debug(f"⚡ Estado {indicador}{period} {symbol} {intervalo}: +{len(novas)} barras")
+
+        if entrada.ultimo_ts != ts_fechada:
+            entrada.ultimo_ts = ts_fechada
+            _persistir(entrada, chave, indicador, period, janela)
+
+        return entrada.estado.espiar(float(closes[-1]))
+
+def _get_entrada(chave: tuple, indicador: str, period: int, janela: int) -> _Entrada:
+    symbol, exchange, interval = chave
+    chave_completa = (symbol, exchange, _intervalo_str(interval), indicador, period, janela)
+    with _entradas_lock:
+        if chave_completa not in _entradas:
+            _entradas[chave_completa] = _Entrada()
+        return _entradas[chave_completa]
+
+def _intervalo_str(interval) -> str:
+    return interval.value if hasattr(interval, "value") else str(interval)
+
+def _carregar(entrada: _Entrada, chave: tuple, indicador: str, period: int, janela: int):
+    """Carrega o estado persistido uma vez por processo (lock da entrada já adquirido)"""
+    if entrada.carregada:
+        return
+    entrada.carregada = True
+
+    if not get_settings().INDICATOR_STATE_PERSIST:
+        return
+
+    symbol, exchange, interval = chave
+    intervalo = _intervalo_str(interval)
+    try:
+        from app.services.utils.helpers.postgres.ohlc.indicator_state_helper import get_estado_indicador
+
+        row = get_estado_indicador(symbol, exchange, intervalo, indicador, period, janela)
+        if not row:
+            return
+
+        estado = TIPOS_ESTADO[indicador](period)
+        estado.carregar_dict(row["estado"])
+        entrada.estado = estado
+        entrada.origem = pd.Timestamp(row["origem"])
+        entrada.ultimo_ts = pd.Timestamp(row["ultimo_ts"])
+        entrada.barras = row["barras"]
+        logger.info(f"💾 Estado {indicador}{period} {symbol} {intervalo} carregado do banco (até {entrada.ultimo_ts})")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Estado {indicador}{period} sem persistência ({symbol} {intervalo}): {str(e)}")
+
+def _persistir(entrada: _Entrada, chave: tuple, indicador: str, period: int, janela: int):
+    if not get_settings().INDICATOR_STATE_PERSIST:
+        return
+
+    symbol, exchange, interval = chave
+    intervalo = _intervalo_str(interval)
+    try:
+        from app.services.utils.helpers.postgres.ohlc.indicator_state_helper import upsert_estado_indicador
+
+        upsert_estado_indicador(
+            symbol, exchange, intervalo, indicador, period, janela,
+            estado=entrada.estado.para_dict(),
+            origem=entrada.origem.to_pydatetime(),
+            ultimo_ts=entrada.ultimo_ts.to_pydatetime(),
+            barras=entrada.barras
+        )
+
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao persistir estado {indicador}{period} {symbol} {intervalo}: {str(e)}")
@@ -0,0 +1,135 @@
+# app/services/utils/helpers/tradingview/market_snapshot.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict
+import pandas as pd
+from app.services.utils.helpers.tradingview import indicator_engine
+from app.services.utils.helpers.tradingview.tradingview_helper import (
+    fetch_ohlc_data, calculate_ema, calculate_rsi, calculate_bollinger_bands,
+    calculate_ema_atual, calculate_rsi_atual
+)
+
+logger = logging.getLogger(__name__)
+
+class MarketSnapshot:
+    """
+    Snapshot de mercado por requisição
+
+    Cada timeframe é buscado uma única vez (a maior janela pedida é reaproveitada
+    para janelas menores via tail) e os indicadores são calculados sob demanda
+    e memorizados. Janelas iguais às das funções originais garantem os mesmos valores.
+    """
+
+    def __init__(self, symbol: str = "BTCUSDT", exchange: str = "BINANCE"):
+        self.symbol = symbol
+        self.exchange = exchange
+        self.fetches = 0
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._memo: Dict[tuple, Any] = {}
+        self._lock = threading.RLock()
+
+    def ohlc(self, interval, n_bars: int) -> pd.DataFrame:
+        """Barras OHLC do timeframe (uma busca por timeframe no snapshot)"""
+        chave = interval.value if hasattr(interval, "value") else str(interval)
+        with self._lock:
+            df = self._frames.get(chave)
+            if df is None or len(df) < n_bars:
+                df = fetch_ohlc_data(
+                    symbol=self.symbol,
+                    exchange=self.exchange,
+                    interval=interval,
+                    n_bars=n_bars
+                )
+                self._frames[chave] = df
+                self.fetches += 1
+                logger.info(f"📸 Snapshot: {chave} carregado ({len(df)} barras, fetch #{self.fetches})")
+            return df.tail(n_bars)
+
+    def close(self, interval, n_bars: int) -> pd.Series:
+        return self.ohlc(interval, n_bars)['close']
+
+    def preco_atual(self, interval, n_bars: int) -> float:
+        """Último negócio do price_stream quando ativo; senão close da barra em formação"""
+        from app.services.utils.helpers.tradingview.price_stream import preco_stream
+
+        preco = preco_stream(self.symbol)
+        if preco is not None:
+            return preco
+        return float(self.close(interval, n_bars).iloc[-1])
+
+    def ema(self, interval, period: int, n_bars: int) -> pd.Series:
+        return self._memorizar(
+            ("ema", interval, period, n_bars),
+            lambda: calculate_ema(self.close(interval, n_bars), period=period)
+        )
+
+    def ema_atual(self, interval, period: int, n_bars: int) -> float:
+        """EMA da última barra via estado incremental (sem recalcular a série)"""
+        return self._memorizar(
+            ("ema_atual", interval, period, n_bars),
+            lambda: calculate_ema_atual(self.close(interval, n_bars), period, chave=self._chave(interval))
+        )
+
+    def rsi(self, interval, period: int = 14, n_bars: int = 2000) -> pd.Series:
+        return self._memorizar(
+            ("rsi", interval, period, n_bars),
+            lambda: calculate_rsi(self.close(interval, n_bars), period=period)
+        )
+
+    def rsi_atual(self, interval, period: int = 14, n_bars: int = 2000) -> float:
+        rsi_atual = self._memorizar(
+            ("rsi_atual", interval, period, n_bars),
+            lambda: calculate_rsi_atual(self.close(interval, n_bars), period, chave=self._chave(interval))
+        )
+        if not (0 <= rsi_atual <= 100):
+            raise Exception(f"RSI inválido: {rsi_atual}")
+        return round(rsi_atual, 1)
+
+    def distancia_ema(self, interval, period: int, n_bars: int) -> float:
+        """Distância percentual do preço atual para a EMA"""
+        ema_atual = self.ema_atual(interval, period, n_bars)
+        preco = self.preco_atual(interval, n_bars)
+        return ((preco - ema_atual) / ema_atual) * 100
+
+    def bollinger(self, interval, period: int = 20, std_dev: float = 2.0, n_bars: int = 30) -> Dict[str, pd.Series]:
+        return self._memorizar(
+            ("bollinger", interval, period, std_dev, n_bars),
+            lambda: calculate_bollinger_bands(self.close(interval, n_bars), period=period, std_dev=std_dev)
+        )
+
+    def bbw(self, interval, period: int = 20, std_dev: float = 2.0, n_bars: int = 30) -> float:
+        """Bollinger Band Width % da última barra"""
+        bandas = self.bollinger(interval, period, std_dev, n_bars)
+        upper, lower, middle = (float(bandas[k].iloc[-1]) for k in ("upper", "lower", "middle"))
+        return ((upper - lower) / middle) * 100
+
+    def cruzamento(self, interval, rapida: int, lenta: int, n_bars: int, lookback: int) -> Dict[str, Any]:
+        """
+        Último cruzamento rápida/lenta nas `lookback` barras mais recentes
+
+        Returns:
+            Dict com golden_cross, death_cross, barras_atras e alinhamento atual
+        """
+        def _calcular():
+            ema_rapida = self.ema(interval, rapida, n_bars).to_numpy()
+            ema_lenta = self.ema(interval, lenta, n_bars).to_numpy()
+
+            sinal, barras_atras = indicator_engine.ultimo_cruzamento(ema_rapida, ema_lenta, lookback)
+            return {
+                "golden_cross": sinal == 1,
+                "death_cross": sinal == -1,
+                "barras_atras": barras_atras,
+                "alinhamento": "bullish" if ema_rapida[-1] > ema_lenta[-1] else "bearish"
+            }
+
+        return self._memorizar(("cruzamento", interval, rapida, lenta, n_bars, lookback), _calcular)
+
+    def _chave(self, interval) -> tuple:
+        return (self.symbol, self.exchange, interval)
+
+    def _memorizar(self, chave: tuple, calcular: Callable[[], Any]) -> Any:
+        with self._lock:
+            if chave not in self._memo:
+                self._memo[chave] = calcular()
+            return self._memo[chave]
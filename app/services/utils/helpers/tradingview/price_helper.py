@@ -1,50 +1,198 @@
 # app/services/utils/helpers/price_helper.py
 
-import requests
+"""
+Preço spot do BTC com requisições hedged entre fontes
+
+- Sessões HTTP keep-alive por fonte (sem novo handshake TLS a cada chamada).
+- A fonte mais rápida (média móvel de latência) sai primeiro; sem resposta
+  válida em BTC_PRICE_HEDGE_MS, as demais são disparadas em paralelo.
+- BTC_PRICE_QUORUM=1 devolve a primeira cotação válida; 2 devolve a
+  mediana das duas mais rápidas (na prática, a média).
+- Cache de BTC_PRICE_CACHE_TTL_SECONDS compartilhado: chamadas simultâneas
+  esperam a mesma busca em vez de repetir.
+- `fontes` aceita substitutos locais (testes com servidor HTTP próprio);
+  com substitutos a busca ignora o cache compartilhado.
+- Com o price_stream ativo e recente, get_btc_price lê o preço da memória.
+"""
+
 import logging
-from typing import Optional
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-def get_btc_price() -> float:
-    """Busca preço atual do BTC com fallback entre fontes"""
-    
-    sources = [
-        {
-            "name": "CoinGecko",
-            "url": "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd",
-            "parser": lambda r: r.json()["bitcoin"]["usd"]
-        },
-        {
-            "name": "Binance",
-            "url": "https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT",
-            "parser": lambda r: float(r.json()["price"])
-        },
-        {
-            "name": "CoinMarketCap",
-            "url": "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest?symbol=BTC",
-            "parser": lambda r: r.json()["data"]["BTC"]["quote"]["USD"]["price"]
+@dataclass(frozen=True)
+class FontePreco:
+    nome: str
+    url: str
+    parser: Callable[[dict], float]
+
+FONTES: List[FontePreco] = [
+    FontePreco(
+        "CoinGecko",
+        "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd",
+        lambda dados: dados["bitcoin"]["usd"]
+    ),
+    FontePreco(
+        "Binance",
+        "https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT",
+        lambda dados: float(dados["price"])
+    ),
+    FontePreco(
+        "CoinMarketCap",
+        "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest?symbol=BTC",
+        lambda dados: dados["data"]["BTC"]["quote"]["USD"]["price"]
+    ),
+]
+
+_sessoes: Dict[str, requests.Session] = {}
+_stats: Dict[str, Dict] = {}
+_lock = threading.Lock()
+_busca_lock = threading.Lock()
+_cache = {"preco": None, "fonte": None, "em": 0.0}
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="preco_btc")
+
+def _sessao(fonte: FontePreco) -> requests.Session:
+    with _lock:
+        if fonte.nome not in _sessoes:
+            sessao = requests.Session()
+            sessao.mount("https://", HTTPAdapter(pool_maxsize=4))
+            sessao.mount("http://", HTTPAdapter(pool_maxsize=4))
+            _sessoes[fonte.nome] = sessao
+        return _sessoes[fonte.nome]
+
+def _registrar(nome: str, ms: float, sucesso: bool, erro: str = None):
+    with _lock:
+        s = _stats.setdefault(nome, {"sucessos": 0, "falhas": 0, "latencia_media_ms": None, "ultima_latencia_ms": None, "ultimo_erro": None})
+        s["ultima_latencia_ms"] = round(ms, 1)
+        if sucesso:
+            s["sucessos"] += 1
+            media = s["latencia_media_ms"]
+            s["latencia_media_ms"] = round(ms if media is None else 0.8 * media + 0.2 * ms, 1)
+        else:
+            s["falhas"] += 1
+            s["ultimo_erro"] = erro
+
+def _consultar(fonte: FontePreco, timeout: float) -> float:
+    """Uma fonte: GET + parse + validação básica (exceção se inválido)"""
+    t0 = time.monotonic()
+    try:
+        response = _sessao(fonte).get(fonte.url, timeout=timeout)
+        response.raise_for_status()
+        price = float(fonte.parser(response.json()))
+        if price <= 10000:  # Validação básica
+            raise ValueError(f"Preço inválido: {price}")
+        _registrar(fonte.nome, (time.monotonic() - t0) * 1000, True)
+        return price
+    except Exception as e:
+        _registrar(fonte.nome, (time.monotonic() - t0) * 1000, False, str(e))
+        raise
+
+def _ordenar(fontes: Sequence[FontePreco]) -> List[FontePreco]:
+    """Mais rápida primeiro; sem histórico mantém a ordem original; mais falhas que sucessos vai para o fim"""
+    with _lock:
+        def chave(item):
+            indice, fonte = item
+            s = _stats.get(fonte.nome) or {"sucessos": 0, "falhas": 0, "latencia_media_ms": None}
+            latencia = s["latencia_media_ms"] if s["latencia_media_ms"] is not None else float("inf")
+            return (s["falhas"] > s["sucessos"], latencia, indice)
+        return [fonte for _, fonte in sorted(enumerate(fontes), key=chave)]
+
+def buscar_preco(fontes: Sequence[FontePreco] = None, quorum: int = None) -> Dict:
+    """
+    Busca hedged sem cache
+
+    Returns:
+        dict com preco, fontes usadas e cotações recebidas
+    """
+    settings = get_settings()
+    fontes = _ordenar(fontes or FONTES)
+    quorum = max(1, min(quorum or settings.BTC_PRICE_QUORUM, len(fontes)))
+    timeout = settings.BTC_PRICE_TIMEOUT_SECONDS
+    inicio = time.monotonic()
+
+    pendentes = {_executor.submit(_consultar, fontes[0], timeout): fontes[0].nome}
+    restantes = list(fontes[1:])
+    cotacoes: Dict[str, float] = {}
+    erros: Dict[str, str] = {}
+    espera_hedge = settings.BTC_PRICE_HEDGE_MS / 1000
+
+    while pendentes or restantes:
+        decorrido = time.monotonic() - inicio
+        if decorrido >= timeout:
+            break
+
+        # Sem resultado dentro do hedge (ou fonte falhou): dispara as demais
+        if restantes and (not pendentes or decorrido >= espera_hedge):
+            for fonte in restantes:
+                pendentes[_executor.submit(_consultar, fonte, timeout)] = fonte.nome
+            restantes = []
+
+        limite = timeout - decorrido if not restantes else max(0.0, espera_hedge - decorrido)
+        concluidos, _ = wait(pendentes, timeout=limite, return_when=FIRST_COMPLETED)
+        for future in concluidos:
+            nome = pendentes.pop(future)
+            try:
+                cotacoes[nome] = future.result()
+            except Exception as e:
+                erros[nome] = str(e)
+                logger.warning(f"❌ Falha em {nome}: {str(e)}")
+
+        if len(cotacoes) >= quorum:
+            break
+
+    if not cotacoes:
+        raise Exception(f"Todas as fontes de preço BTC falharam: {erros or 'timeout'}")
+
+    preco = statistics.median(cotacoes.values())
+    logger.info(f"✅ Preço BTC ${preco:,.2f} via {', '.join(cotacoes)} em {(time.monotonic() - inicio) * 1000:.0f}ms")
+    return {"preco": float(preco), "fontes": list(cotacoes), "cotacoes": cotacoes, "erros": erros}
+
+def get_btc_price(fontes: Sequence[FontePreco] = None) -> float:
+    """
+    Preço atual do BTC: stream em memória quando ativo e recente; senão
+    cache curto compartilhado + busca hedged entre fontes
+
+    fontes substitutas buscam direto, sem ler nem gravar o cache
+    """
+    if fontes is not None:
+        return buscar_preco(fontes)["preco"]
+
+    from app.services.utils.helpers.tradingview.price_stream import preco_stream
+
+    preco = preco_stream(get_settings().PRICE_STREAM_SYMBOL)
+    if preco is not None:
+        return preco
+
+    ttl = get_settings().BTC_PRICE_CACHE_TTL_SECONDS
+
+    if time.monotonic() - _cache["em"] < ttl and _cache["preco"] is not None:
+        return _cache["preco"]
+
+    with _busca_lock:
+        # Outra thread pode ter buscado enquanto esperávamos
+        if time.monotonic() - _cache["em"] < ttl and _cache["preco"] is not None:
+            return _cache["preco"]
+
+        resultado = buscar_preco()
+        _cache.update(preco=resultado["preco"], fonte="+".join(resultado["fontes"]), em=time.monotonic())
+        return resultado["preco"]
+
+def get_price_stats() -> Dict:
+    """Latência e falhas por fonte + última cotação em cache"""
+    with _lock:
+        return {
+            "fontes": {nome: dict(s) for nome, s in _stats.items()},
+            "cache": {
+                "preco": _cache["preco"],
+                "fonte": _cache["fonte"],
+                "idade_s": round(time.monotonic() - _cache["em"], 3) if _cache["preco"] is not None else None
+            }
         }
-    ]
-    
-    for source in sources:
-        try:
-            logger.info(f"🔍 Buscando preço BTC via {source['name']}")
-            
-            response = requests.get(source["url"], timeout=10)
-            response.raise_for_status()
-            
-            price = source["parser"](response)
-            price = float(price)
-            
-            if price > 10000:  # Validação básica
-                logger.info(f"✅ Preço BTC obtido via {source['name']}: ${price:,.2f}")
-                return price
-            else:
-                logger.warning(f"⚠️ Preço inválido via {source['name']}: {price}")
-                
-        except Exception as e:
-            logger.warning(f"❌ Falha em {source['name']}: {str(e)}")
-            continue
-    
-    raise Exception("Todas as fontes de preço BTC falharam")
\ No newline at end of file
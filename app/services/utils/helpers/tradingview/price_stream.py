@@ -0,0 +1,387 @@
+# app/services/utils/helpers/tradingview/price_stream.py
+
+"""
+Ingestão contínua de negócios (trades) do BTC em background
+
+- Uma thread consome a fonte (stream aggTrade da Binance ou arquivo de
+  replay local), mantém o último preço em memória e monta candles de 1m.
+- Candle fechado vai para o bar store (intervalo "1", memória + ohlc_bars),
+  exceto os parciais: o primeiro após cada início/reconexão e o que estava
+  em formação quando a conexão caiu.
+- Leituras internas de "preço atual" (get_btc_price, MarketSnapshot) viram
+  consulta em memória enquanto o stream estiver recente
+  (PRICE_STREAM_MAX_AGE_SECONDS); fora disso voltam à busca remota.
+- Clientes recebem preço/candles via SSE ou WebSocket (fan-out por filas
+  asyncio; cliente lento perde eventos antigos, não trava a ingestão).
+
+Fonte configurável em PRICE_STREAM_SOURCE:
+    "binance"               -> wss aggTrade do PRICE_STREAM_SYMBOL
+    "replay:<arquivo>"      -> linhas "timestamp_ms,preco,quantidade" ou JSON
+                               aggTrade ({"T":..,"p":..,"q":..}), no ritmo
+                               original / PRICE_STREAM_REPLAY_SPEED (0 = sem espera)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import pandas as pd
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws/{simbolo}@aggTrade"
+FILA_MAX_EVENTOS = 100
+CANDLES_EM_MEMORIA = 1440  # 24h de candles 1m
+
+@dataclass(frozen=True)
+class Negocio:
+    timestamp_ms: int
+    preco: float
+    quantidade: float
+
+# ==========================================
+# FONTES
+# ==========================================
+
+class FonteBinance:
+    """aggTrade da Binance via websocket-client (dependência do tvDatafeed)"""
+
+    def __init__(self, symbol: str):
+        self.url = BINANCE_WS_URL.format(simbolo=symbol.lower())
+        self._ws = None
+
+    def __iter__(self) -> Iterator[Negocio]:
+        from websocket import create_connection
+
+        self._ws = create_connection(self.url, timeout=30)
+        logger.info(f"🔗 Stream de preço conectado: {self.url}")
+        try:
+            while True:
+                mensagem = self._ws.recv()
+                if not mensagem:
+                    return
+                negocio = _parse_linha(mensagem)
+                if negocio is not None:
+                    yield negocio
+        finally:
+            self.fechar()
+
+    def fechar(self):
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+
+class FonteReplay:
+    """Negócios gravados em arquivo, reproduzidos no ritmo original (/ velocidade)"""
+
+    def __init__(self, caminho: str, velocidade: float = 1.0):
+        self.caminho = caminho
+        self.velocidade = velocidade
+        self._parar = threading.Event()
+
+    def __iter__(self) -> Iterator[Negocio]:
+        anterior_ms = None
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                negocio = _parse_linha(linha)
+                if negocio is None:
+                    continue
+                if self.velocidade > 0 and anterior_ms is not None:
+                    espera = (negocio.timestamp_ms - anterior_ms) / 1000 / self.velocidade
+                    if espera > 0 and self._parar.wait(espera):
+                        return
+                anterior_ms = negocio.timestamp_ms
+                yield negocio
+
+    def fechar(self):
+        self._parar.set()
+
+def _parse_linha(linha) -> Optional[Negocio]:
+    """JSON aggTrade ou CSV timestamp_ms,preco,quantidade (None para linha vazia/comentário/inválida)"""
+    if isinstance(linha, bytes):
+        linha = linha.decode("utf-8")
+    linha = linha.strip()
+    if not linha or linha.startswith("#"):
+        return None
+    try:
+        if linha.startswith("{"):
+            dados = json.loads(linha)
+            return Negocio(int(dados["T"]), float(dados["p"]), float(dados.get("q", 0.0)))
+        campos = linha.split(",")
+        return Negocio(int(float(campos[0])), float(campos[1]), float(campos[2]) if len(campos) > 2 else 0.0)
+    except (KeyError, ValueError, IndexError):
+        logger.debug(f"Linha ignorada no stream: {linha[:80]}")
+        return None
+
+def criar_fonte(spec: str, symbol: str):
+    """PRICE_STREAM_SOURCE -> fonte iterável de Negocio"""
+    if spec == "binance":
+        return FonteBinance(symbol)
+    if spec.startswith("replay:"):
+        return FonteReplay(spec[len("replay:"):], get_settings().PRICE_STREAM_REPLAY_SPEED)
+    raise ValueError(f"Fonte de stream inválida: {spec}")
+
+# ==========================================
+# CANDLES + FAN-OUT
+# ==========================================
+
+class _Candle:
+    __slots__ = ("inicio_ms", "open", "high", "low", "close", "volume", "parcial")
+
+    def __init__(self, inicio_ms: int, negocio: Negocio, parcial: bool = False):
+        self.inicio_ms = inicio_ms
+        self.open = self.high = self.low = self.close = negocio.preco
+        self.volume = negocio.quantidade
+        self.parcial = parcial
+
+    def atualizar(self, negocio: Negocio):
+        self.high = max(self.high, negocio.preco)
+        self.low = min(self.low, negocio.preco)
+        self.close = negocio.preco
+        self.volume += negocio.quantidade
+
+    def datetime(self) -> datetime:
+        # Mesmo índice do tvDatafeed: horário local sem timezone
+        return datetime.fromtimestamp(self.inicio_ms / 1000)
+
+    def como_dict(self) -> Dict:
+        return {
+            "datetime": self.datetime().isoformat(),
+            "open": self.open, "high": self.high, "low": self.low,
+            "close": self.close, "volume": round(self.volume, 8)
+        }
+
+class PriceStream:
+    def __init__(self, fonte, symbol: str, exchange: str):
+        self.fonte = fonte
+        self.symbol = symbol
+        self.exchange = exchange
+        self.candles: deque = deque(maxlen=CANDLES_EM_MEMORIA)
+        self._candle: Optional[_Candle] = None
+        self._conectando = True  # próximo negócio é o primeiro da conexão
+        self._preco: Optional[float] = None
+        self._preco_ts_ms: Optional[int] = None
+        self._recebido_em = 0.0
+        self._publicado_em = 0.0
+        self._lock = threading.Lock()
+        self._assinantes: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"negocios": 0, "candles": 0, "reconexoes": 0, "ultimo_erro": None}
+
+    # ------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------
+
+    def iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="price_stream", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        fechar = getattr(self.fonte, "fechar", None)
+        if fechar:
+            fechar()
+
+    def ativo(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self):
+        espera = 1.0
+        while not self._parar.is_set():
+            self._nova_conexao()
+            try:
+                for negocio in self.fonte:
+                    if self._parar.is_set():
+                        return
+                    self.processar(negocio)
+                    espera = 1.0
+                if isinstance(self.fonte, FonteReplay):
+                    self._fechar_candle()
+                    logger.info(f"🏁 Replay concluído: {self._stats['negocios']} negócios, {self._stats['candles']} candles")
+                    return
+            except Exception as e:
+                self._stats["ultimo_erro"] = str(e)
+                logger.warning(f"⚠️ Stream de preço interrompido: {str(e)} - reconectando em {espera:.0f}s")
+
+            self._stats["reconexoes"] += 1
+            if self._parar.wait(espera):
+                return
+            espera = min(espera * 2, 60.0)
+
+    def _nova_conexao(self):
+        """Negócios perdidos antes da conexão: candle em formação e o primeiro candle novo ficam parciais"""
+        self._conectando = True
+        if self._candle is not None:
+            self._candle.parcial = True
+
+    # ------------------------------------------
+    # Ingestão
+    # ------------------------------------------
+
+    def processar(self, negocio: Negocio):
+        """Atualiza preço, candle em formação e publica (chamado pela thread do stream)"""
+        inicio_ms = negocio.timestamp_ms - negocio.timestamp_ms % 60000
+
+        with self._lock:
+            if self._candle is not None and inicio_ms < self._candle.inicio_ms:
+                return  # negócio atrasado de um minuto já fechado
+            self._preco = negocio.preco
+            self._preco_ts_ms = negocio.timestamp_ms
+            self._recebido_em = time.monotonic()
+            self._stats["negocios"] += 1
+
+        if self._candle is not None and inicio_ms > self._candle.inicio_ms:
+            self._fechar_candle()
+        if self._candle is None:
+            self._candle = _Candle(inicio_ms, negocio, parcial=self._conectando)
+        else:
+            self._candle.atualizar(negocio)
+        self._conectando = False
+
+        agora = time.monotonic()
+        if (agora - self._publicado_em) * 1000 >= get_settings().PRICE_STREAM_PUBLISH_MS:
+            self._publicado_em = agora
+            self._publicar({"tipo": "preco", "symbol": self.symbol, "preco": negocio.preco,
+                            "timestamp": datetime.utcfromtimestamp(negocio.timestamp_ms / 1000).isoformat()})
+
+    def _fechar_candle(self):
+        candle, self._candle = self._candle, None
+        if candle is None:
+            return
+        with self._lock:
+            self.candles.append(candle)
+            self._stats["candles"] += 1
+        self._publicar({"tipo": "candle", "symbol": self.symbol, "intervalo": "1", **candle.como_dict()})
+        if candle.parcial:
+            logger.debug(f"Candle 1m parcial não registrado no bar store: {candle.datetime()}")
+            return
+        _registrar_no_bar_store(self.symbol, self.exchange, candle)
+
+    # ------------------------------------------
+    # Leitura interna
+    # ------------------------------------------
+
+    def preco_atual(self, max_idade: float = None) -> Optional[float]:
+        """Último preço se recebido há no máximo max_idade segundos (None caso contrário)"""
+        if max_idade is None:
+            max_idade = get_settings().PRICE_STREAM_MAX_AGE_SECONDS
+        with self._lock:
+            if self._preco is None or time.monotonic() - self._recebido_em > max_idade:
+                return None
+            return self._preco
+
+    def ultimos_candles(self, n: int = 60, incluir_formacao: bool = False) -> List[Dict]:
+        with self._lock:
+            candles = [c.como_dict() for c in list(self.candles)[-n:]]
+        if incluir_formacao and self._candle is not None:
+            candles.append({**self._candle.como_dict(), "em_formacao": True})
+        return candles
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "ativo": self.ativo(),
+                "fonte": type(self.fonte).__name__,
+                "symbol": self.symbol,
+                "preco": self._preco,
+                "idade_s": round(time.monotonic() - self._recebido_em, 3) if self._preco is not None else None,
+                "assinantes": len(self._assinantes),
+            }
+
+    # ------------------------------------------
+    # Fan-out para clientes (SSE / WebSocket)
+    # ------------------------------------------
+
+    def assinar(self) -> asyncio.Queue:
+        """Fila de eventos para o cliente (chamar dentro do event loop)"""
+        fila = asyncio.Queue(maxsize=FILA_MAX_EVENTOS)
+        preco = self.preco_atual(max_idade=float("inf"))
+        if preco is not None:
+            fila.put_nowait({"tipo": "preco", "symbol": self.symbol, "preco": preco})
+        with self._lock:
+            self._assinantes.add((asyncio.get_running_loop(), fila))
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue):
+        with self._lock:
+            self._assinantes = {(loop, f) for loop, f in self._assinantes if f is not fila}
+
+    def _publicar(self, evento: Dict):
+        with self._lock:
+            assinantes = list(self._assinantes)
+        for loop, fila in assinantes:
+            try:
+                loop.call_soon_threadsafe(_entregar, fila, evento)
+            except RuntimeError:  # event loop encerrado
+                self.cancelar(fila)
+
+def _entregar(fila: asyncio.Queue, evento: Dict):
+    if fila.full():
+        fila.get_nowait()  # descarta o evento mais antigo
+    fila.put_nowait(evento)
+
+def _registrar_no_bar_store(symbol: str, exchange: str, candle: _Candle):
+    try:
+        from app.services.utils.helpers.tradingview.bar_store import registrar_barras
+
+        df = pd.DataFrame(
+            [[candle.open, candle.high, candle.low, candle.close, candle.volume]],
+            index=pd.DatetimeIndex([candle.datetime()], name="datetime"),
+            columns=["open", "high", "low", "close", "volume"]
+        )
+        df.insert(0, "symbol", f"{exchange}:{symbol}")
+        registrar_barras(symbol, exchange, "1", df)
+    except Exception as e:
+        logger.warning(f"⚠️ Candle 1m não registrado no bar store: {str(e)}")
+
+# ==========================================
+# STREAM DO PROCESSO
+# ==========================================
+
+_stream: Optional[PriceStream] = None
+_stream_lock = threading.Lock()
+
+def iniciar_stream(fonte=None) -> Optional[PriceStream]:
+    """Inicia a ingestão (startup, se PRICE_STREAM_ENABLED; `fonte` explícita ignora o flag)"""
+    global _stream
+    settings = get_settings()
+    if fonte is None and not settings.PRICE_STREAM_ENABLED:
+        return None
+
+    with _stream_lock:
+        if _stream is not None:
+            _stream.parar()
+        symbol = settings.PRICE_STREAM_SYMBOL
+        _stream = PriceStream(fonte or criar_fonte(settings.PRICE_STREAM_SOURCE, symbol), symbol, settings.TV_EXCHANGE)
+        _stream.iniciar()
+        logger.info(f"📡 Stream de preço iniciado ({type(_stream.fonte).__name__} {symbol})")
+        return _stream
+
+def parar_stream():
+    with _stream_lock:
+        if _stream is not None:
+            _stream.parar()
+
+def get_stream() -> Optional[PriceStream]:
+    return _stream
+
+def preco_stream(symbol: str = None) -> Optional[float]:
+    """Preço em memória do stream (None se desligado, outro símbolo ou sem negócio recente)"""
+    stream = _stream
+    if stream is None or (symbol is not None and symbol != stream.symbol):
+        return None
+    return stream.preco_atual()
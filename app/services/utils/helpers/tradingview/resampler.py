@@ -0,0 +1,125 @@
+# app/services/utils/helpers/tradingview/resampler.py
+
+"""
+Timeframes derivados por reamostragem de uma série base
+
+Um único download diário (bar store) alimenta 1D, 1W e 1M; as fronteiras
+seguem as sessões 24/7 da BINANCE no TradingView (UTC):
+- 1D: 00:00 UTC
+- 1W: segunda-feira 00:00 UTC
+- 1M: dia 1, 00:00 UTC
+- 4H: 00/04/08/12/16/20 UTC (disponível a partir de 1H)
+
+O índice do tvDatafeed é horário local sem timezone: a reamostragem é feita
+em UTC e o resultado volta para o mesmo formato local, então as barras
+derivadas têm os mesmos timestamps das nativas (bar store, estado incremental).
+
+4H segue nativo por padrão: 2000 barras 4H exigiriam 8000 barras 1H, acima
+do limite de RESAMPLE_MAX_BASE_BARS por download.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Tuple
+import pandas as pd
+from tvDatafeed import Interval
+from app.config import get_settings
+from app.services.utils.helpers.tradingview.bar_store import obter_barras, _intervalo_str
+from app.services.utils.helpers.tradingview.session_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# intervalo -> (regra pandas, duração máxima da barra em horas)
+REGRAS: Dict[str, Tuple[str, int]] = {
+    "1H": ("1h", 1),
+    "4H": ("4h", 4),
+    "1D": ("1D", 24),
+    "1W": ("W-MON", 168),
+    "1M": ("MS", 744),
+}
+
+# intervalo derivado -> intervalo base baixado do TradingView
+BASES: Dict[str, str] = {
+    "1D": "1D",
+    "1W": "1D",
+    "1M": "1D",
+}
+
+AGREGACAO = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+def buscar_barras(symbol: str, exchange: str, interval, n_bars: int) -> pd.DataFrame:
+    """
+    Últimas n_bars barras do timeframe: derivadas da base quando há regra em
+    BASES (RESAMPLE_ENABLED), senão download nativo pelo bar store
+    """
+    intervalo = _intervalo_str(interval)
+    base = BASES.get(intervalo)
+
+    if not get_settings().RESAMPLE_ENABLED or base is None:
+        return _barras_nativas(symbol, exchange, interval, n_bars)
+
+    if base == intervalo:
+        return _barras_nativas(symbol, exchange, interval, n_bars)
+
+    n_base = _barras_base(intervalo, base, n_bars)
+    df_base = _barras_nativas(symbol, exchange, Interval(base), n_base)
+
+    # Menos barras que o pedido: histórico completo desde a listagem
+    df = reamostrar(df_base, intervalo, truncada=len(df_base) >= n_base)
+    logger.info(f"🧮 {symbol} {intervalo}: {len(df)} barras derivadas de {len(df_base)} barras {base}")
+    return df.tail(n_bars)
+
+def _barras_nativas(symbol: str, exchange: str, interval, n_bars: int) -> pd.DataFrame:
+    return obter_barras(
+        symbol, exchange, interval, n_bars,
+        fetch_fn=lambda n: get_pool().get_hist(symbol, exchange, interval, n)
+    )
+
+def _barras_base(intervalo: str, base: str, n_bars: int) -> int:
+    """Barras base para n_bars derivadas (+1 barra derivada parcial no início), no limite do download"""
+    razao = REGRAS[intervalo][1] // REGRAS[base][1]
+    return min((n_bars + 1) * razao, get_settings().RESAMPLE_MAX_BASE_BARS)
+
+def reamostrar(df: pd.DataFrame, intervalo: str, truncada: bool = True) -> pd.DataFrame:
+    """
+    OHLCV base -> OHLCV do intervalo (open primeiro, high máx, low mín,
+    close último, volume soma)
+
+    truncada: a base é um recorte do histórico. A primeira barra derivada é
+    descartada se a base começa depois do seu início (barra incompleta). Com
+    o histórico completo (False) ela é mantida: é a barra da listagem, que o
+    vendor também entrega parcial. A última é a barra em formação, como no vendor.
+    """
+    regra = REGRAS[intervalo][0]
+    utc = _para_utc(df.index)
+
+    # origin="epoch" alinha 4H em 00:00 UTC; regras de calendário (W-MON, MS) já são ancoradas
+    ancora = {"origin": "epoch"} if regra.endswith("h") else {}
+    grupos = df[list(AGREGACAO)].set_axis(utc).resample(regra, label="left", closed="left", **ancora)
+    derivado = grupos.agg(AGREGACAO).dropna(subset=["open"])
+
+    if truncada and len(derivado) and derivado.index[0] < utc[0]:
+        derivado = derivado.iloc[1:]
+
+    derivado.index = _para_local(derivado.index)
+    derivado.index.name = df.index.name
+    if "symbol" in df.columns:
+        derivado.insert(0, "symbol", df["symbol"].iloc[0])
+    return derivado
+
+def inicio_barra(intervalo: str, ts_utc: pd.Timestamp) -> pd.Timestamp:
+    """Início (UTC ingênuo) da barra do intervalo que contém ts_utc, nas mesmas fronteiras de reamostrar"""
+    regra = REGRAS[intervalo][0]
+    if regra == "W-MON":
+        return ts_utc.normalize() - pd.Timedelta(days=ts_utc.weekday())
+    if regra == "MS":
+        return ts_utc.normalize().replace(day=1)
+    return ts_utc.floor(regra)
+
+def _para_utc(indice: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Índice local ingênuo (tvDatafeed) -> UTC ingênuo, respeitando horário de verão"""
+    return pd.DatetimeIndex(pd.to_datetime([round(ts.to_pydatetime().timestamp()) for ts in indice], unit="s"))
+
+def _para_local(indice: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """UTC ingênuo -> local ingênuo (mesmo formato do tvDatafeed)"""
+    return pd.DatetimeIndex([datetime.fromtimestamp(ts.value // 10**9) for ts in indice])
@@ -0,0 +1,272 @@
+# app/services/utils/helpers/tradingview/session_pool.py
+
+"""
+Pool de sessões TradingView (tvDatafeed) compartilhado pelo processo
+
+- Login (usuário/senha) feito uma única vez: o auth token é reaproveitado por
+  todas as sessões e persistido em tradingview_sessao, sobrevivendo a restarts
+  (validade: TV_TOKEN_MAX_AGE_HOURS).
+- TvDatafeed guarda o websocket na instância: cada sessão atende uma
+  thread por vez; até TV_POOL_SIZE downloads simultâneos.
+- Saúde por resultado real (sem fetch de teste): sessão que lança exceção
+  é descartada; falha com token autenticado renova o login uma vez e repete.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from tvDatafeed import TvDatafeed
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_ANONIMO = "unauthorized_user_token"
+RENOVACAO_MINIMA_SECONDS = 300  # evita relogin em série (ex.: símbolo sem dados)
+
+class _Sessao:
+    __slots__ = ("id", "tv", "geracao", "requisicoes", "criada_em")
+
+    def __init__(self, id_sessao: int, tv: TvDatafeed, geracao: int):
+        self.id = id_sessao
+        self.tv = tv
+        self.geracao = geracao
+        self.requisicoes = 0
+        self.criada_em = time.time()
+
+class TradingViewPool:
+    def __init__(self, tamanho: int, timeout: float):
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres: List[_Sessao] = []
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._lock = threading.Lock()
+        self._token_lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._token_origem: Optional[str] = None
+        self._geracao = 0
+        self._login_em = 0.0
+        self._proximo_id = 0
+        self._stats = {
+            "requisicoes": 0, "falhas": 0, "falhas_consecutivas": 0, "sessoes_criadas": 0,
+            "sessoes_descartadas": 0, "logins": 0, "renovacoes_token": 0,
+            "ultimo_sucesso": None, "ultima_falha": None, "ultimo_erro": None
+        }
+
+    # ==========================================
+    # TOKEN
+    # ==========================================
+
+    def _obter_token(self) -> str:
+        if self._token is None:
+            with self._token_lock:
+                if self._token is None:
+                    self._token = _carregar_token()
+                    self._token_origem = "persistido" if self._token else None
+                    if self._token is None:
+                        self._login()
+        return self._token
+
+    def _login(self):
+        """Handshake usuário/senha (token_lock adquirido)"""
+        settings = get_settings()
+        token = None
+        if settings.TV_USERNAME and settings.TV_PASSWORD:
+            try:
+                logger.info("🔗 Login TradingView com credenciais...")
+                token = getattr(TvDatafeed(username=settings.TV_USERNAME, password=settings.TV_PASSWORD), "token", None)
+                self._stats["logins"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Login TradingView falhou: {e}")
+
+        if token and token != TOKEN_ANONIMO:
+            _salvar_token(token)
+            self._token, self._token_origem = token, "login"
+            logger.info("✅ TradingView autenticado (token persistido)")
+        else:
+            self._token, self._token_origem = TOKEN_ANONIMO, "anonimo"
+            logger.warning("⚠️ TradingView sem login - dados limitados")
+        self._geracao += 1
+        self._login_em = time.monotonic()
+
+    def renovar_token(self, token_usado: Optional[str] = None):
+        """Novo login; ignora se outra thread já renovou desde `token_usado`"""
+        with self._token_lock:
+            if token_usado is not None and self._token != token_usado:
+                return
+            if self._token_origem == "login" and time.monotonic() - self._login_em < RENOVACAO_MINIMA_SECONDS:
+                return
+            self._stats["renovacoes_token"] += 1
+            self._login()
+
+    def autenticado(self) -> bool:
+        return self._token not in (None, TOKEN_ANONIMO)
+
+    # ==========================================
+    # SESSÕES
+    # ==========================================
+
+    @contextmanager
+    def sessao(self):
+        """Empresta uma sessão exclusiva (bloqueia até `timeout` se o pool estiver cheio)"""
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise Exception(f"Pool TradingView esgotado ({self.tamanho} sessões ocupadas por {self.timeout}s)")
+
+        sessao = None
+        saudavel = False
+        try:
+            token = self._obter_token()
+            with self._lock:
+                sessao = self._livres.pop() if self._livres else None
+                if sessao is None:
+                    self._proximo_id += 1
+                    self._stats["sessoes_criadas"] += 1
+                    sessao = _Sessao(self._proximo_id, TvDatafeed(), -1)
+
+            # TvDatafeed() sem credenciais não faz login; recebe o token compartilhado
+            if sessao.geracao != self._geracao:
+                sessao.tv.token = token
+                sessao.geracao = self._geracao
+
+            yield sessao.tv
+            saudavel = True
+
+        finally:
+            if sessao is not None:
+                with self._lock:
+                    if saudavel:
+                        sessao.requisicoes += 1
+                        self._livres.append(sessao)
+                    else:
+                        self._stats["sessoes_descartadas"] += 1
+            self._vagas.release()
+
+    def get_hist(self, symbol: str, exchange: str, interval, n_bars: int):
+        """
+        get_hist numa sessão do pool
+
+        Resultado vazio/exceção com token autenticado: renova o login e repete uma vez
+        """
+        erro = None
+        for tentativa in (1, 2):
+            token_usado = self._obter_token()
+            df = None
+            try:
+                with self.sessao() as tv:
+                    df = tv.get_hist(symbol=symbol, exchange=exchange, interval=interval, n_bars=n_bars)
+            except Exception as e:
+                erro = e
+
+            if df is not None and not df.empty:
+                self._registrar(True)
+                return df
+
+            self._registrar(False, erro or "dados vazios")
+            if tentativa == 1 and token_usado != TOKEN_ANONIMO:
+                logger.warning(f"⚠️ TradingView {symbol} {interval}: {erro or 'dados vazios'} - renovando token")
+                self.renovar_token(token_usado)
+                continue
+            break
+
+        if erro is not None:
+            raise erro
+        return df
+
+    def _registrar(self, sucesso: bool, erro=None):
+        with self._lock:
+            self._stats["requisicoes"] += 1
+            if sucesso:
+                self._stats["falhas_consecutivas"] = 0
+                self._stats["ultimo_sucesso"] = datetime.utcnow().isoformat()
+            else:
+                self._stats["falhas"] += 1
+                self._stats["falhas_consecutivas"] += 1
+                self._stats["ultima_falha"] = datetime.utcnow().isoformat()
+                self._stats["ultimo_erro"] = str(erro)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "saudavel": self._stats["falhas_consecutivas"] < 3,
+                "tamanho": self.tamanho,
+                "sessoes_livres": len(self._livres),
+                "token": self._token_origem,
+            }
+
+# ==========================================
+# PERSISTÊNCIA DO TOKEN
+# ==========================================
+
+_tabela_verificada = False
+
+def _create_table_if_not_exists():
+    global _tabela_verificada
+    if _tabela_verificada:
+        return
+    from app.services.utils.helpers.postgres.base import execute_query
+
+    execute_query("""
+        CREATE TABLE IF NOT EXISTS tradingview_sessao (
+            usuario VARCHAR(100) PRIMARY KEY,
+            token TEXT NOT NULL,
+            criado_em TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+    _tabela_verificada = True
+
+def _carregar_token() -> Optional[str]:
+    """Token salvo para TV_USERNAME, se ainda dentro de TV_TOKEN_MAX_AGE_HOURS"""
+    settings = get_settings()
+    if not settings.TV_USERNAME:
+        return None
+    try:
+        from app.services.utils.helpers.postgres.base import execute_query
+
+        _create_table_if_not_exists()
+        linha = execute_query(
+            "SELECT token FROM tradingview_sessao WHERE usuario = %s AND criado_em >= %s",
+            (settings.TV_USERNAME, datetime.utcnow() - timedelta(hours=settings.TV_TOKEN_MAX_AGE_HOURS)),
+            fetch_one=True
+        )
+        if linha:
+            logger.info("♻️ Token TradingView reaproveitado (sem novo login)")
+            return linha["token"]
+    except Exception as e:
+        logger.warning(f"⚠️ Token TradingView persistido indisponível: {str(e)}")
+    return None
+
+def _salvar_token(token: str):
+    try:
+        from app.services.utils.helpers.postgres.base import execute_query
+
+        _create_table_if_not_exists()
+        execute_query("""
+            INSERT INTO tradingview_sessao (usuario, token, criado_em) VALUES (%s, %s, %s)
+            ON CONFLICT (usuario) DO UPDATE SET token = EXCLUDED.token, criado_em = EXCLUDED.criado_em
+        """, (get_settings().TV_USERNAME, token, datetime.utcnow()))
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao persistir token TradingView: {str(e)}")
+
+# ==========================================
+# POOL DO PROCESSO
+# ==========================================
+
+_pool: Optional[TradingViewPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> TradingViewPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                _pool = TradingViewPool(settings.TV_POOL_SIZE, settings.TV_POOL_TIMEOUT_SECONDS)
+                logger.info(f"🚀 Pool TradingView criado ({settings.TV_POOL_SIZE} sessões)")
+    return _pool
+
+def get_hist(symbol: str, exchange: str, interval, n_bars: int):
+    """Atalho: get_hist no pool do processo"""
+    return get_pool().get_hist(symbol, exchange, interval, n_bars)
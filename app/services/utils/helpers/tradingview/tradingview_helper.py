@@ -2,103 +2,15 @@
 
 import logging
 import pandas as pd
-from tvDatafeed import TvDatafeed, Interval
+from tvDatafeed import Interval
 from app.config import get_settings
-from typing import Optional, Dict, Union
+from app.services.utils.helpers.tradingview.resampler import buscar_barras
+from app.services.utils.helpers.tradingview.session_pool import get_pool
+from app.services.utils.helpers.tradingview import indicator_engine, indicator_state
+from typing import Optional, Dict, Union, Tuple
 
 logger = logging.getLogger(__name__)
 
-class TradingViewSession:
-    """
-    Singleton para gerenciar conexão TradingView
-    MODERNIZADO: Remove auto_login deprecated e adiciona fallback robusto
-    """
-    _instance = None
-    _connection_tested = False
-
-    @classmethod
-    def get_session(cls, force_reconnect: bool = False) -> TvDatafeed:
-        """
-        Obtém sessão TradingView com fallback robusto
-        
-        Args:
-            force_reconnect: Força nova conexão mesmo se já existe
-            
-        Returns:
-            TvDatafeed: Instância conectada
-            
-        Raises:
-            Exception: Se não conseguir conectar
-        """
-        if cls._instance is None or force_reconnect:
-            cls._instance = cls._create_connection()
-            cls._connection_tested = False
-        
-        # Testar conexão na primeira vez
-        if not cls._connection_tested:
-            cls._test_connection()
-            cls._connection_tested = True
-            
-        return cls._instance
-
-    @classmethod
-    def _create_connection(cls) -> TvDatafeed:
-        """Cria conexão TradingView com fallback"""
-        try:
-            settings = get_settings()
-            
-            # Tentar com credenciais primeiro
-            if hasattr(settings, 'TV_USERNAME') and settings.TV_USERNAME and settings.TV_PASSWORD:
-                try:
-                    logger.info("🔗 Conectando TradingView com credenciais...")
-                    tv = TvDatafeed(
-                        username=settings.TV_USERNAME,
-                        password=settings.TV_PASSWORD
-                    )
-                    logger.info("✅ TradingView conectado com login")
-                    return tv
-                except Exception as e:
-                    logger.warning(f"⚠️ Login TradingView falhou: {e}")
-            
-            # Fallback: modo anônimo
-            logger.info("🔗 Conectando TradingView modo anônimo...")
-            tv = TvDatafeed()
-            logger.info("✅ TradingView conectado sem login")
-            return tv
-            
-        except Exception as e:
-            logger.error(f"❌ Erro conectando TradingView: {str(e)}")
-            raise Exception(f"Conexão TradingView falhou: {str(e)}")
-
-    @classmethod
-    def _test_connection(cls) -> bool:
-        """Testa se a conexão está funcionando"""
-        try:
-            # Teste simples: buscar 1 barra de dados
-            test_df = cls._instance.get_hist(
-                symbol='BTCUSDT',
-                exchange='BINANCE',
-                interval=Interval.in_daily,
-                n_bars=1
-            )
-            
-            if test_df is not None and not test_df.empty:
-                logger.info("✅ Conexão TradingView testada com sucesso")
-                return True
-            else:
-                raise Exception("Teste retornou dados vazios")
-                
-        except Exception as e:
-            logger.error(f"❌ Teste de conexão TradingView falhou: {str(e)}")
-            raise Exception(f"Conexão TradingView não funcional: {str(e)}")
-
-def get_tv_datafeed(force_reconnect: bool = False) -> TvDatafeed:
-    """
-    Função pública para obter sessão TradingView
-    COMPATIBILIDADE: Mantém interface original
-    """
-    return TradingViewSession.get_session(force_reconnect)
-
 def fetch_ohlc_data(
     symbol: str = "BTCUSDT",
     exchange: str = "BINANCE", 
@@ -108,6 +20,7 @@ def fetch_ohlc_data(
 ) -> pd.DataFrame:
     """
     NOVA FUNÇÃO: Busca dados OHLC padronizada e reutilizável
+    1W/1M são derivados da série diária (resampler): um download para todos
     
     Args:
         symbol: Símbolo (ex: BTCUSDT)
@@ -125,14 +38,7 @@ def fetch_ohlc_data(
     try:
         logger.info(f"📊 Buscando {symbol} {exchange} {interval} ({n_bars} barras)")
         
-        tv = get_tv_datafeed()
-        
-        df = tv.get_hist(
-            symbol=symbol,
-            exchange=exchange,
-            interval=interval,
-            n_bars=n_bars
-        )
+        df = buscar_barras(symbol, exchange, interval, n_bars)
         
         if df is None or df.empty:
             raise Exception(f"TradingView retornou dados vazios para {symbol}")
@@ -183,7 +89,11 @@ def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
         if len(prices) < period:
             raise Exception(f"Dados insuficientes: {len(prices)} < {period}")
         
-        ema = prices.ewm(span=period, adjust=False).mean()
+        ema = pd.Series(
+            indicator_engine.ema(prices.to_numpy(dtype=float), period),
+            index=prices.index,
+            name=prices.name
+        )
         
         if ema.isna().any():
             raise Exception("EMA contém valores NaN")
@@ -202,24 +112,12 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
         if len(prices) < period + 1:  # +1 para diff
             raise Exception(f"Dados insuficientes: {len(prices)} < {period + 1}")
         
-        # Calcular mudanças
-        delta = prices.diff().dropna()
-        
-        # Separar ganhos e perdas
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        # Usar EWM em vez de rolling para evitar NaN
-        alpha = 1.0 / period
-        avg_gain = gain.ewm(alpha=alpha, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=alpha, adjust=False).mean()
-        
-        # Evitar divisão por zero
-        avg_loss = avg_loss.replace(0, 1e-10)
-        
-        # Calcular RS e RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        # Wilder (EWM alpha=1/period) sobre as variações; índice a partir do 1º delta
+        rsi = pd.Series(
+            indicator_engine.rsi_wilder(prices.to_numpy(dtype=float), period),
+            index=prices.index[1:],
+            name=prices.name
+        )
         
         # Validar resultado
         if rsi.isna().any():
@@ -231,6 +129,38 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
         logger.error(f"❌ Erro calculando RSI: {str(e)}")
         raise Exception(f"RSI falhou: {str(e)}")
 
+def calculate_ema_atual(prices: pd.Series, period: int, chave: Optional[Tuple] = None) -> float:
+    """
+    EMA da última barra
+
+    Com chave (symbol, exchange, interval) usa o estado incremental:
+    só as barras fechadas desde a última chamada são processadas (O(1) cada).
+    Sem chave (ou em falha do estado) recalcula a série completa.
+    """
+    if chave is not None and get_settings().INDICATOR_STATE_ENABLED:
+        if len(prices) < period:
+            raise Exception(f"EMA{period} falhou: Dados insuficientes: {len(prices)} < {period}")
+        try:
+            return float(indicator_state.ema_atual(chave, prices, period))
+        except Exception as e:
+            logger.warning(f"⚠️ Estado EMA{period} indisponível, recalculando: {str(e)}")
+
+    return float(calculate_ema(prices, period).iloc[-1])
+
+def calculate_rsi_atual(prices: pd.Series, period: int = 14, chave: Optional[Tuple] = None) -> float:
+    """
+    RSI da última barra (estado incremental quando há chave, como calculate_ema_atual)
+    """
+    if chave is not None and get_settings().INDICATOR_STATE_ENABLED:
+        if len(prices) < period + 1:
+            raise Exception(f"RSI falhou: Dados insuficientes: {len(prices)} < {period + 1}")
+        try:
+            return float(indicator_state.rsi_atual(chave, prices, period))
+        except Exception as e:
+            logger.warning(f"⚠️ Estado RSI{period} indisponível, recalculando: {str(e)}")
+
+    return float(calculate_rsi(prices, period).iloc[-1])
+
 def get_ema144_distance(symbol: str = "BTCUSDT", exchange: str = "BINANCE") -> float:
     """
     NOVA FUNÇÃO: EMA144 distance reutilizável
@@ -286,11 +216,8 @@ def get_rsi_current(
             n_bars=2000  # Suficiente para RSI14
         )
         
-        # Calcular RSI via função padronizada
-        rsi = calculate_rsi(df['close'], period=period)
-        
-        # RSI atual
-        rsi_atual = float(rsi.iloc[-1])
+        # RSI atual via estado incremental
+        rsi_atual = calculate_rsi_atual(df['close'], period=period, chave=(symbol, exchange, timeframe))
         
         # Validar range
         if not (0 <= rsi_atual <= 100):
@@ -320,51 +247,39 @@ def calculate_bollinger_bands(
         if len(prices) < period:
             raise Exception(f"Dados insuficientes: {len(prices)} < {period}")
         
-        # Middle Band (SMA)
-        middle = prices.rolling(window=period).mean()
-        
-        # Standard Deviation
-        std = prices.rolling(window=period).std()
-        
-        # Upper e Lower Bands
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
+        # SMA ± std_dev * desvio padrão móvel
+        upper, middle, lower = indicator_engine.bollinger(prices.to_numpy(dtype=float), period, std_dev)
         
         return {
-            'upper': upper,
-            'middle': middle,
-            'lower': lower
+            'upper': pd.Series(upper, index=prices.index),
+            'middle': pd.Series(middle, index=prices.index),
+            'lower': pd.Series(lower, index=prices.index)
         }
         
     except Exception as e:
         logger.error(f"❌ Erro Bollinger Bands: {str(e)}")
         raise Exception(f"Bollinger Bands falhou: {str(e)}")
 
-# COMPATIBILIDADE: Manter funções antigas para não quebrar imports existentes
-def get_tv_session():
-    """DEPRECATED: Use get_tv_datafeed()"""
-    return get_tv_datafeed()
-
 # HEALTH CHECK
 def test_tradingview_connection() -> Dict:
-    """Testa conexão TradingView e retorna status"""
+    """Testa conexão TradingView (1 barra pelo pool) e retorna status + saúde do pool"""
     try:
-        tv = get_tv_datafeed(force_reconnect=True)
-        
-        # Teste básico
-        df = tv.get_hist('BTCUSDT', 'BINANCE', Interval.in_daily, 1)
+        df = get_pool().get_hist('BTCUSDT', 'BINANCE', Interval.in_daily, 1)
+        pool = get_pool().status()
         
         if df is not None and not df.empty:
             return {
                 "status": "success",
                 "message": "TradingView conectado e funcional",
                 "test_data": f"Última barra: {df.index[-1]}",
-                "connection_type": "com_login" if hasattr(get_settings(), 'TV_USERNAME') and get_settings().TV_USERNAME else "anonimo"
+                "connection_type": "com_login" if get_pool().autenticado() else "anonimo",
+                "pool": pool
             }
         else:
             return {
                 "status": "error",
-                "message": "TradingView conectado mas retornou dados vazios"
+                "message": "TradingView conectado mas retornou dados vazios",
+                "pool": pool
             }
             
     except Exception as e:
@@ -439,7 +354,8 @@ def detect_resistance_breakout(
 def get_ema144_distance_by_timeframe(
     timeframe: Interval = Interval.in_daily,
     symbol: str = "BTCUSDT",
-    exchange: str = "BINANCE"
+    exchange: str = "BINANCE",
+    snapshot=None
 ) -> float:
     """
     Calcula distância EMA144 para timeframe específico
@@ -448,6 +364,7 @@ def get_ema144_distance_by_timeframe(
         timeframe: Interval (in_daily, in_4_hour, etc)
         symbol: Par de negociação
         exchange: Exchange
+        snapshot: MarketSnapshot compartilhado (evita nova busca)
         
     Returns:
         float: Distância percentual da EMA144
@@ -456,21 +373,13 @@ def get_ema144_distance_by_timeframe(
         tf_name = "4H" if timeframe == Interval.in_4_hour else "1D"
         logger.info(f"📊 Calculando EMA144 distance {tf_name}...")
         
-        # Buscar dados
-        df = fetch_ohlc_data(
-            symbol=symbol,
-            exchange=exchange,
-            interval=timeframe,
-            n_bars=2000  # Suficiente para EMA144
-        )
+        if snapshot is None:
+            from app.services.utils.helpers.tradingview.market_snapshot import MarketSnapshot
+            snapshot = MarketSnapshot(symbol, exchange)
         
-        # Calcular EMA144
-        ema_144 = calculate_ema(df['close'], period=144)
-        
-        # Preço atual e distância
-        preco_atual = float(df['close'].iloc[-1])
-        ema_144_atual = float(ema_144.iloc[-1])
-        distance_percent = ((preco_atual - ema_144_atual) / ema_144_atual) * 100
+        # EMA144 e distância sobre 2000 barras (suficiente para EMA144)
+        ema_144_atual = snapshot.ema_atual(timeframe, 144, 2000)
+        distance_percent = snapshot.distancia_ema(timeframe, 144, 2000)
         
         logger.info(f"✅ EMA144 {tf_name}: ${ema_144_atual:,.2f}, Distância: {distance_percent:+.2f}%")
         
@@ -481,12 +390,13 @@ def get_ema144_distance_by_timeframe(
         raise Exception(f"EMA144 {tf_name} indisponível: {str(e)}")
 
 # Manter função legacy
-def get_ema144_distance(symbol: str = "BTCUSDT", exchange: str = "BINANCE") -> float:
+def get_ema144_distance(symbol: str = "BTCUSDT", exchange: str = "BINANCE", snapshot=None) -> float:
     """
     Legacy: EMA144 distance diário
     """
     return get_ema144_distance_by_timeframe(
         timeframe=Interval.in_daily,
         symbol=symbol,
-        exchange=exchange
+        exchange=exchange,
+        snapshot=snapshot
     )
\ No newline at end of file
@@ -0,0 +1,128 @@
+# benchmarks/backtest_benchmark.py
+#
+# Mede o motor de backtest vetorizado (app/services/backtest) numa série
+# sintética de N anos x V variantes da matriz e confere a paridade com as
+# funções escalares de produção (calculate_ema_score, calcular_mvrv_score,
+# calcular_nupl_score, calcular_puell_score, calcular_reserve_risk) num
+# loop dia a dia com EMAs semanais via pandas (resample + ewm).
+#
+# Uso (na raiz do repositório):
+#   python benchmarks/backtest_benchmark.py
+#   python benchmarks/backtest_benchmark.py --anos 10 --variantes 1 100 1000
+#   python benchmarks/backtest_benchmark.py --sem-paridade
+
+import argparse
+import logging
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.backtest.dados_helper import gerar_fixture_sintetica
+from app.services.backtest.engine import executar_backtest, grade_alavancagem, variantes_escala, simular
+from app.services.backtest.scores_vetorizados import (
+    ParametrosScore, emas_semanais_diarias, score_tendencia_vetorizado, score_ciclo_vetorizado,
+    escala_linear, pontuar_faixas
+)
+from app.services.tendencia.utils.ema_score_calculator import calculate_ema_score
+from app.services.scores.ciclos import (
+    calcular_mvrv_score, calcular_nupl_score, calcular_puell_score, calcular_reserve_risk
+)
+
+# Faixas da matriz (app/db/decisao_estrategica.sql) com colunas da v2
+FAIXAS_TENDENCIA = [(88, 100), (66, 87), (35, 65), (13, 34), (0, 12)]
+FAIXAS_CICLO = [(80, 100), (60, 79), (0, 59)]
+ALAVANCAGEM = [3.0, 2.0, 1.0, 2.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0, 0.0, 1.0, 3.0, 2.0, 1.0]
+
+def matriz_exemplo() -> list:
+    linhas = []
+    for i, ((t_min, t_max), (c_min, c_max)) in enumerate(
+            (t, c) for t in FAIXAS_TENDENCIA for c in FAIXAS_CICLO):
+        linhas.append({
+            "id": i + 1, "alavancagem": ALAVANCAGEM[i],
+            "score_tendencia_min": t_min, "score_tendencia_max": t_max,
+            "score_onchain_min": c_min, "score_onchain_max": c_max
+        })
+    return linhas
+
+def paridade(dados: dict, grade: np.ndarray):
+    """Loop diário com as funções escalares vs motor vetorizado"""
+    logging.disable(logging.INFO)
+    datas = pd.to_datetime(dados["data"])
+    close = pd.Series(dados["close"], index=datas)
+
+    score_t_escalar, score_c_escalar, exposicao = [], [], []
+    for i in range(len(close)):
+        # Só semanas fechadas (domingo fecha a própria semana) + close do dia
+        ate_hoje = close.iloc[:i + 1]
+        semanal = ate_hoje.resample("W-SUN").last()
+        if datas[i].weekday() != 6:
+            semanal = semanal.iloc[:-1]
+        if semanal.empty:
+            emas = {p: close.iloc[i] for p in (10, 20, 50, 100, 200)}
+        else:
+            emas = {p: semanal.ewm(span=p, adjust=False).mean().iloc[-1] for p in (10, 20, 50, 100, 200)}
+        score_t = calculate_ema_score(close.iloc[i], emas)["score"]
+
+        score_c = round(calcular_mvrv_score(dados["mvrv_z_score"][i]) * 10, 1)
+        score_t_escalar.append(score_t)
+        score_c_escalar.append(score_c)
+        exposicao.append(max(np.nan_to_num(grade[int(score_t), int(score_c)], nan=1.0), 1.0))
+    logging.disable(logging.NOTSET)
+
+    emas_vet = emas_semanais_diarias(dados["data"], dados["close"])
+    score_t_vet = score_tendencia_vetorizado(dados["close"], emas_vet)
+    score_c_vet = score_ciclo_vetorizado(dados["mvrv_z_score"], dados["nupl"], dados["reserve_risk"], dados["puell_multiple"])
+
+    equity_escalar = simular(dados["close"], np.array([exposicao]))["equity"][0]
+    equity_vet = executar_backtest(dados, grade).equity[0]
+
+    # Demais componentes do ciclo (peso 0 em produção) conferidos isoladamente
+    params = ParametrosScore()
+    componentes = [
+        ("nupl", calcular_nupl_score, pontuar_faixas(dados["nupl"], params.nupl_limites), dados["nupl"]),
+        ("puell", calcular_puell_score, pontuar_faixas(dados["puell_multiple"], params.puell_limites), dados["puell_multiple"]),
+        ("reserve_risk", calcular_reserve_risk, escala_linear(dados["reserve_risk"], *params.reserve_risk_limites), dados["reserve_risk"]),
+    ]
+
+    print("\nParidade com funções escalares:")
+    print(f"  score_tendencia: {int((np.array(score_t_escalar) != score_t_vet).sum())} dias diferentes de {len(close)}")
+    print(f"  score_ciclo:     {int((np.abs(np.array(score_c_escalar) - score_c_vet) > 1e-9).sum())} dias diferentes")
+    for nome, func, vetor, valores in componentes:
+        escalar = np.array([func(v) for v in valores], dtype=float)
+        print(f"  {nome:<15}: {int((np.abs(escalar - vetor) > 1e-9).sum())} dias diferentes")
+    print(f"  equity final:    escalar {equity_escalar[-1]:.6f} | vetorizado {equity_vet[-1]:.6f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backtest vetorizado da matriz estratégica")
+    parser.add_argument("--anos", type=int, default=10)
+    parser.add_argument("--variantes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sem-paridade", action="store_true")
+    parser.add_argument("--dias-paridade", type=int, default=1500, help="Dias do loop escalar (lento)")
+    args = parser.parse_args()
+
+    dados = gerar_fixture_sintetica(args.anos * 365)
+    grade = grade_alavancagem(matriz_exemplo())
+    print(f"Série sintética: {args.anos * 365} dias | matriz {len(FAIXAS_TENDENCIA) * len(FAIXAS_CICLO)} cenários")
+    print(f"{'variantes':>10} | {'tempo (ms)':>11} | {'ms/variante':>12}")
+
+    for v in args.variantes:
+        grades = variantes_escala(grade, np.linspace(0.5, 1.5, v))
+        melhor = None
+        for _ in range(args.repeat):
+            inicio = time.perf_counter()
+            executar_backtest(dados, grades)
+            decorrido = time.perf_counter() - inicio
+            melhor = decorrido if melhor is None else min(melhor, decorrido)
+        print(f"{v:>10} | {melhor * 1000:>11.1f} | {melhor * 1000 / v:>12.3f}")
+
+    if not args.sem_paridade:
+        recorte = {k: v[:args.dias_paridade] for k, v in dados.items()}
+        paridade(recorte, grade)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/indicator_engine_benchmark.py
+#
+# Compara o motor vetorizado (indicator_engine) com a abordagem pandas por chamada
+# usada antes (ewm por período, RSI via Series, rolling, loop .iloc de cruzamentos).
+#
+# Uso (na raiz do repositório):
+#   python benchmarks/indicator_engine_benchmark.py
+#   python benchmarks/indicator_engine_benchmark.py --bars 2000 10000 50000 --repeat 20
+#   python benchmarks/indicator_engine_benchmark.py --sem-cruzamentos   # só kernels numéricos
+
+import argparse
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.utils.helpers.tradingview import indicator_engine as engine
+
+EMA_PERIODS = [10, 17, 20, 34, 50, 100, 144, 200]
+
+def gerar_ohlc(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Passeio aleatório log-normal com OHLC coerente"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    spread = np.abs(rng.normal(0, 0.005, n_bars)) * close
+    return pd.DataFrame({
+        "open": np.concatenate(([close[0]], close[:-1])),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close
+    })
+
+# ---------- abordagem anterior (pandas por chamada) ----------
+
+def legado(df: pd.DataFrame, com_cruzamentos: bool = True) -> dict:
+    close = df["close"]
+    emas = {p: close.ewm(span=p, adjust=False).mean() for p in EMA_PERIODS}
+
+    delta = close.diff().dropna()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / 14, adjust=False).mean().replace(0, 1e-10)
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    middle = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    upper, lower = middle + std * 2, middle - std * 2
+
+    prev_close = close.shift(1).fillna(close.iloc[0])
+    tr = pd.concat([df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()], axis=1).max(axis=1)
+    tr.iloc[0] = df["high"].iloc[0] - df["low"].iloc[0]
+    atr = tr.ewm(alpha=1 / 14, adjust=False).mean()
+
+    ema_17, ema_34 = emas[17], emas[34]
+    sinais = np.zeros(len(df), dtype=np.int8)
+    for i in range(1, len(df) if com_cruzamentos else 0):
+        if ema_17.iloc[i - 1] <= ema_34.iloc[i - 1] and ema_17.iloc[i] > ema_34.iloc[i]:
+            sinais[i] = 1
+        elif ema_17.iloc[i - 1] >= ema_34.iloc[i - 1] and ema_17.iloc[i] < ema_34.iloc[i]:
+            sinais[i] = -1
+
+    resultado = {"emas": np.vstack([emas[p].values for p in EMA_PERIODS]), "rsi": rsi.values,
+                 "upper": upper.values, "lower": lower.values, "atr": atr.values}
+    if com_cruzamentos:
+        resultado["cruzamentos"] = sinais
+    return resultado
+
+# ---------- motor vetorizado ----------
+
+def vetorizado(df: pd.DataFrame, com_cruzamentos: bool = True) -> dict:
+    close = df["close"].to_numpy(dtype=float)
+    emas = engine.ema_multi(close, EMA_PERIODS)
+    upper, _, lower = engine.bollinger(close, 20, 2.0)
+
+    resultado = {
+        "emas": emas,
+        "rsi": engine.rsi_wilder(close, 14),
+        "upper": upper,
+        "lower": lower,
+        "atr": engine.atr(df["high"].to_numpy(), df["low"].to_numpy(), close, 14)
+    }
+    if com_cruzamentos:
+        resultado["cruzamentos"] = engine.cruzamentos(emas[EMA_PERIODS.index(17)], emas[EMA_PERIODS.index(34)])
+    return resultado
+
+def diferenca_maxima(a: dict, b: dict) -> float:
+    """Maior diferença relativa entre os resultados (paridade)"""
+    maior = 0.0
+    for chave in a:
+        x, y = np.asarray(a[chave], dtype=float), np.asarray(b[chave], dtype=float)
+        validos = ~(np.isnan(x) | np.isnan(y))
+        escala = np.maximum(np.abs(x[validos]), 1.0)
+        maior = max(maior, float(np.max(np.abs(x[validos] - y[validos]) / escala)))
+    return maior
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator_engine vs pandas por chamada")
+    parser.add_argument("--bars", type=int, nargs="+", default=[2000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--sem-cruzamentos", action="store_true",
+                        help="Exclui a varredura de cruzamentos (isola os kernels EMA/RSI/Bollinger/ATR)")
+    args = parser.parse_args()
+    com_cruzamentos = not args.sem_cruzamentos
+
+    extra = ", cruzamentos EMA17/34" if com_cruzamentos else ""
+    print(f"Indicadores: EMAs {EMA_PERIODS}, RSI14, Bollinger 20/2, ATR14{extra}")
+    print(f"{'barras':>8} | {'pandas (ms)':>12} | {'engine (ms)':>12} | {'speedup':>8} | {'dif. máx':>10}")
+
+    for n_bars in args.bars:
+        df = gerar_ohlc(n_bars)
+        # Loop .iloc é lento: menos repetições para ele em séries longas
+        repeticoes_legado = max(1, args.repeat // (1 + n_bars // 10000)) if com_cruzamentos else args.repeat
+
+        tempo_legado = min(timeit.repeat(lambda: legado(df, com_cruzamentos), number=1, repeat=repeticoes_legado))
+        tempo_engine = min(timeit.repeat(lambda: vetorizado(df, com_cruzamentos), number=1, repeat=args.repeat))
+        paridade = diferenca_maxima(legado(df, com_cruzamentos), vetorizado(df, com_cruzamentos))
+
+        print(f"{n_bars:>8} | {tempo_legado * 1000:>12.2f} | {tempo_engine * 1000:>12.2f} | "
+              f"{tempo_legado / tempo_engine:>7.1f}x | {paridade:>10.1e}")
+
+if __name__ == "__main__":
+    main()
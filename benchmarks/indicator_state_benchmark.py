@@ -0,0 +1,74 @@
+# benchmarks/indicator_state_benchmark.py
+#
+# Simula refresh a cada barra nova: estado incremental (indicator_state) vs
+# recálculo completo da série (indicator_engine), e verifica a paridade do
+# estado final contra o recálculo desde a origem (verificar_estado).
+#
+# Uso (na raiz do repositório, variáveis de ambiente do app carregadas):
+#   python benchmarks/indicator_state_benchmark.py
+#   python benchmarks/indicator_state_benchmark.py --historico 5000 --barras-novas 500
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config import get_settings
+from app.services.utils.helpers.tradingview import indicator_engine as engine
+from app.services.utils.helpers.tradingview import indicator_state
+
+EMA_PERIODS = [10, 20, 50, 100, 200]
+CHAVE = ("BTCUSDT", "BINANCE", "4H")
+
+def gerar_closes(n_bars: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return pd.Series(close, index=pd.date_range("2018-01-01", periods=n_bars, freq="4h"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark estado incremental vs recálculo completo")
+    parser.add_argument("--historico", type=int, default=2000, help="Barras na janela de cada refresh")
+    parser.add_argument("--barras-novas", type=int, default=300, help="Refreshes simulados (uma barra nova cada)")
+    args = parser.parse_args()
+
+    # Benchmark em memória (sem Postgres)
+    get_settings().INDICATOR_STATE_PERSIST = False
+
+    serie = gerar_closes(args.historico + args.barras_novas)
+    janelas = [serie.iloc[i:i + args.historico] for i in range(args.barras_novas + 1)]
+
+    inicio = time.perf_counter()
+    for janela in janelas:
+        engine.ema_multi(janela.to_numpy(), EMA_PERIODS)
+        engine.rsi_wilder(janela.to_numpy(), 14)
+    tempo_completo = time.perf_counter() - inicio
+
+    def atualizar_estado(janela: pd.Series):
+        for period in EMA_PERIODS:
+            indicator_state.ema_atual(CHAVE, janela, period)
+        indicator_state.rsi_atual(CHAVE, janela, 14)
+
+    # Semeadura (primeira janela) fora da medição
+    indicator_state.limpar_estados()
+    atualizar_estado(janelas[0])
+    inicio = time.perf_counter()
+    for janela in janelas[1:]:
+        atualizar_estado(janela)
+    tempo_estado = (time.perf_counter() - inicio) * len(janelas) / max(1, len(janelas) - 1)
+
+    refreshes = len(janelas)
+    print(f"EMAs {EMA_PERIODS} + RSI14, janela {args.historico} barras, {refreshes} refreshes")
+    print(f"recálculo completo: {tempo_completo / refreshes * 1e6:>9.1f} µs/refresh")
+    print(f"estado incremental: {tempo_estado / refreshes * 1e6:>9.1f} µs/refresh "
+          f"({tempo_completo / tempo_estado:.1f}x)")
+
+    for indicador, period in [("ema", p) for p in EMA_PERIODS] + [("rsi", 14)]:
+        resultado = indicator_state.verificar_estado(CHAVE, indicador, period, serie, janela=args.historico)
+        print(f"  {indicador}{period:<4} {resultado['status']:<12} dif. relativa {resultado['diferenca_relativa']:.1e}")
+
+if __name__ == "__main__":
+    main()
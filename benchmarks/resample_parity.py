@@ -0,0 +1,68 @@
+# benchmarks/resample_parity.py
+#
+# Paridade da reamostragem (resampler) contra as barras nativas do vendor:
+# baixa a série base e a nativa de cada timeframe pelo pool TradingView,
+# reamostra a base e compara OHLCV barra a barra (barras fechadas em comum;
+# a barra em formação fica de fora porque muda entre os dois downloads).
+#
+# Sai com código 1 se alguma barra divergir além da tolerância.
+# Paridade offline (fixtures gravadas, sem rede): tests/test_resampler.py
+#
+# Uso (na raiz do repositório, variáveis de ambiente do app carregadas):
+#   python benchmarks/resample_parity.py
+#   python benchmarks/resample_parity.py --timeframes 1W 1M 4H --barras 300
+
+import argparse
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tvDatafeed import Interval
+from app.services.utils.helpers.tradingview.resampler import REGRAS, reamostrar
+from app.services.utils.helpers.tradingview.session_pool import get_pool
+
+# 4H não é derivado em produção (limite de barras); a paridade vale a partir de 1H
+BASE_PARIDADE = {"1W": "1D", "1M": "1D", "4H": "1H"}
+COLUNAS = ["open", "high", "low", "close", "volume"]
+
+def comparar(symbol: str, exchange: str, intervalo: str, n_bars: int, tolerancia: float) -> bool:
+    base = BASE_PARIDADE[intervalo]
+    n_base = min((n_bars + 1) * REGRAS[intervalo][1] // REGRAS[base][1], 5000)
+
+    nativo = get_pool().get_hist(symbol, exchange, Interval(intervalo), n_bars)
+    df_base = get_pool().get_hist(symbol, exchange, Interval(base), n_base)
+    derivado = reamostrar(df_base, intervalo, truncada=len(df_base) >= n_base)
+
+    comuns = nativo.index[:-1].intersection(derivado.index[:-1])
+    if len(comuns) == 0:
+        print(f"{intervalo:>3} <- {base}: nenhuma barra em comum (nativo {nativo.index[0]}.., derivado {derivado.index[0]}..)")
+        return False
+
+    a = nativo.loc[comuns, COLUNAS].to_numpy(dtype=float)
+    b = derivado.loc[comuns, COLUNAS].to_numpy(dtype=float)
+    erro_rel = np.abs(a - b) / np.maximum(np.abs(a), 1e-12)
+    divergentes = np.flatnonzero((erro_rel > tolerancia).any(axis=1))
+
+    maximos = ", ".join(f"{c}={erro_rel[:, i].max():.2e}" for i, c in enumerate(COLUNAS))
+    print(f"{intervalo:>3} <- {base}: {len(comuns)} barras fechadas, {len(divergentes)} divergentes | erro rel. máx: {maximos}")
+    for i in divergentes[:5]:
+        print(f"      {comuns[i]} nativo={a[i].round(2).tolist()} derivado={b[i].round(2).tolist()}")
+    return len(divergentes) == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridade barras reamostradas vs nativas do TradingView")
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--exchange", default="BINANCE")
+    parser.add_argument("--timeframes", nargs="+", default=["1W", "1M", "4H"], choices=sorted(BASE_PARIDADE))
+    parser.add_argument("--barras", type=int, default=200, help="Barras nativas por timeframe")
+    parser.add_argument("--tolerancia", type=float, default=1e-6, help="Erro relativo aceito (volume arredondado pelo vendor)")
+    args = parser.parse_args()
+
+    resultados = [comparar(args.symbol, args.exchange, tf, args.barras, args.tolerancia) for tf in args.timeframes]
+    print("✅ Paridade OK" if all(resultados) else "❌ Divergências encontradas")
+    sys.exit(0 if all(resultados) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# tests/conftest.py
+
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+@pytest.fixture
+def fuso():
+    """Troca o fuso local do processo (índice do tvDatafeed é horário local) e restaura no fim"""
+    original = os.environ.get("TZ")
+
+    def aplicar(tz: str):
+        os.environ["TZ"] = tz
+        time.tzset()
+
+    yield aplicar
+
+    if original is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = original
+    time.tzset()
@@ -0,0 +1,98 @@
+# tests/test_price_helper.py
+
+"""
+Busca hedged do preço BTC contra fontes substitutas (servidor HTTP local)
+
+Cada rota do servidor responde {"price": ...} após um atraso, ou erro 500;
+nenhuma chamada sai para a rede.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import pytest
+from app.services.utils.helpers.tradingview import price_helper
+from app.services.utils.helpers.tradingview.price_helper import FontePreco, buscar_preco, get_btc_price
+
+# rota -> (atraso em segundos, preço ou None para HTTP 500)
+ROTAS = {
+    "/rapida": (0.0, 60000.0),
+    "/media": (0.05, 61000.0),
+    "/lenta": (1.0, 65000.0),
+    "/invalida": (0.0, 5.0),
+    "/erro": (0.0, None),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        atraso, preco = ROTAS[self.path]
+        time.sleep(atraso)
+        if preco is None:
+            self.send_response(500)
+            self.end_headers()
+            return
+        corpo = json.dumps({"price": str(preco)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def servidor():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+@pytest.fixture(autouse=True)
+def isolado(monkeypatch):
+    """Settings fixos e estado do módulo limpo (estatísticas, sessões e cache)"""
+    settings = SimpleNamespace(
+        BTC_PRICE_QUORUM=1, BTC_PRICE_TIMEOUT_SECONDS=3.0, BTC_PRICE_HEDGE_MS=100,
+        BTC_PRICE_CACHE_TTL_SECONDS=60.0, PRICE_STREAM_SYMBOL="BTCUSDT"
+    )
+    monkeypatch.setattr(price_helper, "get_settings", lambda: settings)
+    monkeypatch.setattr(price_helper, "_stats", {})
+    monkeypatch.setattr(price_helper, "_sessoes", {})
+    monkeypatch.setattr(price_helper, "_cache", {"preco": None, "fonte": None, "em": 0.0})
+    return settings
+
+def _fontes(servidor, *rotas):
+    return [FontePreco(rota.strip("/"), servidor + rota, lambda dados: float(dados["price"])) for rota in rotas]
+
+def test_primeira_cotacao_valida(servidor):
+    resultado = buscar_preco(_fontes(servidor, "/erro", "/invalida", "/rapida"), quorum=1)
+
+    assert resultado["preco"] == 60000.0
+    assert resultado["fontes"] == ["rapida"]
+    # as demais sobem em paralelo após a falha: a inválida pode não ter respondido ainda
+    assert "erro" in resultado["erros"] and set(resultado["cotacoes"]) == {"rapida"}
+
+def test_hedge_nao_espera_fonte_lenta(servidor):
+    inicio = time.monotonic()
+    resultado = buscar_preco(_fontes(servidor, "/lenta", "/rapida"), quorum=1)
+
+    assert resultado["preco"] == 60000.0
+    assert time.monotonic() - inicio < 0.8
+
+def test_quorum_devolve_mediana(servidor):
+    fontes = _fontes(servidor, "/rapida", "/media", "/lenta")
+
+    assert buscar_preco(fontes, quorum=3)["preco"] == 61000.0
+    assert buscar_preco(fontes, quorum=2)["preco"] == 60500.0
+
+def test_todas_as_fontes_falham(servidor):
+    with pytest.raises(Exception, match="Todas as fontes de preço BTC falharam"):
+        buscar_preco(_fontes(servidor, "/erro", "/invalida"))
+
+def test_fontes_substitutas_nao_usam_cache(servidor):
+    price_helper._cache.update(preco=99999.0, fonte="cache", em=time.monotonic())
+
+    assert get_btc_price(_fontes(servidor, "/rapida")) == 60000.0
+    assert price_helper._cache["preco"] == 99999.0 and price_helper._cache["fonte"] == "cache"
@@ -0,0 +1,107 @@
+# tests/test_price_stream.py
+
+"""
+Stream de preço reproduzindo negócios gravados (FonteReplay, sem espera)
+
+fixtures/btcusdt_aggtrades.csv: três minutos de aggTrade (CSV e JSON), um
+negócio atrasado de um minuto já fechado e linhas inválidas. O bar store é
+substituído; nada vai para o banco ou para a rede.
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+import pytest
+from conftest import FIXTURES
+from app.services.utils.helpers.tradingview import bar_store, price_stream
+from app.services.utils.helpers.tradingview.price_stream import FonteReplay, PriceStream, preco_stream
+
+REPLAY = os.path.join(FIXTURES, "btcusdt_aggtrades.csv")
+
+# (início, open, high, low, close, volume) dos candles 1m esperados
+CANDLES = [
+    ("2024-06-01T00:00:00", 67500.0, 67550.0, 67480.0, 67520.0, 1.1),
+    ("2024-06-01T00:01:00", 67530.0, 67600.0, 67530.0, 67590.0, 1.5),
+    ("2024-06-01T00:02:00", 67610.0, 67610.0, 67610.0, 67610.0, 0.2),
+]
+
+@pytest.fixture(autouse=True)
+def isolado(monkeypatch, fuso):
+    """Settings fixos, horário local UTC, bar store substituído e stream do processo limpo"""
+    fuso("UTC")
+    settings = SimpleNamespace(
+        PRICE_STREAM_ENABLED=False, PRICE_STREAM_SYMBOL="BTCUSDT", TV_EXCHANGE="BINANCE",
+        PRICE_STREAM_PUBLISH_MS=0, PRICE_STREAM_MAX_AGE_SECONDS=60.0
+    )
+    registradas = []
+    monkeypatch.setattr(price_stream, "get_settings", lambda: settings)
+    monkeypatch.setattr(bar_store, "registrar_barras", lambda *args: registradas.append(args))
+    monkeypatch.setattr(price_stream, "_stream", None)
+    yield SimpleNamespace(settings=settings, registradas=registradas)
+    price_stream.parar_stream()
+
+def _reproduzir() -> PriceStream:
+    stream = price_stream.iniciar_stream(FonteReplay(REPLAY, velocidade=0))
+    stream._thread.join(5)
+    assert not stream.ativo()
+    return stream
+
+def _ohlcv(candle) -> tuple:
+    return (candle["datetime"], candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"])
+
+def test_candles_1m_por_minuto():
+    stream = _reproduzir()
+
+    assert [_ohlcv(c) for c in stream.ultimos_candles()] == CANDLES
+    assert stream.status()["candles"] == 3
+
+def test_negocio_atrasado_descartado():
+    stream = _reproduzir()
+
+    # 9 negócios válidos menos o atrasado (00:00:45 depois de abrir 00:01)
+    assert stream.status()["negocios"] == 8
+    assert min(c["low"] for c in stream.ultimos_candles()) == 67480.0
+
+def test_preco_stream(isolado):
+    assert preco_stream() is None  # desligado
+
+    _reproduzir()
+
+    assert preco_stream() == 67610.0
+    assert preco_stream("BTCUSDT") == 67610.0
+    assert preco_stream("ETHUSDT") is None
+    isolado.settings.PRICE_STREAM_MAX_AGE_SECONDS = 0.0
+    assert preco_stream() is None  # negócio antigo demais
+
+def test_primeiro_candle_da_conexao_nao_vai_para_o_bar_store(isolado):
+    _reproduzir()
+
+    assert [args[:3] for args in isolado.registradas] == [("BTCUSDT", "BINANCE", "1")] * 2
+    barras = [args[3] for args in isolado.registradas]
+    assert [str(df.index[0]) for df in barras] == ["2024-06-01 00:01:00", "2024-06-01 00:02:00"]
+    assert list(barras[0].iloc[0]) == ["BINANCE:BTCUSDT", 67530.0, 67600.0, 67530.0, 67590.0, 1.5]
+
+def test_fan_out_para_assinantes():
+    async def consumir():
+        stream = PriceStream(FonteReplay(REPLAY, velocidade=0), "BTCUSDT", "BINANCE")
+        filas = [stream.assinar(), stream.assinar()]
+        stream.iniciar()
+
+        recebidos = []
+        for fila in filas:
+            eventos = []
+            while sum(e["tipo"] == "candle" for e in eventos) < len(CANDLES):
+                eventos.append(await asyncio.wait_for(fila.get(), timeout=5))
+            recebidos.append(eventos)
+
+        stream.cancelar(filas[0])
+        assert stream.status()["assinantes"] == 1
+        return recebidos
+
+    recebidos = asyncio.run(consumir())
+
+    assert recebidos[0] == recebidos[1]
+    eventos = recebidos[0]
+    assert [e["preco"] for e in eventos if e["tipo"] == "preco"][-1] == 67610.0
+    assert [_ohlcv(e) for e in eventos if e["tipo"] == "candle"] == CANDLES
+    assert all(e["symbol"] == "BTCUSDT" for e in eventos)
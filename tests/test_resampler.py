@@ -0,0 +1,105 @@
+# tests/test_resampler.py
+
+"""
+Paridade offline do resampler contra barras nativas gravadas
+
+fixtures/btcusdt_{1d,1w,1m}.csv: BINANCE:BTCUSDT desde a listagem
+(quinta-feira, 17/08/2017), horários em UTC. 1W e 1M seguem o formato do
+vendor: rótulo na segunda-feira / dia 1, primeira barra parcial (listagem)
+e a última em formação. Os testes convertem o índice para horário local
+ingênuo, como o tvDatafeed entrega, em fusos com e sem horário de verão.
+(benchmarks/resample_parity.py compara com o vendor ao vivo.)
+"""
+
+import calendar
+import os
+from datetime import datetime
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from conftest import FIXTURES
+from app.services.utils.helpers.tradingview import resampler
+from app.services.utils.helpers.tradingview.resampler import reamostrar
+
+COLUNAS = ["open", "high", "low", "close", "volume"]
+FUSOS = ["UTC", "Europe/Lisbon", "America/Sao_Paulo"]
+
+def _carregar(intervalo: str) -> pd.DataFrame:
+    """Fixture com índice local ingênuo (datetime.fromtimestamp, como o tvDatafeed)"""
+    df = pd.read_csv(os.path.join(FIXTURES, f"btcusdt_{intervalo.lower()}.csv"), parse_dates=["datetime"])
+    df.index = pd.DatetimeIndex(
+        [datetime.fromtimestamp(calendar.timegm(ts.timetuple())) for ts in df.pop("datetime")], name="datetime"
+    )
+    df.insert(0, "symbol", "BINANCE:BTCUSDT")
+    return df
+
+def _utc(indice: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex([datetime.utcfromtimestamp(ts.to_pydatetime().timestamp()) for ts in indice])
+
+def _comparar(derivado: pd.DataFrame, nativo: pd.DataFrame):
+    pd.testing.assert_index_equal(derivado.index, nativo.index, check_names=False)
+    pd.testing.assert_frame_equal(derivado[COLUNAS], nativo[COLUNAS], check_exact=False, rtol=1e-9, check_names=False)
+
+@pytest.mark.parametrize("tz", FUSOS)
+@pytest.mark.parametrize("intervalo", ["1W", "1M"])
+def test_historico_completo_igual_ao_nativo(fuso, tz, intervalo):
+    fuso(tz)
+    derivado = reamostrar(_carregar("1D"), intervalo, truncada=False)
+    nativo = _carregar(intervalo)
+
+    _comparar(derivado, nativo)
+    assert (derivado["symbol"] == "BINANCE:BTCUSDT").all()
+
+@pytest.mark.parametrize("tz", FUSOS)
+def test_rotulos_segunda_e_dia_1_em_utc(fuso, tz):
+    fuso(tz)
+    diario = _carregar("1D")
+
+    semanas = _utc(reamostrar(diario, "1W", truncada=False).index)
+    meses = _utc(reamostrar(diario, "1M", truncada=False).index)
+
+    assert (semanas.weekday == 0).all() and (semanas.hour == 0).all()
+    assert (meses.day == 1).all() and (meses.hour == 0).all()
+    # listagem numa quinta-feira: a primeira semana é rotulada na segunda anterior
+    assert semanas[0] == pd.Timestamp("2017-08-14") and meses[0] == pd.Timestamp("2017-08-01")
+
+@pytest.mark.parametrize("tz", FUSOS)
+@pytest.mark.parametrize("intervalo", ["1W", "1M"])
+def test_base_truncada_descarta_barra_inicial_parcial(fuso, tz, intervalo):
+    fuso(tz)
+    # recorte começando numa quarta-feira, dia 8: primeira semana e primeiro mês incompletos
+    diario = _carregar("1D").iloc[83:]
+    assert _utc(diario.index)[0] == pd.Timestamp("2017-11-08")
+
+    derivado = reamostrar(diario, intervalo)
+    nativo = _carregar(intervalo)
+
+    assert derivado.index[0] > diario.index[0]
+    _comparar(derivado, nativo.loc[derivado.index[0]:])
+
+def test_agregacao_ohlcv():
+    diario = _carregar("1D")
+    semana = reamostrar(diario, "1W", truncada=False).iloc[1]
+    dias = diario.iloc[4:11]  # segunda 21/08 a domingo 27/08
+
+    assert semana["open"] == dias["open"].iloc[0]
+    assert semana["high"] == dias["high"].max()
+    assert semana["low"] == dias["low"].min()
+    assert semana["close"] == dias["close"].iloc[-1]
+    assert semana["volume"] == pytest.approx(dias["volume"].sum())
+
+@pytest.mark.parametrize("n_bars, inicio", [(10, None), (30, "2017-08-14")])
+def test_buscar_barras_so_descarta_quando_base_truncada(monkeypatch, n_bars, inicio):
+    diario = _carregar("1D")
+    nativo = _carregar("1W")
+    monkeypatch.setattr(resampler, "get_settings", lambda: SimpleNamespace(RESAMPLE_ENABLED=True, RESAMPLE_MAX_BASE_BARS=5000))
+    monkeypatch.setattr(resampler, "_barras_nativas", lambda symbol, exchange, interval, n: diario.tail(n))
+
+    # 10 semanas pedem 77 dias (recorte); 30 semanas pedem 217 e a fixture só tem 160 (esgotado)
+    df = resampler.buscar_barras("BTCUSDT", "BINANCE", "1W", n_bars)
+
+    _comparar(df, nativo.tail(len(df)))
+    if inicio:
+        assert len(df) == len(nativo) and _utc(df.index)[0] == pd.Timestamp(inicio)
+    else:
+        assert len(df) == n_bars